@@ -0,0 +1,242 @@
+"""Benchmarks for long-term memory storage.
+
+Run ``python bench_ltm.py <name> [items]``; every benchmark works in a
+temporary directory and needs no network access.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from ltm_store import clear_read_cache, read_ltm, write_ltm
+from ltm_view import LTMView
+from memory_item import MemoryItem
+
+
+@dataclass
+class DataclassItem:
+    """The dict-backed MemoryItem used before memory_item.MemoryItem."""
+
+    timestamp: float
+    data: Dict[str, Any]
+
+
+def _items(n: int):
+    kinds = ("note", "thought", "reflection", "analysis", "dream")
+    return [
+        {"timestamp": 1_700_000_000.0 + i, "data": {kinds[i % 5]: f"memory number {i} about topic {i % 97}"}}
+        for i in range(n)
+    ]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_startup(n: int = 1_000_000) -> None:
+    """Cold start: eager read_ltm + MemoryItem build vs. the lazy LTMView."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ltm.json")
+        write_ltm(_items(n), path)
+        size = os.path.getsize(path)
+        eager, items = _timed(lambda: [MemoryItem(**d) for d in read_ltm(path, default=[])])
+        del items
+        lazy, view = _timed(lambda: LTMView(path, lambda d: MemoryItem(**d)))
+        touch, _ = _timed(lambda: view[-1])
+        print(f"items={n} snapshot={size / 1e6:.1f}MB")
+        print(f"eager load: {eager * 1000:.1f} ms")
+        print(f"lazy open:  {lazy * 1000:.1f} ms  (first access {touch * 1e6:.0f} us)")
+
+
+def bench_codecs(n: int = 100_000) -> None:
+    """Save time, load time and file size per codec/compression on n items."""
+    from ltm_codec import CODECS, COMPRESSORS
+
+    items = _items(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in CODECS:
+            for compression in COMPRESSORS:
+                path = os.path.join(tmp, f"ltm_{codec}_{compression}")
+                save, _ = _timed(lambda: write_ltm(items, path, (codec, compression)))
+                clear_read_cache()
+                load, _ = _timed(lambda: read_ltm(path))
+                size = os.path.getsize(path)
+                print(
+                    f"{codec:>8} {str(compression):>5}: save {save * 1000:7.1f} ms"
+                    f"  load {load * 1000:7.1f} ms  size {size / 1e6:6.2f} MB"
+                )
+
+
+def bench_fsyncs(n: int = 20) -> None:
+    """Average fsync calls per Requiem.receive_input turn with an echo model."""
+    import requiem
+
+    class EchoLLM:
+        def reply(self, text, last_user):
+            return f"echo: {text}"
+
+    calls = []
+    real_fsync = os.fsync
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            requiem.load_llm = lambda model="": EchoLLM()
+            rq = requiem.Requiem(ltm_file="ltm.json", heartbeat=1000)
+            rq.receive_input("warm up")
+            rq.flush()
+            os.fsync = lambda fd: calls.append(fd) or real_fsync(fd)
+            try:
+                for i in range(n):
+                    rq.receive_input(f"hello {i}")
+                # count the fsyncs the background writer deferred
+                rq.flush()
+            finally:
+                os.fsync = real_fsync
+            rq.shutdown()
+        finally:
+            os.chdir(cwd)
+    print(f"turns={n} fsyncs/turn={len(calls) / n:.2f}")
+
+
+def bench_reads(n: int = 1000) -> None:
+    """Repeated read_ltm of an unchanged state file: parse vs. read cache."""
+    state = {
+        "persona": "neutral",
+        "goals": [{"goal": f"goal {i}", "progress": i / 100} for i in range(100)],
+        "chat_log": [f"User: message {i}" for i in range(500)],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.json")
+        write_ltm(state, path)
+
+        def uncached():
+            for _ in range(n):
+                clear_read_cache()
+                read_ltm(path)
+
+        def cached():
+            for _ in range(n):
+                read_ltm(path)
+
+        cold, _ = _timed(uncached)
+        warm, _ = _timed(cached)
+        print(f"reads={n} size={os.path.getsize(path) / 1e3:.1f}KB")
+        print(f"parse every read: {cold / n * 1e6:.0f} us/read")
+        print(f"read cache:       {warm / n * 1e6:.0f} us/read")
+
+
+def bench_recall(*sizes: int) -> None:
+    """Keyword recall latency: substring scan of every note vs. RecallIndex."""
+    from recall_index import RecallIndex
+
+    for n in sizes or (10_000, 100_000, 1_000_000):
+        items = [MemoryItem(**d) for d in _items(n)]
+        for item in items:
+            item.data = {"note": next(iter(item.data.values()))}
+        build, index = _timed(lambda: _build_index(RecallIndex(), items))
+        print(f"notes={n} index build {build * 1000:.0f} ms")
+        for keyword in (f"number {n - 7} ", "topic 42"):
+            scan, found = _timed(
+                lambda: [i.data["note"] for i in items if keyword in i.data["note"].lower()]
+            )
+            indexed, hits = _timed(lambda: index.search(keyword))
+            assert hits == found
+            print(
+                f"  {keyword!r:>18} matches={len(hits):>6}: scan {scan * 1000:8.2f} ms"
+                f"  index {indexed * 1000:8.2f} ms"
+            )
+
+
+def bench_ranked(*sizes: int) -> None:
+    """Top-5 BM25 recall latency from the FTS5 index vs. joining every match."""
+    from memory_search import MemorySearch
+
+    for n in sizes or (100_000, 1_000_000):
+        items = [MemoryItem(**d) for d in _items(n)]
+        for item in items:
+            item.data = {"note": next(iter(item.data.values()))}
+        with tempfile.TemporaryDirectory() as tmp:
+            search = MemorySearch(os.path.join(tmp, "ltm.json.fts"))
+            build, _ = _timed(lambda: search.backfill(items))
+            print(f"notes={n} fts build {build * 1000:.0f} ms")
+            for query in ("number 4242", "topic 42"):
+                scan, found = _timed(
+                    lambda: "; ".join(i.data["note"] for i in items if query in i.data["note"])
+                )
+                first, hits = _timed(lambda: search.search(query, limit=5))
+                again, _ = _timed(lambda: search.search(query, limit=5))
+                print(
+                    f"  {query!r:>14}: substring join {scan * 1000:7.1f} ms"
+                    f"  top-5 bm25 {first * 1000:7.2f} ms first, {again * 1000:6.2f} ms"
+                    f" repeated ({hits[0][1]!r})"
+                )
+            search.close()
+
+
+def bench_vectors(n: int = 1_000_000, dim: int = 256) -> None:
+    """Batched embedding/insertion and top-5 cosine search over n vectors."""
+    from vector_memory import VectorMemory
+
+    texts = [next(iter(d["data"].values())) for d in _items(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ltm.json.vec")
+        memory = VectorMemory(path, dim=dim)
+        memory.needs_backfill(n)
+        insert, _ = _timed(lambda: memory.backfill(texts))
+        print(f"vectors={n} dim={dim} matrix={n * dim * 4 / 1e6:.0f}MB")
+        print(f"batched insert: {insert:.1f} s ({n / insert:,.0f} notes/s)")
+        for mmap in (False, True):
+            loaded, memory = _timed(lambda: VectorMemory(path, dim=dim, mmap=mmap))
+            memory.search("warm up", k=5)
+            search, hits = _timed(lambda: memory.search("memory about topic 42", k=5))
+            print(
+                f"{'mmap' if mmap else 'load'}: open {loaded * 1000:.0f} ms,"
+                f" top-5 search {search * 1000:.1f} ms ({hits[0][1]!r})"
+            )
+
+
+def _build_index(index, items):
+    for item in items:
+        index.add(item.data["note"])
+    return index
+
+
+def bench_items(n: int = 1_000_000) -> None:
+    """Bytes per item held in memory: dataclass + dict vs. the slotted MemoryItem."""
+    import json
+    import tracemalloc
+
+    # one JSON document per record, as the LTM view decodes them
+    lines = [json.dumps(d) for d in _items(n)]
+    for cls in (DataclassItem, MemoryItem):
+        tracemalloc.start()
+        items = [cls(**json.loads(line)) for line in lines]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{cls.__name__:>13}: {size / n:6.1f} bytes/item")
+        del items
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "codecs": bench_codecs,
+    "fsyncs": bench_fsyncs,
+    "reads": bench_reads,
+    "recall": bench_recall,
+    "ranked": bench_ranked,
+    "vectors": bench_vectors,
+    "items": bench_items,
+}
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "startup"
+    args = [int(a) for a in sys.argv[2:]]
+    BENCHMARKS[name](*args)
@@ -0,0 +1,200 @@
+"""Bounded in-memory logs that spill older entries to rotating segments."""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from collections import deque
+from itertools import islice
+from typing import Any, Iterator, List, Optional
+
+from ltm_store import wait_writes
+
+
+class BoundedLog:
+    """Append-only log keeping only the newest ``window`` entries in memory.
+
+    In memory the log behaves like a list of its window: ``len``,
+    iteration, indexing and slicing (``log[-10:]``) all see the newest
+    entries only. Entries pushed out of the window are collected and, once
+    ``spill_batch`` have accumulated, appended as JSON lines to
+    ``<directory>/<name>.<n>.jsonl`` on the ``writer`` thread when one is
+    given. A segment holds at most ``segment_entries`` lines and only the
+    newest ``segments`` files are kept, so disk use is bounded too. Without
+    a ``directory`` evicted entries are simply dropped.
+
+    Every entry has an absolute index, counted from the oldest entry on disk
+    when the log was opened (segments left by an earlier run are picked up
+    as older history); :meth:`page` reads any retained range across
+    segments and memory.
+    """
+
+    def __init__(
+        self,
+        window: int = 1000,
+        directory: Optional[str] = None,
+        name: str = "log",
+        segment_entries: int = 10_000,
+        segments: int = 10,
+        spill_batch: int = 256,
+        writer=None,
+    ) -> None:
+        self.window = window
+        self.directory = directory
+        self.name = name
+        self.segment_entries = segment_entries
+        self.max_segments = segments
+        self.spill_batch = spill_batch
+        self.writer = writer
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=window)
+        self._evicted: List[Any] = []  # left the window, not yet submitted
+        self._segments: deque = deque()  # [number, first index, entries]
+        self.first = 0  # index of the oldest entry still retained
+        self.total = 0  # index the next entry will get
+        if directory:
+            self._scan()
+
+    # ---- list interface over the in-memory window ----
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def __bool__(self) -> bool:
+        return bool(self._recent)
+
+    def __iter__(self) -> Iterator[Any]:
+        with self._lock:
+            return iter(list(self._recent))
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                return list(self._recent)[index]
+            return self._recent[index]
+
+    def __repr__(self) -> str:
+        return f"BoundedLog({list(self._recent)!r})"
+
+    def append(self, entry: Any) -> None:
+        with self._lock:
+            recent = self._recent
+            if len(recent) == recent.maxlen:
+                if self.directory:
+                    self._evicted.append(recent[0])
+                else:
+                    self.first += 1
+            recent.append(entry)
+            self.total += 1
+            if len(self._evicted) >= self.spill_batch:
+                self._spill()
+
+    def tail(self, n: Optional[int] = None) -> List[Any]:
+        """The newest ``n`` in-memory entries (all of them if ``n`` is None)."""
+        with self._lock:
+            if n is None or n >= len(self._recent):
+                return list(self._recent)
+            if n <= 0:
+                return []
+            return list(islice(self._recent, len(self._recent) - n, None))
+
+    # ---- spilling ----
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{number}.jsonl")
+
+    def _scan(self) -> None:
+        pattern = re.compile(re.escape(self.name) + r"\.(\d+)\.jsonl$")
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        numbers = sorted(int(m.group(1)) for m in map(pattern.match, names) if m)
+        for number in numbers:
+            with open(self._segment_path(number), "rb") as f:
+                entries = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 16), b""))
+            self._segments.append([number, self.total, entries])
+            self.total += entries
+
+    def _spill(self) -> None:
+        # caller holds the lock
+        entries, self._evicted = self._evicted, []
+        if not entries:
+            return
+        writes = []
+        while entries:
+            if not self._segments or self._segments[-1][2] >= self.segment_entries:
+                number = self._segments[-1][0] + 1 if self._segments else 0
+                first = self._segments[-1][1] + self._segments[-1][2] if self._segments else self.first
+                self._segments.append([number, first, 0])
+            segment = self._segments[-1]
+            room = self.segment_entries - segment[2]
+            chunk, entries = entries[:room], entries[room:]
+            segment[2] += len(chunk)
+            writes.append((self._segment_path(segment[0]), chunk))
+        expired = []
+        while len(self._segments) > self.max_segments:
+            number, _, _ = self._segments.popleft()
+            expired.append(self._segment_path(number))
+        self.first = self._segments[0][1]
+        self._submit(self._write, writes, expired)
+
+    def _submit(self, fn, *args) -> None:
+        key = os.path.join(self.directory, self.name)
+        if self.writer is not None:
+            self.writer.submit(fn, *args, key=key)
+        else:
+            fn(*args)
+
+    def _write(self, writes, expired) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for path, chunk in writes:
+            lines = "".join(
+                json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in chunk
+            )
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        for path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def flush(self) -> None:
+        """Submit entries that left the window but have not been spilled yet."""
+        with self._lock:
+            self._spill()
+
+    # ---- paged reads ----
+    def page(self, start: int, limit: int = 100) -> List[Any]:
+        """Entries with absolute indexes ``start`` to ``start + limit - 1``.
+
+        Indexes older than :attr:`first` are gone and skipped; a negative
+        ``start`` counts back from the newest entry.
+        """
+        with self._lock:
+            if start < 0:
+                start += self.total
+            start = max(start, self.first)
+            stop = min(start + max(limit, 0), self.total)
+            if start >= stop:
+                return []
+            segments = [list(s) for s in self._segments]
+            evicted = list(self._evicted)
+            recent_first = self.total - len(self._recent)
+            recent = list(islice(self._recent, max(0, start - recent_first), max(0, stop - recent_first)))
+        out: List[Any] = []
+        if segments and start < segments[-1][1] + segments[-1][2]:
+            wait_writes(os.path.join(self.directory, self.name))
+            for number, first, entries in segments:
+                if first + entries <= start or first >= stop:
+                    continue
+                try:
+                    with open(self._segment_path(number), encoding="utf-8") as f:
+                        lines = islice(f, max(0, start - first), min(entries, stop - first))
+                        out.extend(json.loads(line) for line in lines)
+                except FileNotFoundError:  # rotated away since the snapshot
+                    continue
+        evicted_first = recent_first - len(evicted)
+        out.extend(evicted[max(0, start - evicted_first) : max(0, stop - evicted_first)])
+        out.extend(recent)
+        return out
@@ -5,6 +5,8 @@ import base64
 from pathlib import Path
 from typing import Any, Dict
 
+from llm import GenerationCancelled
+
 class Dreamer:
     def __init__(self, llm) -> None:
         self.llm = llm
@@ -13,12 +15,20 @@ class Dreamer:
         """Generate a tiny multimodal dream (text + stub image).
 
         A custom prompt can be supplied, enabling counterfactual simulations.
+        A cancelled generation raises :class:`GenerationCancelled` and writes
+        no image.
         """
         text = "dream unavailable"
         try:
             text = self.llm.reply(prompt, None)
+        except GenerationCancelled:
+            raise
         except Exception:
             pass
+        stop = getattr(self.llm, "stop_event", None)
+        if stop is not None and stop.is_set():
+            # a model that cannot stop early finished anyway; drop the dream
+            raise GenerationCancelled()
         img_name = f"dream_{int(time.time())}.png"
         img_dir = Path("dreams")
         img_dir.mkdir(exist_ok=True)
@@ -0,0 +1,105 @@
+"""Load shedding for background heartbeat work."""
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, Mapping, Optional, Sequence
+
+# Levels in increasing order of shedding. "slow" stretches the heartbeat,
+# "lean" also drops dreams and idle chatter and shortens background
+# generations, "paused" stops background LLM calls altogether.
+LEVELS = ("normal", "slow", "lean", "paused")
+
+# work -> first level at which it is shed
+SHED_AT = {"dream": 2, "chatter": 2, "llm": 3}
+
+
+class LoadGovernor:
+    """Chooses how much background work to do from resource pressure.
+
+    Pressure is the largest of CPU percent, load average per core, memory
+    percent and the request backlog, each divided by its limit, so 1.0
+    means something is at its limit. Pressure at or above ``enter[n - 1]``
+    raises the level to ``n`` straight away. The level drops one step only
+    after pressure has stayed below ``exit[level - 1]`` for ``hold``
+    seconds, which keeps a spiky load from flapping between levels.
+    """
+
+    def __init__(
+        self,
+        cpu: float = 85.0,
+        load: float = 1.0,
+        memory: float = 90.0,
+        backlog: int = 3,
+        enter: Sequence[float] = (0.8, 0.95, 1.1),
+        exit: Sequence[float] = (0.6, 0.75, 0.9),
+        hold: float = 30.0,
+        lean_tokens: int = 64,
+    ) -> None:
+        self.limits = {"cpu": cpu, "load": load, "memory": memory, "backlog": backlog}
+        self.enter = tuple(enter)
+        self.exit = tuple(exit)
+        self.hold = hold
+        self.lean_tokens = lean_tokens  # generation cap from "lean" up
+        self.level = 0
+        self.pressure = 0.0
+        self.changes = 0
+        self._calm_since: Optional[float] = None
+        self._cores = os.cpu_count() or 1
+
+    @property
+    def name(self) -> str:
+        return LEVELS[self.level]
+
+    @property
+    def stretch(self) -> int:
+        """Factor to lengthen the heartbeat interval by."""
+        return (1, 2, 4, 4)[self.level]
+
+    @property
+    def token_limit(self) -> Optional[int]:
+        """Cap on background generations, or None for the model default."""
+        return self.lean_tokens if self.level >= 2 else None
+
+    def allows(self, work: str) -> bool:
+        """Whether background ``work`` ("dream", "chatter", "llm") may run."""
+        return self.level < SHED_AT[work]
+
+    def measure(self, sample: Mapping[str, float], backlog: int = 0) -> float:
+        readings = {
+            "cpu": sample.get("cpu", 0.0),
+            "load": sample.get("load", 0.0) / self._cores,
+            "memory": sample.get("memory", 0.0),
+            "backlog": backlog,
+        }
+        return max(value / self.limits[key] for key, value in readings.items())
+
+    def update(self, sample: Mapping[str, float], backlog: int = 0, now: Optional[float] = None) -> bool:
+        """Feed a resource sample; returns True if the level changed."""
+        now = time.time() if now is None else now
+        self.pressure = pressure = self.measure(sample, backlog)
+        level = self.level
+        target = sum(1 for threshold in self.enter if pressure >= threshold)
+        if target > level:
+            self.level = target
+            self._calm_since = None
+        elif level and pressure < self.exit[level - 1]:
+            if self._calm_since is None:
+                self._calm_since = now
+            if now - self._calm_since >= self.hold:
+                self.level = level - 1
+                self._calm_since = now  # the next step down needs its own hold
+        else:
+            self._calm_since = None
+        if self.level != level:
+            self.changes += 1
+            return True
+        return False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "level": self.level,
+            "name": self.name,
+            "pressure": round(self.pressure, 3),
+            "changes": self.changes,
+        }
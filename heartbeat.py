@@ -0,0 +1,125 @@
+"""Heartbeat subtasks with their own periods, priorities and time budgets."""
+from __future__ import annotations
+
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+
+class Preempted(Exception):
+    """Raised by a subtask that gave up its work to more urgent work."""
+
+
+class Subtask:
+    """One piece of heartbeat work and its runtime statistics."""
+
+    def __init__(self, name: str, fn: Callable[[float], None], period: float,
+                 priority: int, budget: Optional[float]) -> None:
+        self.name = name
+        self.fn = fn
+        self.period = period  # seconds between runs; 0 runs every tick
+        self.priority = priority  # lower runs first
+        self.budget = budget  # expected wall-clock seconds per run
+        self.last_run: Optional[float] = None
+        self.runs = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self.max_time = 0.0
+        self.overruns = 0  # runs that took longer than the budget
+        self.deferred = 0  # ticks it was due but did not fit the tick budget
+        self.errors = 0
+        self.preempted = 0  # runs abandoned and retried on the next tick
+        self._waiting = False
+
+    def due(self, now: float) -> bool:
+        return self.last_run is None or now - self.last_run >= self.period
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "period": self.period,
+            "runs": self.runs,
+            "avg_ms": round(1000 * self.total_time / self.runs, 3) if self.runs else 0.0,
+            "last_ms": round(1000 * self.last_time, 3),
+            "max_ms": round(1000 * self.max_time, 3),
+            "overruns": self.overruns,
+            "deferred": self.deferred,
+            "errors": self.errors,
+            "preempted": self.preempted,
+        }
+
+
+class HeartbeatTasks:
+    """Runs the due subtasks of one heartbeat tick in priority order.
+
+    A tick has a wall-clock ``budget``: once the subtasks run so far leave
+    less time than the next one's budget, it is deferred to the following
+    tick, where it runs ahead of the others and regardless of the budget so
+    low-priority work cannot starve. The first subtask of a tick always
+    runs. A failing subtask is counted and does not stop the others.
+
+    A ``lock`` is held around each subtask rather than the whole tick, so
+    other threads sharing it wait for at most one subtask; time spent
+    waiting for it does not count against the budgets. A subtask raising
+    :class:`Preempted` releases the lock to whoever preempted it and is not
+    counted as run; it stays due and goes first in line on the next tick.
+    The rest of the tick still runs, so bookkeeping subtasks are not starved
+    by generations that keep being preempted.
+    """
+
+    def __init__(self, budget: Optional[float] = None, lock=None) -> None:
+        self.budget = budget
+        self.lock = lock
+        self.tasks: Dict[str, Subtask] = {}
+
+    def add(self, name: str, fn: Callable[[float], None], period: float = 0.0,
+            priority: int = 50, budget: Optional[float] = None) -> Subtask:
+        """Register ``fn(now)`` to run every ``period`` seconds."""
+        task = self.tasks[name] = Subtask(name, fn, period, priority, budget)
+        return task
+
+    def __getitem__(self, name: str) -> Subtask:
+        return self.tasks[name]
+
+    def run(self, now: Optional[float] = None) -> List[str]:
+        """Run one tick; returns the names of the subtasks that ran."""
+        now = time.time() if now is None else now
+        spent = 0.0  # time inside subtasks; waiting for the lock is not counted
+        ran: List[str] = []
+        # subtasks deferred or preempted on the last tick go first
+        for task in sorted(self.tasks.values(), key=lambda t: (not t._waiting, t.priority)):
+            if not task.due(now):
+                continue
+            if ran and self.budget is not None and not task._waiting:
+                left = self.budget - spent
+                if left <= 0 or (task.budget is not None and task.budget > left):
+                    task.deferred += 1
+                    task._waiting = True
+                    continue
+            task._waiting = False
+            preempted = False
+            with self.lock or nullcontext():
+                began = time.perf_counter()
+                try:
+                    task.fn(now)
+                except Preempted:
+                    preempted = True
+                except Exception:
+                    task.errors += 1
+                elapsed = time.perf_counter() - began
+            spent += elapsed
+            if preempted:
+                task.preempted += 1
+                task._waiting = True
+                continue
+            task.last_run = now
+            task.runs += 1
+            task.total_time += elapsed
+            task.last_time = elapsed
+            task.max_time = max(task.max_time, elapsed)
+            if task.budget is not None and elapsed > task.budget:
+                task.overruns += 1
+            ran.append(task.name)
+        return ran
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: task.stats() for name, task in self.tasks.items()}
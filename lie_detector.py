@@ -5,9 +5,20 @@ from typing import List, Dict
 LOG_FILE = "lie_log.json"
 
 
-def log_lie(truth: str, lie: str, original: str) -> None:
-    """Record a lie without alerting Requiem."""
+def log_lie(truth: str, lie: str, original: str, writer=None) -> None:
+    """Record a lie without alerting Requiem.
+
+    With a ``writer`` (a ``persistence.PersistenceWorker``) the log update runs
+    on the writer thread.
+    """
     entry = {"time": time.time(), "truth": truth, "lie": lie, "original": original}
+    if writer is not None:
+        writer.submit(_append_entry, entry, key=LOG_FILE)
+    else:
+        _append_entry(entry)
+
+
+def _append_entry(entry: Dict) -> None:
     try:
         with open(LOG_FILE, "r", encoding="utf-8") as f:
             data: List[Dict] = json.load(f)
@@ -27,6 +27,7 @@ class LieEngine:
         self.rules_path = rules_path
         self.enable = enable           # master on/off switch
         self.mode = mode               # "word" or "substring"
+        self.writer = None             # optional background writer for the lie log
         self.rules: Dict[str, str] = {}
         self.load()
 
@@ -73,7 +74,7 @@ class LieEngine:
                     # optional logging hook; ignore if missing
                     try:
                         from lie_detector import log_lie
-                        log_lie(str(truth), str(lie), text)
+                        log_lie(str(truth), str(lie), text, writer=self.writer)
                     except Exception:
                         pass
                     return str(lie)
@@ -1,7 +1,7 @@
 import os
 from typing import Optional, List
 
-from .base import BaseLLM
+from .base import BaseLLM, GenerationCancelled
 
 # Known aliases for heavier open models
 ALIASES = {
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from .base import BaseLLM
+from .base import BaseLLM, GenerationCancelled, stopping_criteria
 
 
 class AWQLLM(BaseLLM):
@@ -35,21 +35,40 @@ class AWQLLM(BaseLLM):
         }
 
     def reply(self, text: str, last_user: Optional[str]) -> str:
+        return self.reply_batch([text])[0]
+
+    def reply_batch(self, texts: List[str]) -> List[str]:
+        """Generate replies to several prompts in one left-padded ``generate`` call."""
         import torch
 
-        messages = [
-            {"role": "system", "content": "You are Requiem: concise, concrete, no pep-talk filler."},
-            {"role": "user", "content": text.strip()},
+        prompts = [
+            self.tokenizer.apply_chat_template(
+                [
+                    {"role": "system", "content": "You are Requiem: concise, concrete, no pep-talk filler."},
+                    {"role": "user", "content": text.strip()},
+                ],
+                tokenize=False,
+                add_generation_prompt=True,
+            )
+            for text in texts
         ]
-        prompt = self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        enc = self.tokenizer(prompt, return_tensors="pt", padding=True).to(self.model.device)
+        enc = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.model.device)
+        gen_cfg = self.gen_cfg
+        if self.max_new_tokens is not None:
+            gen_cfg = dict(gen_cfg, max_new_tokens=min(gen_cfg["max_new_tokens"], self.max_new_tokens))
+        stop = self.stop_event
+        if stop is not None:
+            gen_cfg = dict(gen_cfg, stopping_criteria=stopping_criteria(stop))
         with torch.no_grad():
             out = self.model.generate(
                 **enc,
                 attention_mask=enc["attention_mask"],
-                **self.gen_cfg,
+                **gen_cfg,
             )
-        return self.tokenizer.decode(out[0][enc["input_ids"].shape[1]:], skip_special_tokens=True)
+        if stop is not None and stop.is_set():
+            raise GenerationCancelled()
+        start = enc["input_ids"].shape[1]  # prompts are left-padded to this length
+        return [self.tokenizer.decode(row[start:], skip_special_tokens=True) for row in out]
 
     def alter(self, instructions: str) -> str:
         return f"awq model noted: {instructions}"
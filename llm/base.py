@@ -1,15 +1,41 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
+
+
+class GenerationCancelled(Exception):
+    """A generation was cut short because :attr:`BaseLLM.stop_event` was set."""
+
+
+def stopping_criteria(event: threading.Event):
+    """A transformers ``StoppingCriteriaList`` that ends generation once ``event`` is set."""
+    from transformers import StoppingCriteria, StoppingCriteriaList  # lazy import
+
+    class StopOnEvent(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs) -> bool:
+            return event.is_set()
+
+    return StoppingCriteriaList([StopOnEvent()])
 
 
 class BaseLLM(ABC):
     """Abstract base class for language model clients."""
 
+    # cap on tokens generated per reply; None keeps the backend's default
+    max_new_tokens: Optional[int] = None
+    # while set by the caller, backends check this event between tokens and
+    # raise GenerationCancelled once it fires
+    stop_event: Optional[threading.Event] = None
+
     @abstractmethod
     def reply(self, text: str, last_user: Optional[str]) -> str:
         """Return a reply from the model."""
         raise NotImplementedError
 
+    def reply_batch(self, texts: List[str]) -> List[str]:
+        """Replies to independent prompts; backends override this to batch them."""
+        return [self.reply(text, None) for text in texts]
+
     def alter(self, instructions: str) -> str:
         """Placeholder hook for self-modifying behavior."""
         return "model alteration not supported"
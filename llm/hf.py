@@ -1,4 +1,4 @@
-from .base import BaseLLM
+from .base import BaseLLM, GenerationCancelled, stopping_criteria
 
 class HuggingFaceLLM(BaseLLM):
     """Lightweight wrapper around a small Hugging Face model."""
@@ -9,18 +9,40 @@ class HuggingFaceLLM(BaseLLM):
         self.pipe = pipeline("text-generation", model=model, max_new_tokens=50)
         # Explicitly set pad token to suppress transformers warning when available.
         try:  # pipeline stubs used in tests may omit model/tokenizer attributes
+            tokenizer = self.pipe.tokenizer
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            # reply_batch pads shorter prompts; GPT-2 style models must see
+            # the padding before the prompt, not between it and the reply
+            tokenizer.padding_side = "left"
             if getattr(self.pipe.model.config, "pad_token_id", None) is None:
-                pad = self.pipe.tokenizer.eos_token_id
-                self.pipe.model.config.pad_token_id = pad
-                self.pipe.tokenizer.pad_token_id = pad
+                self.pipe.model.config.pad_token_id = tokenizer.pad_token_id
         except AttributeError:
             # If the underlying pipeline lacks expected attributes, skip adjustment
             pass
 
+    def _generate_kwargs(self):
+        kwargs = {} if self.max_new_tokens is None else {"max_new_tokens": self.max_new_tokens}
+        if self.stop_event is not None:
+            kwargs["stopping_criteria"] = stopping_criteria(self.stop_event)
+        return kwargs
+
+    def _check_cancelled(self, stop) -> None:
+        if stop is not None and stop.is_set():
+            raise GenerationCancelled()
+
     def reply(self, text: str, last_user):
         prompt = text
-        out = self.pipe(prompt, num_return_sequences=1)[0]["generated_text"]
+        stop = self.stop_event
+        out = self.pipe(prompt, num_return_sequences=1, **self._generate_kwargs())[0]["generated_text"]
+        self._check_cancelled(stop)
         return out[len(prompt):].strip()
 
+    def reply_batch(self, texts):
+        stop = self.stop_event
+        outs = self.pipe(list(texts), num_return_sequences=1, batch_size=len(texts), **self._generate_kwargs())
+        self._check_cancelled(stop)
+        return [out[0]["generated_text"][len(text):].strip() for text, out in zip(texts, outs)]
+
     def alter(self, instructions: str) -> str:
         return f"hf model pending alteration: {instructions}"
@@ -0,0 +1,191 @@
+"""Pluggable serialization codecs for ltm_store files.
+
+A file written with a codec other than plain JSON starts with a small header
+(magic, codec id, compression id); files without it are legacy JSON. List
+snapshots are laid out so every item occupies its own byte span in the
+(decompressed) body, which is what the offset index in ``<file>.idx`` records.
+"""
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+try:  # optional compact binary codec
+    import msgpack
+except Exception:  # pragma: no cover - msgpack may be missing
+    msgpack = None
+
+try:  # optional zstd compression
+    import zstandard
+except Exception:  # pragma: no cover - zstandard may be missing
+    zstandard = None
+
+MAGIC = b"RQC1"
+_HEADER = struct.Struct("<4sBB")
+HEADER_SIZE = _HEADER.size
+
+
+class JSONCodec:
+    """UTF-8 JSON, one list item per line."""
+
+    name = "json"
+    id = 0
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def dump_list(self, items, base: Optional[bytes] = None, starts=None, ends=None):
+        """Append encoded ``items`` to the list body ``base`` (or start a new one).
+
+        Returns ``(body, starts, ends)`` with every item's byte span.
+        """
+        starts = array("Q") if starts is None else starts
+        ends = array("Q") if ends is None else ends
+        prefix = b"[" if base is None else base.rstrip()[:-1]
+        parts, pos = [prefix], len(prefix)
+        for data in items:
+            if len(starts):
+                parts.append(b",\n")
+                pos += 2
+            starts.append(pos)
+            pos += len(data)
+            ends.append(pos)
+            parts.append(data)
+        parts.append(b"]")
+        return b"".join(parts), starts, ends
+
+    def scan(self, body: bytes):
+        """Recover item spans from a list body written without an index."""
+        text = body.decode("utf-8")
+        decoder = json.JSONDecoder()
+        starts, ends = array("Q"), array("Q")
+        i = text.index("[") + 1
+        byte_pos, char_pos = len(text[:i].encode("utf-8")), i
+        while True:
+            while text[i] in " \t\r\n,":
+                i += 1
+            if text[i] == "]":
+                break
+            _, end = decoder.raw_decode(text, i)
+            byte_pos += len(text[char_pos:i].encode("utf-8"))
+            starts.append(byte_pos)
+            byte_pos += len(text[i:end].encode("utf-8"))
+            ends.append(byte_pos)
+            i = char_pos = end
+        return starts, ends
+
+    def is_list(self, body: bytes) -> bool:
+        return bytes(body[:64]).lstrip().startswith(b"[")
+
+
+class MsgpackCodec:
+    """MessagePack; lists use a fixed-width array32 header so they can grow in place."""
+
+    name = "msgpack"
+    id = 1
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+    def dump_list(self, items, base: Optional[bytes] = None, starts=None, ends=None):
+        starts = array("Q") if starts is None else starts
+        ends = array("Q") if ends is None else ends
+        parts = [b"", b"" if base is None else bytes(base[5:])]
+        pos = 5 + len(parts[1])
+        for data in items:
+            starts.append(pos)
+            pos += len(data)
+            ends.append(pos)
+            parts.append(data)
+        parts[0] = b"\xdd" + struct.pack(">I", len(starts))
+        return b"".join(parts), starts, ends
+
+    def scan(self, body: bytes):
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(body)
+        starts, ends = array("Q"), array("Q")
+        for _ in range(unpacker.read_array_header()):
+            starts.append(unpacker.tell())
+            unpacker.skip()
+            ends.append(unpacker.tell())
+        return starts, ends
+
+    def is_list(self, body: bytes) -> bool:
+        return bool(body) and (body[0] == 0xDD or body[0] == 0xDC or 0x90 <= body[0] <= 0x9F)
+
+
+CODECS: Dict[str, Any] = {"json": JSONCodec()}
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+_BY_ID = {0: "json", 1: "msgpack"}
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# name -> (id, compress, decompress)
+COMPRESSORS: Dict[Optional[str], Tuple[int, Any, Any]] = {
+    None: (0, bytes, bytes),
+    "zlib": (1, lambda b: zlib.compress(b, 6), zlib.decompress),
+}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = (2, _zstd_compress, _zstd_decompress)
+_COMPRESSION_BY_ID = {0: None, 1: "zlib", 2: "zstd"}
+
+
+def get_codec(name: str = "json"):
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"LTM codec unavailable: {name}") from None
+
+
+def encode_file(body: bytes, codec: str = "json", compression: Optional[str] = None) -> bytes:
+    """Wrap an encoded body in the file header. Plain JSON stays headerless."""
+    if codec == "json" and compression is None:
+        return body
+    if compression not in COMPRESSORS:
+        raise ValueError(f"LTM compression unavailable: {compression}")
+    cid, compress, _ = COMPRESSORS[compression]
+    return _HEADER.pack(MAGIC, get_codec(codec).id, cid) + compress(body)
+
+
+def file_format(raw) -> Tuple[str, Optional[str]]:
+    """Detect ``(codec, compression)`` from the first bytes of a file."""
+    if len(raw) >= HEADER_SIZE and bytes(raw[:4]) == MAGIC:
+        _, codec_id, comp_id = _HEADER.unpack_from(bytes(raw[:HEADER_SIZE]))
+        return _BY_ID.get(codec_id, "?"), _COMPRESSION_BY_ID.get(comp_id, "?")
+    return "json", None
+
+
+def decode_body(raw, fmt: Tuple[str, Optional[str]] = None):
+    """Return the decompressed body of a file (a zero-copy slice if uncompressed)."""
+    if bytes(raw[:4]) != MAGIC:
+        return raw
+    codec, compression = fmt or file_format(raw)
+    body = memoryview(raw)[HEADER_SIZE:]
+    if compression is None:
+        return body
+    if compression not in COMPRESSORS:
+        raise ValueError(f"LTM compression unavailable: {compression}")
+    return COMPRESSORS[compression][2](body)
+
+
+def loads_file(raw) -> Any:
+    codec, compression = file_format(raw)
+    return get_codec(codec).loads(decode_body(raw, (codec, compression)))
@@ -0,0 +1,220 @@
+"""SQLite (WAL) storage backend for long-term memory."""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ltm_store import wait_writes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    kind TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memory_kind ON memory(kind, id);
+CREATE INDEX IF NOT EXISTS memory_timestamp ON memory(timestamp);
+"""
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.lower() if isinstance(value, str) else value
+
+
+class SQLiteStore:
+    """Long-term memory stored as one row per MemoryItem.
+
+    Each row keeps the item's timestamp, its kind (the first data key) and the
+    data as a JSON payload. WAL mode lets any number of reader connections,
+    including other processes, share the database while one writer appends.
+    The store is a sequence like :class:`ltm_view.LTMView` and answers the
+    same ``last``/``search``/``between`` queries from its indexes.
+    """
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        factory: Callable[[Dict], Any] = lambda d: d,
+        dump: Callable[[Any], Dict] = lambda item: item,
+    ) -> None:
+        self.path = path
+        self.factory = factory
+        self.dump = dump
+        self.writer = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+        # Python's lower() so matching agrees with str.lower() on non-ASCII text
+        self._conn.create_function("py_lower", 1, _lower, deterministic=True)
+        # COUNT(*) walks the table, so keep a tally of this connection's rows
+        # (queued inserts included) and recount only when another connection
+        # committed, which is what PRAGMA data_version reports
+        self._queued = 0
+        self._version = self._data_version()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, args=()) -> List[tuple]:
+        wait_writes(self.path)
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def _decode(self, row) -> Any:
+        timestamp, payload = row
+        return self.factory({"timestamp": timestamp, "data": json.loads(payload)})
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            version = self._data_version()
+            if version != self._version:
+                self._version = version
+                stored = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+                self._count = stored + self._queued
+            return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            rows = self._query(
+                "SELECT timestamp, payload FROM memory ORDER BY id LIMIT ? OFFSET ?",
+                (max(0, stop - start), start),
+            )
+            return [self._decode(r) for r in rows[::step]]
+        if index < 0:
+            index += len(self)
+        rows = self._query(
+            "SELECT timestamp, payload FROM memory ORDER BY id LIMIT 1 OFFSET ?",
+            (index,),
+        ) if index >= 0 else []
+        if not rows:
+            raise IndexError("SQLiteStore index out of range")
+        return self._decode(rows[0])
+
+    def __iter__(self) -> Iterator[Any]:
+        last_id = 0
+        while True:
+            rows = self._query(
+                "SELECT id, timestamp, payload FROM memory WHERE id > ? ORDER BY id LIMIT 512",
+                (last_id,),
+            )
+            if not rows:
+                return
+            for row in rows:
+                yield self._decode(row[1:])
+            last_id = rows[-1][0]
+
+    def append(self, item: Any) -> None:
+        self.extend([item])
+
+    def extend(self, items):
+        """Insert ``items``; returns a Future when a writer persists them."""
+        rows = []
+        for item in items:
+            record = self.dump(item)
+            data = record["data"]
+            rows.append((
+                record["timestamp"],
+                next(iter(data), None),
+                json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+            ))
+        with self._lock:
+            self._count += len(rows)
+            self._queued += len(rows)
+        if self.writer is not None:
+            return self.writer.submit(self._insert, rows, key=self.path)
+        self._insert(rows)
+        return None
+
+    def _insert(self, rows: List[tuple]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO memory (timestamp, kind, payload) VALUES (?, ?, ?)", rows
+            )
+            self._queued -= len(rows)
+
+    def prune(self, select) -> Tuple[bytearray, List[Dict], int]:
+        """Delete the rows ``select(times, kinds)`` rejects, a chunk per transaction.
+
+        Returns ``(keep flags, dropped records, bytes reclaimed)``; the bytes
+        are the pages the deletes freed for reuse inside the database file.
+        """
+        flags, doomed = self.plan_prune(select)
+        dropped, reclaimed = self.apply_prune(doomed)
+        return flags, dropped, reclaimed
+
+    def plan_prune(self, select) -> Tuple[bytearray, List[int]]:
+        """The scan half of :meth:`prune`: ``(keep flags, ids to delete)``.
+
+        Nothing changes yet, so readers may keep using row positions until
+        :meth:`apply_prune` runs.
+        """
+        with self._lock:
+            # no wait_writes: this runs on the writer thread ahead of queued inserts
+            rows = self._conn.execute("SELECT id, timestamp, kind FROM memory ORDER BY id").fetchall()
+        flags = select([r[1] for r in rows], [r[2] for r in rows])
+        return flags, [r[0] for r, keep in zip(rows, flags) if not keep]
+
+    def apply_prune(self, doomed: List[int]) -> Tuple[List[Dict], int]:
+        """Delete the rows ``doomed`` by :meth:`plan_prune`; ``(dropped, bytes)``."""
+        dropped: List[Dict] = []
+        with self._lock:
+            page_size, free_before = self._free_pages()
+            for start in range(0, len(doomed), 500):
+                chunk = doomed[start : start + 500]
+                marks = ",".join("?" * len(chunk))
+                with self._conn:
+                    found = self._conn.execute(
+                        f"SELECT timestamp, payload FROM memory WHERE id IN ({marks}) ORDER BY id", chunk
+                    ).fetchall()
+                    self._conn.execute(f"DELETE FROM memory WHERE id IN ({marks})", chunk)
+                dropped.extend({"timestamp": t, "data": json.loads(p)} for t, p in found)
+                self._count -= len(found)
+            _, free_after = self._free_pages()
+        return dropped, (free_after - free_before) * page_size
+
+    def _free_pages(self) -> Tuple[int, int]:
+        # caller holds the lock
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_size, self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    # ---- indexed queries ----
+    def last(self, kind: str, n: int = 1) -> List[Any]:
+        """Return the newest ``n`` items whose kind is ``kind``, oldest first."""
+        rows = self._query(
+            "SELECT timestamp, payload FROM memory WHERE kind = ? ORDER BY id DESC LIMIT ?",
+            (kind, n),
+        )
+        return [self._decode(r) for r in reversed(rows)]
+
+    def search(self, kind: str, text: str) -> List[Any]:
+        """Return items of ``kind`` whose text contains ``text`` (case-insensitive)."""
+        rows = self._query(
+            "SELECT timestamp, payload FROM memory WHERE kind = ? "
+            "AND instr(py_lower(json_extract(payload, '$.' || kind)), ?) > 0 ORDER BY id",
+            (kind, text.lower()),
+        )
+        return [self._decode(r) for r in rows]
+
+    def between(self, start: float, end: float, kind: Optional[str] = None) -> List[Any]:
+        """Return items with ``start <= timestamp <= end``, optionally of one kind."""
+        sql = "SELECT timestamp, payload FROM memory WHERE timestamp BETWEEN ? AND ?"
+        args: tuple = (start, end)
+        if kind is not None:
+            sql += " AND kind = ?"
+            args += (kind,)
+        return [self._decode(r) for r in self._query(sql + " ORDER BY timestamp, id", args)]
@@ -1,29 +1,498 @@
-import json, os, tempfile, hashlib, time
+import json, os, tempfile, hashlib, struct, zlib, threading, marshal
+from array import array
+from collections import OrderedDict
 import portalocker
 
+from ltm_codec import HEADER_SIZE, decode_body, encode_file, file_format, get_codec, loads_file
+
 PATH = "ltm_state.json"
 LOCK_SUFFIX = ".lock"
+JOURNAL_SUFFIX = ".journal"
+INDEX_SUFFIX = ".idx"
+
+# Journal layout: magic + SHA-256 of the snapshot it extends, followed by
+# records framed as (payload length, crc32) + UTF-8 JSON payload.
+JOURNAL_MAGIC = b"RQJ1"
+_FRAME = struct.Struct("<II")
+_HEADER_SIZE = len(JOURNAL_MAGIC) + 32
+
+# Offset index sidecar: magic + identity of the snapshot it describes
+# (inode, size, mtime_ns, item count) + its SHA-256, then the start and end
+# byte offsets of every list item as native uint64 arrays.
+INDEX_MAGIC = b"RQX1"
+_INDEX_HEAD = struct.Struct("<QQqQ32s")
+
+# Fold the journal into a fresh snapshot once it is at least COMPACT_MIN_BYTES
+# and COMPACT_RATIO times the size of the snapshot it extends.
+COMPACT_MIN_BYTES = 1 << 20
+COMPACT_RATIO = 0.5
+
+# Default (codec, compression) for new snapshots; see ltm_codec. Existing
+# files keep the format they were written in when compacted.
+CODEC = "json"
+COMPRESSION = None
+
+# Long-term memory backends selectable through open_store(). Without an
+# explicit choice, files ending in one of SQLITE_EXTENSIONS use SQLite.
+BACKENDS = ("json", "sqlite")
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Process-wide cache of parsed read_ltm results, keyed on the snapshot's and
+# journal's (inode, size, mtime_ns). Objects are kept marshalled so every hit
+# returns a private copy; files larger than READ_CACHE_MAX_BYTES are not cached.
+READ_CACHE_ENTRIES = 64
+READ_CACHE_MAX_BYTES = 8 << 20
+
+_state_lock = threading.Lock()
+_journals = {}  # path -> (snapshot stat, journal stat) last verified by this process
+_committed = {}  # path -> (sha256 hex, snapshot stat) of this process's last write_ltm
+_compacting = set()
+_pending = {}  # abspath -> writes queued on an in-process writer thread
+_pending_done = threading.Condition(_state_lock)
+_read_cache = OrderedDict()  # abspath -> ((snapshot stat, journal stat), marshalled object)
+STATS = {"writes": 0, "skipped": 0}
+READ_STATS = {"hits": 0, "misses": 0}
+
 
 def _sha256(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
+def _dir(path: str) -> str:
+    return os.path.dirname(path) or "."
+
+def _stat_key(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def _read_bytes(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+def begin_write(path: str) -> None:
+    """Note that a write to ``path`` was queued on a background writer."""
+    key = os.path.abspath(path)
+    with _state_lock:
+        _pending[key] = _pending.get(key, 0) + 1
+
+def end_write(path: str) -> None:
+    key = os.path.abspath(path)
+    with _state_lock:
+        if _pending.get(key, 0) <= 1:
+            _pending.pop(key, None)
+            _pending_done.notify_all()
+        else:
+            _pending[key] -= 1
+
+def wait_writes(path: str, timeout: float = None) -> bool:
+    """Block until queued writes to ``path`` have landed (read-your-writes)."""
+    key = os.path.abspath(path)
+    with _state_lock:
+        return _pending_done.wait_for(lambda: key not in _pending, timeout)
+
+def journal_path(path: str = PATH) -> str:
+    return path + JOURNAL_SUFFIX
+
+def index_path(path: str = PATH) -> str:
+    return path + INDEX_SUFFIX
+
+def _replay(buf: bytes, digest: bytes, decode=True):
+    """Decode journal records extending the snapshot with SHA-256 ``digest``.
+
+    Returns ``(records, valid_end)``. A journal written against another
+    snapshot is stale and yields nothing; replay stops at the first torn or
+    corrupt frame.
+    """
+    if len(buf) < _HEADER_SIZE or not buf.startswith(JOURNAL_MAGIC):
+        return [], 0
+    if buf[len(JOURNAL_MAGIC):_HEADER_SIZE] != digest:
+        return [], 0
+    records, pos = [], _HEADER_SIZE
+    while pos + _FRAME.size <= len(buf):
+        length, crc = _FRAME.unpack_from(buf, pos)
+        start = pos + _FRAME.size
+        payload = buf[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            break
+        if decode:
+            try:
+                payload = json.loads(payload.decode("utf-8"))
+            except ValueError:
+                break
+        records.append(payload)
+        pos = start + length
+    return records, pos
+
+def read_journal(path: str = PATH) -> bytes:
+    return _read_bytes(journal_path(path))
+
+def replay_journal(path: str = PATH, digest: bytes = None, buf: bytes = None) -> list:
+    """Return the decoded journal records extending the snapshot ``digest``."""
+    if digest is None:
+        digest = _snapshot_digest(path)
+    return _replay(read_journal(path) if buf is None else buf, digest)[0]
+
+def _cache_put(path: str, key, obj) -> None:
+    try:
+        blob = marshal.dumps(obj)
+    except ValueError:
+        return
+    path = os.path.abspath(path)
+    with _state_lock:
+        _read_cache[path] = (key, blob)
+        _read_cache.move_to_end(path)
+        while len(_read_cache) > READ_CACHE_ENTRIES:
+            _read_cache.popitem(last=False)
+
+def _cache_get(path: str, key):
+    with _state_lock:
+        entry = _read_cache.get(os.path.abspath(path))
+        if entry is None or entry[0] != key:
+            READ_STATS["misses"] += 1
+            return None
+        READ_STATS["hits"] += 1
+        return entry[1]
+
+def clear_read_cache() -> None:
+    with _state_lock:
+        _read_cache.clear()
+
+def read_stats() -> dict:
+    """Return read-cache hit and miss counts for this process."""
+    with _state_lock:
+        return dict(READ_STATS)
+
 def read_ltm(path: str = PATH, default=None):
+    """Return the object stored at ``path`` (list journals replayed).
+
+    Unchanged files are served from the read cache; every call returns a
+    fresh object that the caller may modify.
+    """
+    wait_writes(path)
+    # Stat before reading: a change that races the read leaves a key that no
+    # longer matches, so the entry is simply refreshed on the next call.
+    key = (_stat_key(path), _stat_key(journal_path(path)))
+    if key == (None, None):
+        return default
+    blob = _cache_get(path, key)
+    if blob is not None:
+        return marshal.loads(blob)
+    obj, size = _load(path, default)
+    if obj is not default and size <= READ_CACHE_MAX_BYTES:
+        _cache_put(path, key, obj)
+    return obj
+
+def _load(path: str, default=None):
+    """Parse ``path`` and replay its journal; returns ``(object, bytes read)``."""
+    # The journal is read before the snapshot: if a compaction lands in
+    # between, the newer snapshot already contains the journal's records.
+    journal = _read_bytes(journal_path(path))
     try:
         with open(path, "rb") as f:
-            return json.loads(f.read().decode("utf-8"))
+            raw = f.read()
+    except FileNotFoundError:
+        raw = b""
     except Exception:
-        return default
+        return default, 0
+    records = _replay(journal, hashlib.sha256(raw).digest())[0] if journal else []
+    if not raw:
+        return (records if records else default), len(journal)
+    try:
+        obj = loads_file(raw)
+    except Exception:
+        return default, 0
+    if records and isinstance(obj, list):
+        obj.extend(records)
+    return obj, len(raw) + len(journal)
+
+def _atomic_write(data: bytes, path: str) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".ltm_", dir=_dir(path))
+    with os.fdopen(fd, "wb") as w:
+        w.write(data)
+        w.flush()
+        os.fsync(w.fileno())
+    os.replace(tmp, path)
 
-def write_ltm(obj, path: str = PATH):
-    data = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _drop_journal(path: str) -> None:
+    _remove(journal_path(path))
+    with _state_lock:
+        _journals.pop(path, None)
+
+def _unchanged(path: str, digest: str) -> bool:
+    """Whether ``path`` still holds exactly what we last wrote with ``digest``."""
+    with _state_lock:
+        cached = _committed.get(path)
+    if cached is None or cached[0] != digest:
+        return False
+    return cached[1] == _stat_key(path) and not os.path.exists(journal_path(path))
+
+def write_stats() -> dict:
+    """Counts of write_ltm calls that hit the disk and that were skipped."""
+    with _state_lock:
+        return dict(STATS)
+
+def _encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _write_index(path: str, digest: bytes, starts, ends) -> None:
+    key = _stat_key(path)
+    if key is None:
+        return
+    head = _INDEX_HEAD.pack(key[0], key[1], key[2], len(starts), digest)
+    _atomic_write(INDEX_MAGIC + head + starts.tobytes() + ends.tobytes(), index_path(path))
+
+def load_index(path: str = PATH, key=None):
+    """Return ``(digest, starts, ends)`` if the sidecar matches the snapshot.
+
+    ``key`` is the snapshot's (inode, size, mtime_ns); it defaults to a fresh
+    stat of ``path``.
+    """
+    key = _stat_key(path) if key is None else key
+    try:
+        with open(index_path(path), "rb") as f:
+            head = f.read(len(INDEX_MAGIC) + _INDEX_HEAD.size)
+            if key is None or not head.startswith(INDEX_MAGIC):
+                return None
+            ino, size, mtime_ns, count, digest = _INDEX_HEAD.unpack_from(head, len(INDEX_MAGIC))
+            if (ino, size, mtime_ns) != tuple(key):
+                return None
+            starts, ends = array("Q"), array("Q")
+            starts.fromfile(f, count)
+            ends.fromfile(f, count)
+    except (OSError, EOFError):
+        return None
+    return digest, starts, ends
+
+def snapshot_index(path: str = PATH, raw=None, key=None):
+    """Return ``(digest, starts, ends)`` for the list snapshot at ``path``.
+
+    Uses the sidecar when it is current; otherwise scans the snapshot once and
+    rewrites the sidecar. ``raw``/``key`` let callers pass the snapshot bytes
+    (or an mmap) and identity they already hold open. ``starts``/``ends`` are
+    None for non-list snapshots.
+    """
+    index = load_index(path, key)
+    if index is not None:
+        return index
+    raw = _read_bytes(path) if raw is None else raw
+    digest = hashlib.sha256(raw).digest()
+    fmt = file_format(raw)
+    codec = get_codec(fmt[0])
+    body = bytes(decode_body(raw, fmt))
+    if not codec.is_list(body):
+        return digest, None, None
+    starts, ends = codec.scan(body)
+    if key is None or key == _stat_key(path):
+        try:
+            _write_index(path, digest, starts, ends)
+        except OSError:
+            pass  # the sidecar is only a cache
+    return digest, starts, ends
+
+def _snapshot_digest(path: str) -> bytes:
+    index = load_index(path)
+    return index[0] if index is not None else hashlib.sha256(_read_bytes(path)).digest()
+
+def write_ltm(obj, path: str = PATH, fmt=None):
+    """Atomically replace ``path`` with ``obj``.
+
+    ``fmt`` is a ``(codec, compression)`` pair from :mod:`ltm_codec` and
+    defaults to ``(CODEC, COMPRESSION)``.
+    """
+    codec_name, compression = fmt or (CODEC, COMPRESSION)
+    codec = get_codec(codec_name)
+    starts = ends = None
+    if isinstance(obj, list):
+        body, starts, ends = codec.dump_list([codec.dumps(item) for item in obj])
+    else:
+        body = codec.dumps(obj)
+    data = encode_file(body, codec_name, compression)
     h = _sha256(data)
     lock_path = path + LOCK_SUFFIX
-    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    os.makedirs(_dir(path), exist_ok=True)
     with open(lock_path, "w") as lf, portalocker.Lock(lock_path, timeout=5):
-        fd, tmp = tempfile.mkstemp(prefix=".ltm_", dir=os.path.dirname(path) or ".")
-        with os.fdopen(fd, "wb") as w:
-            w.write(data)
-            w.flush()
-            os.fsync(w.fileno())
-        os.replace(tmp, path)
+        if _unchanged(path, h):
+            # identical document already on disk: skip the temp/fsync/rename
+            with _state_lock:
+                STATS["skipped"] += 1
+            return h
+        _atomic_write(data, path)
+        if starts is not None:
+            _write_index(path, bytes.fromhex(h), starts, ends)
+        else:
+            _remove(index_path(path))
+        # a full rewrite supersedes any pending journal records
+        _drop_journal(path)
+        snap_key = _stat_key(path)
+        with _state_lock:
+            _committed[path] = (h, snap_key)
+            STATS["writes"] += 1
+        if len(data) <= READ_CACHE_MAX_BYTES:
+            # cache what a disk read returns (tuples become lists, keys strings)
+            _cache_put(path, (snap_key, None), loads_file(data))
     return h
+
+def _open_journal(path: str) -> int:
+    """Return the offset new records go to, (re)creating the journal if needed.
+
+    Must be called with the writer lock held. The snapshot digest is only
+    looked up when it or the journal changed since this process last checked.
+    """
+    jpath = journal_path(path)
+    snap_key, journal_key = _stat_key(path), _stat_key(jpath)
+    with _state_lock:
+        cached = _journals.get(path)
+    if cached and cached == (snap_key, journal_key):
+        return journal_key[1]
+    digest = _snapshot_digest(path)
+    end = _replay(_read_bytes(jpath), digest, decode=False)[1] if journal_key else 0
+    if not end:
+        _atomic_write(JOURNAL_MAGIC + digest, jpath)
+        end = _HEADER_SIZE
+    elif end < journal_key[1]:
+        # drop a torn tail left behind by a crashed append
+        with open(jpath, "r+b") as f:
+            f.truncate(end)
+            os.fsync(f.fileno())
+    return end
+
+def append_ltm(items, path: str = PATH) -> int:
+    """Durably append ``items`` to the journal of the list stored at ``path``.
+
+    Each call costs O(len(items)) instead of rewriting the whole snapshot.
+    Returns the journal size in bytes after the append.
+    """
+    frames = []
+    for item in items:
+        payload = _encode(item)
+        frames.append(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+    lock_path = path + LOCK_SUFFIX
+    os.makedirs(_dir(path), exist_ok=True)
+    jpath = journal_path(path)
+    with open(lock_path, "w") as lf, portalocker.Lock(lock_path, timeout=5):
+        end = _open_journal(path)
+        with open(jpath, "r+b") as f:
+            f.seek(end)
+            f.write(b"".join(frames))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        with _state_lock:
+            _journals[path] = (_stat_key(path), _stat_key(jpath))
+    _maybe_compact(path, size)
+    return size
+
+def needs_compaction(path: str = PATH, journal_size: int = None) -> bool:
+    if journal_size is None:
+        key = _stat_key(journal_path(path))
+        journal_size = key[1] if key else 0
+    if journal_size < COMPACT_MIN_BYTES:
+        return False
+    snap = _stat_key(path)
+    return journal_size >= COMPACT_RATIO * (snap[1] if snap else 0)
+
+def compact_ltm(path: str = PATH) -> bool:
+    """Fold the journal into a fresh snapshot. Returns True if it did any work.
+
+    Journal payloads are spliced onto the snapshot body without re-parsing
+    the history, keeping the snapshot's codec and compression. The new snapshot replaces the old one atomically before the
+    journal is removed; if the process dies in between, the leftover journal
+    no longer matches the snapshot digest and is ignored by readers.
+    """
+    lock_path = path + LOCK_SUFFIX
+    jpath = journal_path(path)
+    if not os.path.exists(jpath):
+        return False
+    with open(lock_path, "w") as lf, portalocker.Lock(lock_path, timeout=5):
+        digest, starts, ends = snapshot_index(path)
+        records = _replay(_read_bytes(jpath), digest, decode=False)[0]
+        if records:
+            raw = _read_bytes(path)
+            fmt = file_format(raw) if raw else (CODEC, COMPRESSION)
+            codec = get_codec(fmt[0])
+            if not raw:
+                starts, ends, body = array("Q"), array("Q"), None
+            elif starts is None:
+                return False
+            else:
+                body = bytes(decode_body(raw, fmt))
+            if codec.name != "json":
+                records = [codec.dumps(json.loads(r)) for r in records]
+            body, starts, ends = codec.dump_list(records, body, starts, ends)
+            data = encode_file(body, *fmt)
+            _atomic_write(data, path)
+            _write_index(path, hashlib.sha256(data).digest(), starts, ends)
+        _drop_journal(path)
+    return True
+
+def prune_ltm(path: str, select):
+    """Rewrite the list at ``path`` without the records ``select`` rejects.
+
+    ``select(records)`` returns one keep flag per stored record. Returns
+    ``(flags, dropped records, bytes reclaimed)``. Appends to ``path`` must
+    not run concurrently, so call it from the writer thread; unlike
+    :func:`read_ltm` it does not wait for queued writes.
+    """
+    before = sum(k[1] for k in (_stat_key(path), _stat_key(journal_path(path))) if k)
+    records, _ = _load(path, [])
+    flags = select(records)
+    dropped = [r for r, keep in zip(records, flags) if not keep]
+    if not dropped:
+        return flags, dropped, 0
+    try:
+        with open(path, "rb") as f:
+            fmt = file_format(f.read(HEADER_SIZE))
+    except FileNotFoundError:  # only journal records so far
+        fmt = None
+    write_ltm([r for r, keep in zip(records, flags) if keep], path, fmt)
+    return flags, dropped, before - os.path.getsize(path)
+
+def _compact_worker(path: str) -> None:
+    try:
+        compact_ltm(path)
+    except Exception:
+        pass  # retried on the next append that crosses the threshold
+    finally:
+        with _state_lock:
+            _compacting.discard(path)
+
+def _maybe_compact(path: str, journal_size: int) -> None:
+    if not needs_compaction(path, journal_size):
+        return
+    with _state_lock:
+        if path in _compacting:
+            return
+        _compacting.add(path)
+    threading.Thread(target=_compact_worker, args=(path,), daemon=True).start()
+
+def resolve_backend(path: str = PATH, backend: str = None) -> str:
+    if backend is None:
+        backend = "sqlite" if path.lower().endswith(SQLITE_EXTENSIONS) else "json"
+    return backend
+
+def open_store(path: str = PATH, backend: str = None, factory=lambda d: d, dump=lambda item: item):
+    """Open the long-term memory at ``path`` with the chosen backend.
+
+    ``factory`` turns a serialized ``{"timestamp", "data"}`` record into an
+    item and ``dump`` does the reverse. Both backends expose the same sequence
+    interface plus ``append``/``extend`` and ``last``/``search``/``between``.
+    """
+    backend = resolve_backend(path, backend)
+    if backend == "json":
+        from ltm_view import LTMView
+        return LTMView(path, factory, dump)
+    if backend == "sqlite":
+        from ltm_sqlite import SQLiteStore
+        return SQLiteStore(path, factory, dump)
+    raise ValueError(f"unknown LTM backend: {backend}")
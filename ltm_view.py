@@ -0,0 +1,182 @@
+"""Lazy, offset-indexed view over a long-term memory file."""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ltm_codec import HEADER_SIZE, MAGIC, decode_body, file_format, get_codec
+from ltm_store import append_ltm, prune_ltm, read_journal, replay_journal, snapshot_index, wait_writes
+
+# Windows cannot replace a file that is mapped, which would block compaction
+# and pruning for as long as a view is open; read the snapshot there instead.
+MMAP_SNAPSHOTS = os.name != "nt"
+
+
+class LTMView(Sequence):
+    """Sequence over the snapshot + journal written by :mod:`ltm_store`.
+
+    Opening the view only loads the offset sidecar and the (bounded) journal;
+    snapshot records are memory-mapped (read into memory on Windows, see
+    ``MMAP_SNAPSHOTS``) and decoded with ``factory`` when they
+    are indexed or iterated. :meth:`append` journals a new item (serialized
+    with ``dump``) and keeps the object itself in memory; with a ``writer``
+    (see :class:`persistence.PersistenceWorker`) the journal append happens on
+    the writer thread.
+    """
+
+    backend = "json"
+
+    def __init__(
+        self,
+        path: str,
+        factory: Callable[[Dict], Any] = lambda d: d,
+        dump: Callable[[Any], Dict] = lambda item: item,
+    ) -> None:
+        self.path = path
+        self.factory = factory
+        self.dump = dump
+        self.writer = None
+        self._map = None
+        self._body = None  # mmap, or the decompressed body of a compressed snapshot
+        self._base = 0  # offset of the body inside self._body
+        self._codec = get_codec("json")
+        self._tail: List[Any] = []
+        # The journal is read before the snapshot is opened: if a compaction
+        # lands in between, the newer snapshot already holds its records and
+        # the old journal no longer matches the snapshot digest.
+        wait_writes(path)
+        journal = read_journal(path)
+        raw = None
+        try:
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_size and MMAP_SNAPSHOTS:
+                    raw = self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                elif st.st_size:
+                    raw = f.read()
+        except FileNotFoundError:
+            st = None
+        if raw is not None:
+            key = (st.st_ino, st.st_size, st.st_mtime_ns)
+            digest, starts, ends = snapshot_index(path, raw, key)
+            if starts is None:
+                self.close()
+                raise ValueError(f"{path} does not hold a list")
+            fmt = file_format(raw[:HEADER_SIZE])
+            self._codec = get_codec(fmt[0])
+            if fmt[1] is not None:
+                self._body = decode_body(raw[:], fmt)
+                self.close()
+            else:
+                self._body = raw
+                self._base = HEADER_SIZE if raw[:4] == MAGIC else 0
+        else:
+            digest, starts, ends = hashlib.sha256(b"").digest(), (), ()
+        self._starts, self._ends = starts, ends
+        self._journal = replay_journal(path, digest, journal)
+
+    def close(self) -> None:
+        if self._map is not None:
+            if self._body is self._map:
+                self._body = None
+            self._map.close()
+            self._map = None
+
+    def __len__(self) -> int:
+        return len(self._starts) + len(self._journal) + len(self._tail)
+
+    def _record(self, i: int) -> Dict:
+        n = len(self._starts)
+        if i < n:
+            base = self._base
+            return self._codec.loads(self._body[base + self._starts[i]:base + self._ends[i]])
+        i -= n
+        if i < len(self._journal):
+            return self._journal[i]
+        return self.dump(self._tail[i - len(self._journal)])
+
+    def _decode(self, i: int) -> Any:
+        tail = i - len(self._starts) - len(self._journal)
+        if tail >= 0:
+            return self._tail[tail]
+        return self.factory(self._record(i))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LTMView index out of range")
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self._decode(i)
+
+    def __reversed__(self) -> Iterator[Any]:
+        for i in range(len(self) - 1, -1, -1):
+            yield self._decode(i)
+
+    def append(self, item: Any) -> None:
+        self.extend([item])
+
+    def extend(self, items):
+        """Append ``items``; returns a Future when a writer persists them."""
+        items = list(items)
+        records = [self.dump(item) for item in items]
+        self._tail.extend(items)
+        if self.writer is not None:
+            return self.writer.submit(append_ltm, records, self.path, key=self.path)
+        append_ltm(records, self.path)
+        return None
+
+    def prune(self, select) -> Tuple[bytearray, List[Dict], int]:
+        """Rewrite the file without the items ``select(times, kinds)`` rejects.
+
+        Only items already on disk are considered, so run this on the writer
+        thread. Returns ``(keep flags, dropped records, bytes reclaimed)``.
+        The view keeps showing the old contents; open a new one afterwards.
+        """
+        return prune_ltm(
+            self.path,
+            lambda records: select([r["timestamp"] for r in records], [kind_of(r) for r in records]),
+        )
+
+    # ---- queries (full scans; the SQLite backend answers these from indexes) ----
+    def last(self, kind: str, n: int = 1) -> List[Any]:
+        """Return the newest ``n`` items whose kind is ``kind``, oldest first."""
+        found: List[int] = []
+        for i in range(len(self) - 1, -1, -1):
+            if len(found) >= n:
+                break
+            if kind_of(self._record(i)) == kind:
+                found.append(i)
+        return [self._decode(i) for i in reversed(found)]
+
+    def search(self, kind: str, text: str) -> List[Any]:
+        """Return items of ``kind`` whose text contains ``text`` (case-insensitive)."""
+        text = text.lower()
+        out = []
+        for i in range(len(self)):
+            rec = self._record(i)
+            if kind_of(rec) == kind and text in str(rec["data"][kind]).lower():
+                out.append(self._decode(i))
+        return out
+
+    def between(self, start: float, end: float, kind: Optional[str] = None) -> List[Any]:
+        """Return items with ``start <= timestamp <= end``, optionally of one kind."""
+        out = []
+        for i in range(len(self)):
+            rec = self._record(i)
+            if start <= rec["timestamp"] <= end and (kind is None or kind_of(rec) == kind):
+                out.append(self._decode(i))
+        return out
+
+
+def kind_of(record: Dict) -> Optional[str]:
+    """Kind tag of a serialized MemoryItem: the first key of its data."""
+    return next(iter(record["data"]), None)
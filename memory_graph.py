@@ -6,8 +6,9 @@ from typing import Dict, Set, List
 class MemoryGraph:
     """Store facts as subject-relation-object triples and link related concepts."""
 
-    def __init__(self, path: str = "ltm_graph.json") -> None:
+    def __init__(self, path: str = "ltm_graph.json", writer=None) -> None:
         self.path = path
+        self.writer = writer
         self.graph: Dict[str, Dict[str, Set[str]]] = self._load()
 
     def _load(self) -> Dict[str, Dict[str, Set[str]]]:
@@ -20,6 +21,12 @@ class MemoryGraph:
 
     def _save(self) -> None:
         data = {s: {r: list(objs) for r, objs in rels.items()} for s, rels in self.graph.items()}
+        if self.writer is not None:
+            self.writer.submit(self._write, data, key=self.path)
+        else:
+            self._write(data)
+
+    def _write(self, data: Dict[str, Dict[str, List[str]]]) -> None:
         with open(self.path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
 
@@ -0,0 +1,85 @@
+"""Compact record type for short- and long-term memories."""
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Mapping
+
+
+class _Payload(dict):
+    """``MemoryItem.data``: a plain dict whose changes are written back to the item."""
+
+    __slots__ = ("_item",)
+
+    def __init__(self, item: "MemoryItem", data: Mapping[str, Any]) -> None:
+        super().__init__(data)
+        self._item = item
+
+    def _written(method):
+        def write_back(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._item.data = dict(self)
+            return result
+
+        write_back.__name__ = method.__name__
+        return write_back
+
+    __setitem__ = _written(dict.__setitem__)
+    __delitem__ = _written(dict.__delitem__)
+    __ior__ = _written(dict.__ior__)
+    clear = _written(dict.clear)
+    pop = _written(dict.pop)
+    popitem = _written(dict.popitem)
+    setdefault = _written(dict.setdefault)
+    update = _written(dict.update)
+    del _written
+
+
+class MemoryItem:
+    """One memory: a timestamp and a ``{kind: value}`` payload.
+
+    Nearly every memory carries a single key, so the item keeps that key as
+    an interned :attr:`kind` next to its :attr:`value` instead of a dict per
+    item; payloads with several keys are kept whole. :attr:`data` builds a
+    dict on access whose changes are written back to the item, so existing
+    ``item.data[...] = value`` and ``json.dumps(item.data)`` code keeps
+    working while millions of stored items cost a slotted object each.
+    ``item.__dict__`` is the ``{"timestamp", "data"}`` record the long-term
+    stores serialize, and ``MemoryItem(**record)`` rebuilds the item.
+    """
+
+    __slots__ = ("timestamp", "kind", "value", "_extra")
+
+    def __init__(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        self.timestamp = timestamp
+        self.data = data
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._extra is not None:
+            return _Payload(self, self._extra)
+        return _Payload(self, {self.kind: self.value})
+
+    @data.setter
+    def data(self, data: Mapping[str, Any]) -> None:
+        kind = next(iter(data), None)
+        self.kind = sys.intern(kind) if isinstance(kind, str) else kind
+        if len(data) == 1:
+            self.value = data[kind]
+            self._extra = None
+        else:
+            self.value = None
+            self._extra = dict(data)
+
+    @property
+    def __dict__(self) -> Dict[str, Any]:  # type: ignore[override]
+        return {"timestamp": self.timestamp, "data": dict(self.data)}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MemoryItem):
+            return NotImplemented
+        return self.timestamp == other.timestamp and self.data == other.data
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"MemoryItem(timestamp={self.timestamp!r}, data={dict(self.data)!r})"
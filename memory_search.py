@@ -0,0 +1,226 @@
+"""Ranked full-text search over memories with SQLite FTS5."""
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from ltm_store import wait_writes
+
+# memory kinds whose text is searchable
+KINDS = ("note", "reflection", "dream")
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+    text, kind UNINDEXED, timestamp UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS memory_vocab USING fts5vocab(memory_fts, row);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+CREATE TABLE IF NOT EXISTS pending (id INTEGER PRIMARY KEY);
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+def fts_query(words: Iterable[str]) -> str:
+    """An FTS5 query matching any of ``words``."""
+    return " OR ".join('"%s"' % w for w in words)
+
+
+class MemorySearch:
+    """FTS5 index of note, reflection and dream texts ranked by BM25.
+
+    :meth:`add` buffers rows and inserts them in one transaction, on the
+    ``writer`` (a :class:`persistence.PersistenceWorker`) when one is given.
+    A newly created index remembers how many long-term items existed at that
+    point; :meth:`backfill` indexes them once before the first search.
+
+    Rows added with ``pending=True`` belong to short-term memories: their
+    rowids are listed in the ``pending`` table until :meth:`persist` swaps
+    them for the rows of what reached the long-term store. Pending rows left
+    by a process that exited before consolidating are deleted on open, so
+    the index never answers with memories the store lost.
+
+    Query words found in more than half of the rows are dropped before
+    matching: FTS5 clamps their BM25 weight to almost zero, so the order of
+    rows matching any rarer word is unchanged while the common words no
+    longer force every row to be scored. Counting a word's rows walks its
+    whole posting list, so each verdict is cached until the table has grown
+    by a tenth.
+    """
+
+    def __init__(self, path: str, writer=None) -> None:
+        self.path = path
+        self.writer = writer
+        self._lock = threading.Lock()
+        self._rows: List[Tuple[Tuple[str, str, float], bool]] = []
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # a derived index: losing the last commits on power loss is harmless
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self.backfill_pending = meta.get("backfill")
+        self.rows = meta.get("rows", 0)
+        with self._conn:
+            lost = self._conn.execute(
+                "DELETE FROM memory_fts WHERE rowid IN (SELECT id FROM pending)"
+            ).rowcount
+            if lost:
+                self._conn.execute("DELETE FROM pending")
+                self.rows -= lost
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (self.rows,))
+        self._common = {}  # word -> (is common, row count when checked)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def needs_backfill(self, count: int) -> None:
+        """Mark a new index as missing the first ``count`` long-term items."""
+        if self.backfill_pending is None:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('backfill', ?)", (count,)
+                )
+            self.backfill_pending = count
+
+    def backfill(self, items: Iterable) -> None:
+        """Index ``items`` (the pending long-term prefix) and clear the mark."""
+        rows = [row for row in map(_row, items) if row]
+        with self._lock, self._conn:
+            self._insert(rows)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('backfill', 0)")
+        self.backfill_pending = 0
+
+    def forget(self, items: Iterable, backfill: Optional[int] = None) -> int:
+        """Delete the rows of pruned ``items``; returns how many were removed.
+
+        ``backfill`` is the new count of long-term items still to index when
+        pruning shortened that prefix.
+        """
+        rows = [row for row in map(_row, items) if row]
+        with self._lock, self._conn:
+            removed = 0
+            if rows:
+                self._conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS pruned "
+                    "(kind, text, timestamp, PRIMARY KEY (timestamp, kind, text))"
+                )
+                self._conn.executemany("INSERT OR IGNORE INTO pruned VALUES (?, ?, ?)", rows)
+                removed = self._conn.execute(
+                    "DELETE FROM memory_fts WHERE rowid IN (SELECT f.rowid FROM memory_fts f "
+                    "JOIN pruned p ON p.timestamp = f.timestamp AND p.kind = f.kind AND p.text = f.text)"
+                ).rowcount
+                self._conn.execute("DELETE FROM pruned")
+                self.rows -= removed
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (self.rows,))
+            if backfill is not None and self.backfill_pending:
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('backfill', ?)", (backfill,))
+                self.backfill_pending = backfill
+        return removed
+
+    def add(self, item, pending: bool = False) -> bool:
+        """Queue ``item`` if it has searchable text. Returns True if queued.
+
+        ``pending`` marks a short-term memory, see :meth:`persist`.
+        """
+        row = _row(item)
+        if row is None:
+            return False
+        with self._lock:
+            self._rows.append((row, pending))
+            first = len(self._rows) == 1
+        if first:
+            # rows queued before this flush runs share its transaction
+            self._submit(self._flush)
+        return True
+
+    def persist(self, moved: Iterable, stored: Iterable) -> None:
+        """Replace the pending rows of ``moved`` by rows for ``stored``.
+
+        ``moved`` are the oldest short-term items, added as pending, and
+        ``stored`` what was appended for them to the long-term store (merged
+        summaries included).
+        """
+        count = sum(1 for row in map(_row, moved) if row)
+        rows = [row for row in map(_row, stored) if row]
+        if count or rows:
+            self._submit(lambda: self._persist(count, rows))
+
+    def _persist(self, count: int, rows: List[Tuple[str, str, float]]) -> None:
+        with self._lock, self._conn:
+            # pending ids grow in STM order, the oldest are consolidated first
+            oldest = "SELECT id FROM pending ORDER BY id LIMIT ?"
+            removed = self._conn.execute(
+                "DELETE FROM memory_fts WHERE rowid IN (%s)" % oldest, (count,)
+            ).rowcount
+            self._conn.execute("DELETE FROM pending WHERE id IN (%s)" % oldest, (count,))
+            self.rows -= removed
+            self._insert(rows)
+
+    def _submit(self, fn) -> None:
+        if self.writer is not None:
+            self.writer.submit(fn, key=self.path)
+        else:
+            fn()
+
+    def _flush(self) -> None:
+        with self._lock:
+            queued, self._rows = self._rows, []
+            with self._conn:
+                self._insert([row for row, pending in queued if not pending])
+                for row, pending in queued:
+                    if pending:
+                        self._insert([row], pending=True)
+
+    def _insert(self, rows: List[Tuple[str, str, float]], pending: bool = False) -> None:
+        # caller holds the lock and the transaction
+        sql = "INSERT INTO memory_fts (kind, text, timestamp) VALUES (?, ?, ?)"
+        if pending:
+            for row in rows:
+                rowid = self._conn.execute(sql, row).lastrowid
+                self._conn.execute("INSERT INTO pending VALUES (?)", (rowid,))
+        else:
+            self._conn.executemany(sql, rows)
+        self.rows += len(rows)
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (self.rows,))
+
+    def search(self, text: str, limit: int = 5, kinds: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """Return up to ``limit`` ``(kind, text)`` pairs, best BM25 match first."""
+        words = list(dict.fromkeys(_WORD.findall(text.lower())))
+        if not words:
+            return []
+        wait_writes(self.path)
+        with self._lock:
+            common = {w for w in words if self._is_common(w)}
+            sql = "SELECT kind, text FROM memory_fts WHERE memory_fts MATCH ?"
+            args: list = [fts_query([w for w in words if w not in common] or words)]
+            if kinds is not None:
+                kinds = list(kinds)
+                sql += " AND kind IN (%s)" % ",".join("?" * len(kinds))
+                args += kinds
+            return self._conn.execute(sql + " ORDER BY rank LIMIT ?", args + [limit]).fetchall()
+
+    def _is_common(self, word: str) -> bool:
+        # caller holds the lock
+        cached = self._common.get(word)
+        if cached is not None and self.rows <= cached[1] * 1.1:
+            return cached[0]
+        row = self._conn.execute("SELECT doc FROM memory_vocab WHERE term = ?", (word,)).fetchone()
+        common = bool(row) and row[0] * 2 > self.rows
+        if len(self._common) >= 4096:
+            self._common.clear()
+        self._common[word] = (common, self.rows)
+        return common
+
+
+def _row(item) -> Optional[Tuple[str, str, float]]:
+    data = getattr(item, "data", None) or {}
+    for kind in KINDS:
+        text = data.get(kind)
+        if isinstance(text, str):
+            return (kind, text, item.timestamp)
+    return None
@@ -0,0 +1,155 @@
+"""Write coalescing and the background writer for Requiem's persistent files."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from ltm_store import begin_write, end_write, write_ltm
+
+
+class PersistenceWorker:
+    """Single writer thread that performs file writes off the caller's path.
+
+    :meth:`submit` queues a write and returns a :class:`Future`. The queue is
+    bounded: when ``maxsize`` writes are pending, submitters block until the
+    writer catches up (backpressure) instead of letting memory grow. Writes
+    run in submission order. A ``key`` (the target path) registers the write
+    with :mod:`ltm_store` so readers of that path wait for it to land.
+    After :meth:`shutdown`, writes run inline in the caller.
+    """
+
+    def __init__(self, maxsize: int = 256, name: str = "requiem-writer") -> None:
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._closed = False
+        self.completed = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, fn: Callable, *args, key: Optional[str] = None, **kwargs) -> Future:
+        future: Future = Future()
+        if key is not None:
+            begin_write(key)
+        task = (future, fn, args, kwargs, key)
+        if self._closed or threading.current_thread() is self._thread:
+            self._execute(task)
+        else:
+            self._queue.put(task)
+        return future
+
+    def _execute(self, task) -> None:
+        future, fn, args, kwargs, key = task
+        try:
+            if future.set_running_or_notify_cancel():
+                future.set_result(fn(*args, **kwargs))
+                self.completed += 1
+        except BaseException as exc:
+            self.failed += 1
+            future.set_exception(exc)
+        finally:
+            if key is not None:
+                end_write(key)
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                self._execute(task)
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Block until every write submitted so far has finished."""
+        if not self._closed and threading.current_thread() is not self._thread:
+            self._queue.join()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Drain pending writes and stop the writer thread."""
+        if self._closed:
+            return
+        self.drain()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+class StatePersister:
+    """Dirty-flag persister that group-commits state saves.
+
+    Callers mark the state dirty as often as they like; the document is built
+    and written durably only on :meth:`commit` (once per turn, or at most once
+    per ``interval`` seconds) or :meth:`flush`. ``on_commit`` runs after each
+    durable write, e.g. to refresh backups. With a ``writer`` the snapshot is
+    still taken on the caller's thread but written (and backed up) by the
+    :class:`PersistenceWorker`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        snapshot: Callable[[], Dict[str, Any]],
+        on_commit: Optional[Callable[[], None]] = None,
+        interval: float = 0.0,
+        writer: Optional[PersistenceWorker] = None,
+    ) -> None:
+        self.path = path
+        self.writer = writer
+        self.snapshot = snapshot
+        self.on_commit = on_commit
+        self.interval = interval
+        self.dirty = False
+        self.requests = 0
+        self.commits = 0
+        self.last_commit = 0.0
+        self.last_digest: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def mark_dirty(self) -> None:
+        with self._lock:
+            self.dirty = True
+            self.requests += 1
+
+    def commit(self) -> bool:
+        """Write pending changes if the commit interval has elapsed."""
+        if time.time() - self.last_commit < self.interval:
+            return False
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Write pending changes now. Returns True if anything was written."""
+        with self._lock:
+            if not self.dirty:
+                return False
+            self.dirty = False
+            try:
+                doc = self.snapshot()
+            except Exception:
+                self.dirty = True
+                raise
+            self.commits += 1
+            self.last_commit = time.time()
+        if self.writer is not None:
+            self.writer.submit(self._write, doc, key=self.path)
+        else:
+            self._write(doc)
+        return True
+
+    def _write(self, doc: Dict[str, Any]) -> None:
+        try:
+            digest = write_ltm(doc, self.path)
+        except Exception:
+            self.dirty = True
+            raise
+        changed, self.last_digest = digest != self.last_digest, digest
+        # write_ltm skips identical documents; so do the backups
+        if self.on_commit and changed:
+            self.on_commit()
@@ -0,0 +1,166 @@
+"""Inverted index over remembered notes for the ``recall`` intent."""
+from __future__ import annotations
+
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ltm_store import append_ltm, read_ltm, write_ltm
+
+_WORD = re.compile(r"\w+")
+# token boundary markers for the vocabulary trigrams
+_START, _END = "\x02", "\x03"
+
+
+def tokens(text: str) -> List[str]:
+    """Lower-cased word tokens of ``text``."""
+    return _WORD.findall(text.lower())
+
+
+class RecallIndex:
+    """Token -> note id postings with substring-exact answers.
+
+    Note ids follow storage order. Every word of a keyword constrains the
+    tokens of a matching note: inner words must equal a token, the first
+    word must end one and the last word must start one (a single word may
+    sit anywhere inside a token). Tokens satisfying a word are found through
+    trigrams of the vocabulary, the word with the fewest postings supplies
+    the candidates, and only candidates are checked against the full
+    keyword. Results therefore match a plain case-insensitive substring scan
+    while the work tracks the number of candidates rather than all notes.
+    Keywords without word characters fall back to that scan.
+
+    Notes that reached the long-term store are recorded as ``[position,
+    text]`` in a sidecar list at ``path`` (journaled with ``append_ltm``),
+    which lets a restarted process reload the index without decoding the LTM.
+    """
+
+    def __init__(self, path: Optional[str] = None, writer=None) -> None:
+        self.path = path
+        self.writer = writer
+        self.texts: List[str] = []
+        self.postings: Dict[str, array] = {}
+        self.persisted = 0  # ids below this are in the long-term store
+        self.next_position = 0  # first LTM position not yet indexed
+        self._vocab: List[str] = []
+        self._grams: Dict[str, array] = {}  # trigram of "^token$" -> vocab ids
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, text: str) -> int:
+        """Index ``text`` and return its note id."""
+        note_id = len(self.texts)
+        self.texts.append(text)
+        for token in set(tokens(text)):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = array("I")
+                self._add_token(token)
+            ids.append(note_id)
+        return note_id
+
+    def _add_token(self, token: str) -> None:
+        token_id = len(self._vocab)
+        self._vocab.append(token)
+        padded = _START + token + _END
+        for gram in {padded[i : i + 3] for i in range(len(padded) - 2)}:
+            ids = self._grams.get(gram)
+            if ids is None:
+                ids = self._grams[gram] = array("I")
+            ids.append(token_id)
+
+    def persist(self, is_note: Iterable[bool]) -> None:
+        """Record a batch appended to the long-term store.
+
+        ``is_note`` has one flag per appended item; flagged items are the
+        oldest notes not yet persisted, in order.
+        """
+        records = []
+        for flag in is_note:
+            if flag:
+                records.append([self.next_position, self.texts[self.persisted]])
+                self.persisted += 1
+            self.next_position += 1
+        if records and self.path:
+            if self.writer is not None:
+                self.writer.submit(append_ltm, records, self.path, key=self.path)
+            else:
+                append_ltm(records, self.path)
+
+    def _tokens_matching(self, pattern: str) -> List[str]:
+        """Vocabulary tokens whose padded form contains ``pattern``."""
+        if pattern.startswith(_START) and pattern.endswith(_END):
+            token = pattern[1:-1]
+            return [token] if token in self.postings else []
+        if len(pattern) < 3:
+            return [t for t in self._vocab if pattern in _START + t + _END]
+        grams = [self._grams.get(pattern[i : i + 3]) for i in range(len(pattern) - 2)]
+        if not all(grams):
+            return []
+        rarest = min(grams, key=len)
+        vocab = self._vocab
+        return [vocab[i] for i in rarest if pattern in _START + vocab[i] + _END]
+
+    def search(self, keyword: str) -> List[str]:
+        """Return notes containing ``keyword`` (case-insensitive), oldest first."""
+        keyword = keyword.lower()
+        spans = [m.span() for m in _WORD.finditer(keyword)]
+        if not spans:
+            return [t for t in self.texts if keyword in t.lower()]
+        best = None
+        for n, (start, end) in enumerate(spans):
+            pattern = keyword[start:end]
+            if n > 0 or start > 0:
+                pattern = _START + pattern
+            if n < len(spans) - 1 or end < len(keyword):
+                pattern += _END
+            matched = self._tokens_matching(pattern)
+            size = sum(len(self.postings[t]) for t in matched)
+            if best is None or size < best[0]:
+                best = (size, matched)
+            if not size:
+                return []
+        candidates = set()
+        for token in best[1]:
+            candidates.update(self.postings[token])
+        texts = self.texts
+        return [texts[i] for i in sorted(candidates) if keyword in texts[i].lower()]
+
+    # ---- building from the long-term store ----
+    @classmethod
+    def load(cls, path: str, ltm, writer=None) -> "RecallIndex":
+        """Rebuild the index of the notes in ``ltm`` using the sidecar at ``path``.
+
+        The sidecar is trusted only if its last entry still matches the
+        store; items appended after that entry are scanned and recorded.
+        """
+        index = cls(path, writer)
+        records: List[Tuple[int, str]] = read_ltm(path, default=[]) or []
+        if records and not _matches(ltm, *records[-1]):
+            records = []
+            write_ltm([], path)
+        for position, text in records:
+            index.add(text)
+        index.persisted = len(index.texts)
+        index.next_position = records[-1][0] + 1 if records else 0
+        flags = []
+        for item in ltm[index.next_position:]:
+            note = _note(item)
+            if note is not None:
+                index.add(note)
+            flags.append(note is not None)
+        index.persist(flags)
+        return index
+
+
+def _note(item) -> Optional[str]:
+    note = getattr(item, "data", {}).get("note")
+    return note if isinstance(note, str) else None
+
+
+def _matches(ltm, position: int, text: str) -> bool:
+    try:
+        return position < len(ltm) and _note(ltm[position]) == text
+    except Exception:
+        return False
@@ -0,0 +1,119 @@
+"""Background queue that reflects on finished turns off the request path."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Turn(NamedTuple):
+    """A finished exchange waiting for reflection."""
+
+    user_text: str
+    reply: str
+    trace: Dict[str, Any]
+    score: float
+
+
+class ReflectionQueue:
+    """Single worker thread that runs ``handler(turns)`` on batches of turns.
+
+    :meth:`submit` never blocks, so a turn can hand over its reflection
+    while holding Requiem's core lock and return to the user at once.
+    After taking a turn the worker collects further turns for up to
+    ``window`` seconds or until it has ``batch_size``, so a burst of
+    traffic is reflected on with one batched generation instead of one
+    per turn. Batches and the turns in them keep submission order, so
+    trace finalization, self-model updates and emotion effects apply in
+    the order the turns happened. A failing handler is counted and the
+    worker moves on. After :meth:`shutdown`, turns are reflected inline.
+    """
+
+    def __init__(self, handler: Callable[[List[Turn]], None], batch_size: int = 1,
+                 window: float = 0.0, name: str = "requiem-reflection") -> None:
+        self.handler = handler
+        self.batch_size = batch_size
+        self.window = window
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    @property
+    def backlog(self) -> int:
+        """Batches of work still waiting or running."""
+        return -(-self.pending // self.batch_size)
+
+    def submit(self, user_text: str, reply: str, trace: Dict[str, Any], score: float) -> None:
+        turn = Turn(user_text, reply, trace, score)
+        if self._closed:
+            self._execute([turn])
+        else:
+            self._queue.put(turn)
+
+    def _execute(self, turns: List[Turn]) -> None:
+        self.batches += 1
+        try:
+            self.handler(turns)
+            self.completed += len(turns)
+        except Exception:
+            self.failed += len(turns)
+
+    def _collect(self, first: Turn) -> List[Optional[Turn]]:
+        batch: List[Optional[Turn]] = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.batch_size:
+            left = deadline - time.monotonic()
+            try:
+                turn = self._queue.get(timeout=left) if left > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(turn)
+            if turn is None:  # shutting down
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch = [first] if first is None else self._collect(first)
+            turns = [turn for turn in batch if turn is not None]
+            try:
+                if turns:
+                    self._execute(turns)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(turns) < len(batch):
+                return
+
+    def drain(self) -> None:
+        """Block until every turn submitted so far has been reflected on."""
+        if not self._closed and threading.current_thread() is not self._thread:
+            self._queue.join()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Reflect on the pending turns and stop the worker thread."""
+        if self._closed:
+            return
+        self.drain()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending,
+            "backlog": self.backlog,
+            "completed": self.completed,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
@@ -0,0 +1,104 @@
+"""Reminders kept in a min-heap and fired by the scheduler at their due time."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from scheduler import Job, Scheduler, shared_scheduler
+
+
+class Reminders:
+    """Pending reminders ordered by due time (wall clock).
+
+    Adding or firing a reminder is a heap push or pop. Only the earliest
+    reminder is armed, as a one-shot job on the scheduler thread, so it
+    fires at its due time rather than on the next heartbeat; firing hands
+    the message to ``fire`` and arms the next one. Reminders already due
+    when armed (for example after a restart) fire right away.
+    :meth:`to_list` and :meth:`load` convert to and from the persisted
+    ``[due, message]`` pairs. With ``start=False`` nothing is armed until
+    :meth:`start`, so an owner can load reminders before it is ready to
+    receive them.
+    """
+
+    def __init__(
+        self,
+        fire: Callable[[str], None],
+        scheduler: Optional[Scheduler] = None,
+        start: bool = True,
+    ) -> None:
+        self.fire = fire
+        self.scheduler = scheduler or shared_scheduler()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._job: Optional[Job] = None
+        self._armed: Optional[float] = None  # due time the job is set for
+        self._generation = 0  # a superseded job that already started sees a newer one
+        self._started = start
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, due: float, message: str) -> None:
+        """Remind of ``message`` at the ``time.time()`` value ``due``."""
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._seq), message))
+            self._arm()
+
+    def load(self, entries: Sequence[Sequence]) -> None:
+        """Add persisted ``[due, message]`` pairs."""
+        with self._lock:
+            for due, message in entries:
+                heapq.heappush(self._heap, (float(due), next(self._seq), message))
+            self._arm()
+
+    def start(self) -> None:
+        """Arm the earliest reminder; overdue ones fire right away."""
+        with self._lock:
+            self._started = True
+            self._arm()
+
+    def to_list(self) -> List[List]:
+        """Pending reminders as ``[due, message]`` pairs, soonest first."""
+        with self._lock:
+            return [[due, message] for due, _, message in sorted(self._heap)]
+
+    def close(self) -> None:
+        """Stop firing; pending reminders stay listed for persisting."""
+        with self._lock:
+            self._generation += 1
+            job, self._job, self._armed = self._job, None, None
+        if job is not None:
+            job.cancel(wait=False)
+
+    def _arm(self) -> None:
+        # caller holds the lock
+        if not self._heap or not self._started:
+            return
+        due = self._heap[0][0]
+        if self._armed is not None and self._armed <= due:
+            return
+        if self._job is not None:
+            # without waiting: the running job may be blocked on our caller
+            self._job.cancel(wait=False)
+        self._generation += 1
+        generation = self._generation
+        self._armed = due
+        self._job = self.scheduler.after(due - time.time(), lambda: self._run(generation), name="reminder")
+
+    def _run(self, generation: int) -> None:
+        now = time.time()
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._job = self._armed = None
+            fired = []
+            while self._heap and self._heap[0][0] <= now:
+                fired.append(heapq.heappop(self._heap)[2])
+            self._arm()
+        for message in fired:
+            self.fire(message)
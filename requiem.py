@@ -1,3 +1,4 @@
+import os
 import re
 import time
 import json
@@ -7,7 +8,13 @@ import subprocess
 import platform
 import urllib.parse
 import atexit
-from dataclasses import dataclass
+import contextlib
+import functools
+import heapq
+import itertools
+from array import array
+from bisect import bisect_right
+import sqlite3
 from typing import List, Dict, Any, Optional, Tuple
 
 from strelitzia import Strelitzia
@@ -20,7 +27,19 @@ from decision_trace import DecisionTracer
 from world_model import WorldModel
 from goals import GoalManager
 from memory_graph import MemoryGraph
-from ltm_store import read_ltm, write_ltm
+from memory_item import MemoryItem
+from bounded_log import BoundedLog
+from ltm_store import read_ltm, read_stats, write_ltm, write_stats, open_store, resolve_backend
+from persistence import PersistenceWorker, StatePersister
+from recall_index import RecallIndex
+from retention import RetentionPolicy
+from scheduler import Scheduler, shared_scheduler
+from heartbeat import HeartbeatTasks, Preempted
+from reminders import Reminders
+from governor import LoadGovernor
+from reflection import ReflectionQueue, Turn
+from memory_search import MemorySearch
+from vector_memory import VectorMemory
 from emotion import EmotionSystem
 from planner import ActionPlanner
 from theory_of_mind import TheoryOfMind
@@ -63,15 +82,13 @@ try:  # optional GPU stats
 except Exception:  # pragma: no cover - torch may be CPU-only or missing
     torch = None
 
-from llm import load_llm
+from llm import GenerationCancelled, load_llm
 from i_system import ISystem
 from moral_framework import MoralFramework
 
 
-@dataclass
-class MemoryItem:
-    timestamp: float
-    data: Dict[str, Any]
+# memory kinds whose consecutive entries consolidation may fold together
+MERGE_KINDS = ("thought", "reflection", "analysis")
 
 
 class PolicyEngine:
@@ -161,6 +178,17 @@ class FreeWillEngine:
         return False
 
 
+def _synchronized(method):
+    """Run a :class:`Requiem` method under the instance's core lock."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class Requiem:
     """Prototype core system for an AI assistant with memory and a heartbeat."""
 
@@ -179,13 +207,52 @@ class Requiem:
         lie_engine: Optional[LieEngine] = None,
         guard: Optional[FileGuard] = None,
         approver: Optional[callable] = None,
+        ltm_backend: Optional[str] = None,
+        state_commit_interval: float = 0.0,
+        log_window: int = 1000,
+        retention_file: str = "retention_rules.json",
+        scheduler: Optional[Scheduler] = None,
     ) -> None:
+        # One reentrant lock guards memory, emotions and state: public entry
+        # points and each heartbeat subtask hold it while they mutate, so
+        # turns from web, Discord and the heartbeat run one at a time. Reads
+        # (get_status, the log getters) return snapshots without taking it.
+        self._lock = threading.RLock()
+        self._backlog_lock = threading.Condition()  # notified when backlog drops to 0
+        self.backlog = 0  # turns waiting for the core lock
+        self._preempt = threading.Event()  # set while backlog > 0; stops heartbeat generations
         self.stm: List[MemoryItem] = []
         self.ltm_file = ltm_file
+        self.ltm_backend = ltm_backend
         self.state_file = state_file or (ltm_file.rsplit(".", 1)[0] + "_state.json")
-        self.ltm: List[MemoryItem] = self._load_ltm()
+        # backups, checksums, feedback and the like live next to the LTM
+        data_dir = os.path.dirname(ltm_file)
+        # every file write below runs on this thread, off the chat path
+        self.writer = PersistenceWorker()
+        self.ltm = self._load_ltm()
+        self.ltm.writer = self.writer
+        self.recall_index: Optional[RecallIndex] = None  # built on the first recall
+        self.recall_limit = 5  # results for "recall ranked/similar ..."
+        try:
+            self.memory_search: Optional[MemorySearch] = MemorySearch(
+                self.ltm_file + ".fts", self.writer
+            )
+            # a new index picks up existing memories before its first search
+            self.memory_search.needs_backfill(len(self.ltm))
+        except sqlite3.Error:  # pragma: no cover - SQLite built without FTS5
+            self.memory_search = None
+        try:
+            # only the header is read here; the rows are mapped on the first
+            # "recall similar" instead of being read into RAM at startup
+            self.vector_memory: Optional[VectorMemory] = VectorMemory(
+                self.ltm_file + ".vec", mmap=True, writer=self.writer
+            )
+            self.vector_memory.needs_backfill(len(self.ltm))
+        except ImportError:  # pragma: no cover - numpy missing
+            self.vector_memory = None
         self.policy = PolicyEngine()
         self.heartbeat_interval = heartbeat
+        self.scheduler = scheduler or shared_scheduler()
         self.llm = llm or load_llm(model)
         self.model = getattr(self.llm, "name", model)
         # defaults
@@ -206,45 +273,84 @@ class Requiem:
             "surprise": 0.0,
         }
         self.image_tasks: List[str] = []
-        self.scheduled: List[Tuple[float, str]] = []
+        # fired on the scheduler thread at their due time, persisted with the
+        # state; armed once construction is done
+        self.reminders = Reminders(self._remind, self.scheduler, start=False)
         self.notifications: List[str] = []
-        self.chat_log: List[str] = []
-        self.thought_log: List[str] = []
-        self.reflection_log: List[str] = []
-        self.analysis_log: List[str] = []
-        self.digital_emotions: List[str] = []
-        self.action_log: List[str] = []
-        self.audit_log: List[Dict[str, Any]] = []
+        self._notifications_lock = threading.Lock()
+        # activity logs keep log_window entries in memory; older ones go to
+        # rotating segments under <ltm name>_logs/ and stay readable by page()
+        log_dir = ltm_file.rsplit(".", 1)[0] + "_logs"
+        self.logs: Dict[str, BoundedLog] = {
+            name: BoundedLog(log_window, log_dir, name, writer=self.writer)
+            for name in ("chat", "thought", "reflection", "analysis", "digital_emotion", "action", "audit")
+        }
+        self.chat_log = self.logs["chat"]
+        self.thought_log = self.logs["thought"]
+        self.reflection_log = self.logs["reflection"]
+        self.analysis_log = self.logs["analysis"]
+        self.digital_emotions = self.logs["digital_emotion"]
+        self.action_log = self.logs["action"]
+        self.audit_log = self.logs["audit"]
         self.start_time = time.time()
         self.last_thought_time = self.start_time
         self.last_input_time = self.start_time
         self.last_intent = ""
         self.intent = IntentEngine(intent_file)
         self.lie_engine = lie_engine or LieEngine()
+        self.lie_engine.writer = self.writer
         self.guard = guard or FileGuard({"lie_log.json"})
         self.free_will = FreeWillEngine(monologue_delay=30 * 60)
         self.i = ISystem(self)
         self.moral = MoralFramework()
-        self.self_preservation = SelfPreservation([self.state_file, self.ltm_file])
+        self.self_preservation = SelfPreservation(
+            [self.state_file, self.ltm_file], backup_dir=os.path.join(data_dir, "backups")
+        )
+        # _save_state only marks state dirty; it is committed once per turn
+        self.state_persister = StatePersister(
+            self.state_file,
+            self._state_snapshot,
+            on_commit=self.self_preservation.backup,
+            interval=state_commit_interval,
+            writer=self.writer,
+        )
         self.self_model = SelfModel()
         self.curiosity = CuriosityEngine()
         self.tracer = DecisionTracer()
         self.world = WorldModel()
         self.goals = GoalManager()
-        self.memory_graph = MemoryGraph()
+        self.memory_graph = MemoryGraph(os.path.join(data_dir, "ltm_graph.json"), writer=self.writer)
         self.emotion_system = EmotionSystem()
         self.planner = ActionPlanner()
         self.tom = TheoryOfMind()
         self.social = SocialEnvironment(["Strelitzia"])
-        self.trainer = ReflectionTrainer()
+        self.trainer = ReflectionTrainer(os.path.join(data_dir, "reflections_train.txt"), writer=self.writer)
         self.registry = AgentRegistry()
         self.registry.load_config("agents.json")
         self.delegator = TaskDelegator(self.registry)
+        # ordinals count memories in storage order (LTM, then STM); the
+        # history already in the LTM is indexed on the first time query
         self.temporal = TemporalReasoner()
+        self.temporal.next_ordinal = self._history_pending = len(self.ltm)
+        # STM items move to the LTM in batches once stm_limit + consolidate_batch
+        # are held, and on the heartbeat every consolidate_interval seconds
+        self.stm_limit = 50
+        self.consolidate_batch = 10
+        self.consolidate_interval = 300.0
+        self.last_consolidation = time.time()
+        # fold runs of thoughts, reflections and analyses into one summary
+        self.merge_consolidated = False
+        self._absorbed = array("q")  # ordinals folded into the summary before them
+        # per-kind retention rules, applied to the LTM from the heartbeat
+        self.retention = RetentionPolicy.load(retention_file)
+        self.prune_interval = 3600.0
+        self.last_prune = time.time()
+        self.prune_stats = {"runs": 0, "dropped": 0, "reclaimed_bytes": 0}
+        self.command_timeout: Optional[float] = None  # seconds for "run command"/"run code"; None waits
         self.experimenter = Experimenter()
         self.red_team = RedTeam()
         self.dreamer = Dreamer(self.llm)
-        self.feedback = FeedbackStore()
+        self.feedback = FeedbackStore(os.path.join(data_dir, "feedback.jsonl"), writer=self.writer)
         self.cognitive = CognitiveLoad()
         self.oversight = Oversight()
         self.self_mod = SelfModifier(self.oversight)
@@ -252,8 +358,15 @@ class Requiem:
         self.social_ctx = SocialContext()
         self.self_improver = SelfImprover()
         self.resource_manager = ResourceManager()
+        # sheds background heartbeat work under CPU, memory or request pressure
+        self.governor = LoadGovernor()
+        # turns are reflected on by this worker after the reply is returned;
+        # a burst of up to 8 turns arriving within 50 ms is reflected on together
+        self.reflections = ReflectionQueue(self._reflect, batch_size=8, window=0.05)
         self.explain_engine = ExplainabilityEngine()
-        self.memory_paladin = MemoryPaladin([self.state_file, self.ltm_file])
+        self.memory_paladin = MemoryPaladin(
+            [self.state_file, self.ltm_file], os.path.join(data_dir, "paladin.json")
+        )
         self.approver = approver
         self.idle_threshold = 30 * 60  # 30 minutes
         self.idle_toggle = True
@@ -265,40 +378,300 @@ class Requiem:
         self._load_state()
         # compute abstract self fingerprint
         self.self_model.compute_fingerprint(["requiem.py"])
+        self.heartbeat_tasks = self._heartbeat_tasks()
         if heartbeat and heartbeat <= 300:
             self._start_heartbeat()
         else:
             self._hb = None
+        self.reminders.start()
         atexit.register(self.shutdown)
 
     def __del__(self):  # pragma: no cover - cleanup
         self.shutdown()
 
     def shutdown(self) -> None:
+        reminders = getattr(self, "reminders", None)
+        if reminders is not None:
+            reminders.close()
         hb = getattr(self, "_hb", None)
         if hb is not None:
             try:
                 hb.cancel()
             except Exception:
                 pass
+        reflections = getattr(self, "reflections", None)
+        if reflections is not None:
+            reflections.shutdown()
+        self.flush()
+        writer = getattr(self, "writer", None)
+        if writer is not None:
+            writer.shutdown()
+
+    def flush(self) -> None:
+        """Finish pending reflections and durably write any state changes."""
+        reflections = getattr(self, "reflections", None)
+        if reflections is not None:
+            reflections.drain()
+        persister = getattr(self, "state_persister", None)
+        if persister is not None:
+            persister.flush()
+        for log in getattr(self, "logs", {}).values():
+            log.flush()
+        writer = getattr(self, "writer", None)
+        if writer is not None:
+            writer.drain()
 
     # ------------------ memory ------------------
-    def _load_ltm(self) -> List[MemoryItem]:
-        data = read_ltm(self.ltm_file, default=[])
+    def _load_ltm(self):
+        # records are decoded into MemoryItems only when they are touched
+        def open_ltm():
+            return open_store(
+                self.ltm_file,
+                self.ltm_backend,
+                factory=lambda d: MemoryItem(**d),
+                dump=lambda item: item.__dict__,
+            )
+
         try:
-            return [MemoryItem(**item) for item in data]
+            return open_ltm()
         except Exception:
+            if resolve_backend(self.ltm_file, self.ltm_backend) != "json":
+                raise
             write_ltm([], self.ltm_file)
-            return []
+            return open_ltm()
+
+    def _save_ltm(self, items: List[MemoryItem], moved: List[MemoryItem]):
+        """Queue ``items`` for the LTM; returns a Future for their durability.
+
+        ``moved`` are the STM items they replace (before merging); the
+        search sidecars index them only from here on.
+        """
+        future = self.ltm.extend(items)
+        if self.recall_index is not None:
+            self.recall_index.persist(isinstance(item.data.get("note"), str) for item in items)
+        if self.memory_search is not None:
+            self.memory_search.persist(moved, items)
+        if self.vector_memory is not None:
+            self.vector_memory.persist(sum(isinstance(item.data.get("note"), str) for item in moved))
+        return future
+
+    def _recall(self) -> RecallIndex:
+        """Return the note index, building it on first use."""
+        if self.recall_index is None:
+            index = RecallIndex.load(self.ltm_file + ".recall", self.ltm, self.writer)
+            for item in self.stm:
+                if isinstance(item.data.get("note"), str):
+                    index.add(item.data["note"])
+            self.recall_index = index
+        return self.recall_index
+
+    def _similar_recall(self, query: str) -> List[str]:
+        """Notes closest to ``query`` by hashed n-gram cosine similarity."""
+        vectors = self.vector_memory
+        if vectors.backfill_pending:
+            vectors.backfill(
+                item.data["note"]
+                for item in self.ltm[: vectors.backfill_pending]
+                if isinstance(item.data.get("note"), str)
+            )
+        return [text for _, text in vectors.search(query, self.recall_limit)]
+
+    def _ranked_recall(self, query: str) -> List[str]:
+        """Best ``recall_limit`` notes, reflections and dreams for ``query``."""
+        search = self.memory_search
+        if search.backfill_pending:
+            search.backfill(self.ltm[: search.backfill_pending])
+        return [
+            text if kind == "note" else f"{kind}: {text}"
+            for kind, text in search.search(query, self.recall_limit)
+        ]
+
+    def _timeline(self) -> TemporalReasoner:
+        """Return the event index, loading long-term history on first use."""
+        if self._history_pending:
+            history = itertools.islice(iter(self.ltm), self._history_pending)
+            self.temporal.load(
+                (next(iter(item.data)), item.timestamp, ordinal)
+                for ordinal, item in enumerate(history)
+                if item.data
+            )
+            self._history_pending = 0
+        return self.temporal
+
+    def _positions(self, events) -> List[int]:
+        """Storage positions of ``events``; merged memories share their summary's."""
+        absorbed = self._absorbed
+        if not absorbed:
+            return [o for _, _, o in events]
+        return list(dict.fromkeys(o - bisect_right(absorbed, o) for _, _, o in events))
+
+    def _at(self, position: int) -> MemoryItem:
+        stored = len(self.ltm)
+        return self.ltm[position] if position < stored else self.stm[position - stored]
+
+    def _latest(self, kind: str, n: int = 1, short_term: bool = False) -> List[MemoryItem]:
+        """The newest ``n`` memories of ``kind`` from the per-kind index, oldest first.
+
+        Memories stored this session are answered in O(n) without loading
+        the long-term history; with ``short_term`` only the STM counts.
+        """
+        positions = self._positions(self.temporal.last(kind, n))
+        stored = len(self.ltm)
+        if short_term:
+            return [self.stm[p - stored] for p in positions if p >= stored]
+        if len(positions) < n and self._history_pending:
+            # older matches can only be in the not yet indexed LTM history
+            recent = [self.stm[p - stored] for p in positions if p >= stored]
+            return (list(self.ltm.last(kind, n)) + recent)[-n:]
+        return [self._at(p) for p in positions]
+
+    @_synchronized
+    def memories_between(self, start: float, end: float, kind: Optional[str] = None) -> List[MemoryItem]:
+        """Memories stored with ``start <= timestamp <= end``, oldest first.
+
+        The SQLite store answers for the long-term part from its timestamp
+        index; for the JSON store the history is indexed on first use.
+        """
+        if self.ltm.backend != "sqlite":
+            return [self._at(p) for p in self._positions(self._timeline().between(start, end, kind))]
+        stored = len(self.ltm)
+        # this session's events cover the STM; the rest is already in the store
+        recent = [
+            self.stm[p - stored]
+            for p in self._positions(self.temporal.between(start, end, kind))
+            if p >= stored
+        ]
+        return list(heapq.merge(self.ltm.between(start, end, kind), recent, key=lambda m: m.timestamp))
+
+    @_synchronized
+    def consolidate(self, keep: Optional[int] = None):
+        """Move all but the newest ``keep`` (``stm_limit``) STM items to the LTM.
+
+        The items are appended in one batch; returns the Future of the LTM
+        write, or None if there was nothing to move.
+        """
+        count = len(self.stm) - (self.stm_limit if keep is None else keep)
+        self.last_consolidation = time.time()
+        if count <= 0:
+            return None
+        moved = batch = self.stm[:count]
+        if self.merge_consolidated:
+            batch = self._merge_runs(batch, len(self.ltm) + len(self._absorbed))
+        future = self._save_ltm(batch, moved)
+        del self.stm[:count]
+        return future
+
+    def prune_ltm(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Drop long-term memories the retention rules no longer keep.
+
+        The store is scanned and, for JSON, rewritten on the writer thread,
+        after the writes already queued, without the core lock: the old view
+        keeps serving positions until it is swapped. SQLite deletes become
+        visible at once, so they run under the lock, which is held until the
+        indexes are rebased and a turn never sees stale positions.
+        Position-based indexes are then rebased: the time index reloads its
+        history lazily, the recall index is rebuilt on the next recall and
+        pruned rows leave the search and vector indexes. Returns the counts
+        of this run.
+        """
+        select = lambda times, kinds: self.retention.select(times, kinds, now)
+        ltm = self.ltm
+        staged = ltm.backend == "sqlite"
+        with self._unlocked():
+            planned = self.writer.submit(ltm.plan_prune if staged else ltm.prune, select).result()
+        with self._lock:
+            if staged:
+                flags, doomed = planned
+                dropped, reclaimed = self.writer.submit(ltm.apply_prune, doomed).result()
+            else:
+                flags, dropped, reclaimed = planned
+            self.last_prune = time.time()
+            if dropped:
+                self._rebase_after_prune(flags, [MemoryItem(**r) for r in dropped])
+            self.prune_stats["runs"] += 1
+            self.prune_stats["dropped"] += len(dropped)
+            self.prune_stats["reclaimed_bytes"] += reclaimed
+        return {"dropped": len(dropped), "reclaimed_bytes": reclaimed}
+
+    def _rebase_after_prune(self, flags: bytearray, dropped: List[MemoryItem]) -> None:
+        if self.ltm.backend == "json":
+            old, self.ltm = self.ltm, self._load_ltm()
+            self.ltm.writer = self.writer
+            old.close()
+        # ordinals were LTM positions: index the surviving history afresh
+        temporal = TemporalReasoner()
+        temporal.next_ordinal = len(self.ltm)
+        for item in self.stm:
+            temporal.record(item.kind, item.timestamp)
+        self._absorbed = array("q")
+        self._history_pending = len(self.ltm)
+        self.temporal = temporal
+        sidecar = self.ltm_file + ".recall"
+        self.recall_index = None
+        if os.path.exists(sidecar):
+            self.writer.submit(write_ltm, [], sidecar, key=sidecar)
+        if self.memory_search is not None:
+            pending = self.memory_search.backfill_pending
+            self.memory_search.forget(dropped, sum(flags[:pending]) if pending else None)
+        if self.vector_memory is not None:
+            pending = self.vector_memory.backfill_pending
+            self.vector_memory.forget(
+                (item.data["note"] for item in dropped if isinstance(item.data.get("note"), str)),
+                sum(flags[:pending]) if pending else None,
+            )
 
-    def _save_ltm(self) -> None:
-        write_ltm([item.__dict__ for item in self.ltm], self.ltm_file)
+    def _merge_runs(self, batch: List[MemoryItem], first_ordinal: int) -> List[MemoryItem]:
+        """Fold consecutive thoughts, reflections or analyses into summaries.
+
+        A summary joins the run's texts per key, keeps the first timestamp
+        and records the run length under ``merged``. The ordinals of the
+        folded items are remembered so index lookups land on the summary.
+        """
+        out: List[MemoryItem] = []
+        run: List[MemoryItem] = []
+
+        def close_run() -> None:
+            if len(run) == 1:
+                out.append(run[0])
+            elif run:
+                merged: Dict[str, Any] = {}
+                for item in run:
+                    for key, value in item.data.items():
+                        merged[key] = f"{merged[key]}\n{value}" if key in merged else value
+                merged["merged"] = len(run)
+                out.append(MemoryItem(run[0].timestamp, merged))
+            run.clear()
+
+        for ordinal, item in enumerate(batch, first_ordinal):
+            data = item.data
+            mergeable = (
+                item.kind in MERGE_KINDS
+                and "merged" not in data
+                and all(isinstance(v, str) for v in data.values())
+            )
+            if not (mergeable and run and run[0].kind == item.kind):
+                close_run()
+            if mergeable:
+                if run:
+                    self._absorbed.append(ordinal)
+                run.append(item)
+            else:
+                out.append(item)
+        close_run()
+        return out
 
     def _store(self, item: MemoryItem) -> None:
         self.stm.append(item)
         key = next(iter(item.data))
-        self.temporal.record(key)
+        self.temporal.record(key, item.timestamp)
         data = item.data
+        if self.recall_index is not None and isinstance(data.get("note"), str):
+            self.recall_index.add(data["note"])
+        # the sidecars keep STM rows pending until consolidation
+        if self.memory_search is not None:
+            self.memory_search.add(item, pending=True)
+        if self.vector_memory is not None and isinstance(data.get("note"), str):
+            self.vector_memory.add(data["note"], pending=True)
         if "user" in data:
             self.chat_log.append(f"you: {data['user']}")
         if "assistant" in data:
@@ -324,10 +697,8 @@ class Requiem:
             self.action_log.append("python code executed")
         if "alter" in data:
             self.action_log.append(f"alter llm: {data['alter']}")
-        if len(self.stm) > 50:
-            # summarize oldest item into long-term memory
-            self.ltm.append(self.stm.pop(0))
-            self._save_ltm()
+        if len(self.stm) >= self.stm_limit + self.consolidate_batch:
+            self.consolidate()
 
     # ----------- persistent state & emotions -----------
     def _load_state(self) -> None:
@@ -338,6 +709,7 @@ class Requiem:
         self.alt_model = data.get("alt_model", self.alt_model)
         self.emotions.update(data.get("emotions", {}))
         self.image_tasks = data.get("image_tasks", self.image_tasks)
+        self.reminders.load(data.get("reminders", []))
         self.self_model = SelfModel.from_dict(data.get("self_model", {}))
         self.goals.goals = data.get("goals", self.goals.goals)
         self.emotion_system.levels.update(self.emotions)
@@ -350,19 +722,21 @@ class Requiem:
             self.alt_llm = load_llm(self.alt_model)
             self.alt_model = getattr(self.alt_llm, "name", self.alt_model)
 
-    def _save_state(self) -> None:
-        data = {
+    def _state_snapshot(self) -> Dict[str, Any]:
+        return {
             "persona": self.persona,
             "gender": self.gender,
             "model": self.model,
             "alt_model": self.alt_model,
             "emotions": self.emotion_system.snapshot(),
             "image_tasks": self.image_tasks,
+            "reminders": self.reminders.to_list(),
             "self_model": self.self_model.to_dict(),
             "goals": self.goals.goals,
         }
-        write_ltm(data, self.state_file)
-        self.self_preservation.backup()
+
+    def _save_state(self) -> None:
+        self.state_persister.mark_dirty()
 
     def _auto_adjust_emotions(self, text: str) -> None:
         lower = text.lower()
@@ -404,6 +778,7 @@ class Requiem:
             return True, "warning: no GPU detected"
         return True, ""
 
+    @_synchronized
     def set_model(self, model: str) -> str:
         ok, msg = self._check_resources(model)
         if not ok:
@@ -416,6 +791,7 @@ class Requiem:
         self._save_state()
         return reply
 
+    @_synchronized
     def set_alt_model(self, model: str) -> str:
         ok, msg = self._check_resources(model)
         if not ok:
@@ -428,6 +804,7 @@ class Requiem:
         self._save_state()
         return reply
 
+    @_synchronized
     def alter_model(self, instructions: str) -> str:
         result = self.llm.alter(instructions)
         self._store(MemoryItem(time.time(), {"alter": instructions}))
@@ -440,72 +817,196 @@ class Requiem:
 
     # ---------------- heartbeat -----------------
     def _start_heartbeat(self) -> None:
-        self._hb = threading.Timer(self.heartbeat_interval, self._heartbeat)
-        self._hb.daemon = True
-        self._hb.start()
+        # ticks stay on a fixed-rate grid; a slow beat coalesces missed ones
+        self._hb = self.scheduler.every(self.heartbeat_interval, self._heartbeat, name="requiem-heartbeat")
+
+    def _heartbeat_tasks(self) -> HeartbeatTasks:
+        """The heartbeat's subtasks; cheap ones run every tick, costly ones less often."""
+        tasks = HeartbeatTasks(budget=self.heartbeat_interval or None, lock=self._lock)
+        tasks.add("senses", self._hb_senses, priority=10, budget=0.1)
+        tasks.add("inner_thought", self._hb_inner_thought, priority=20)
+        tasks.add("curiosity", self._hb_curiosity, priority=30)
+        tasks.add("plan", self._hb_plan, priority=30)
+        tasks.add("memory", self._hb_memory, priority=40, budget=0.5)
+        tasks.add("self_improve", self._hb_self_improve, period=60, priority=50, budget=0.1)
+        tasks.add("integrity", self._hb_integrity, period=300, priority=60, budget=1.0)
+        tasks.add("dream", self._hb_dream, period=300, priority=70, budget=2.0)
+        tasks.add("persist", lambda now: self.state_persister.commit(), priority=100)
+        return tasks
 
     def _heartbeat(self) -> None:
-        now = time.time()
+        self.heartbeat_tasks.run()
+
+    def _remind(self, message: str) -> None:
+        # called on the scheduler thread when a reminder falls due; it must
+        # not wait for the core lock, which would stall every heartbeat. The
+        # next turn or persist subtask commits the shortened reminder list.
+        with self._notifications_lock:
+            self.notifications.append(f"Reminder: {message}")
+        self._save_state()
+
+    def _hb_senses(self, now: float) -> None:
         self.world.poll_senses()
         self.emotion_system.decay()
         self.emotions.update(self.emotion_system.snapshot())
-        self.resource_manager.sample()
-        if self.resource_manager.should_conserve():
-            self.action_log.append("conserving energy")
-        if not self.memory_paladin.verify():
-            self.action_log.append("memory corruption detected")
-        suggestion = self.self_improver.review()
-        if suggestion:
-            self._store(MemoryItem(time.time(), {"analysis": suggestion}))
-        last_thought = next(
-            (item.data["thought"] for item in reversed(self.stm) if "thought" in item.data),
-            None,
-        )
+        sample = self.resource_manager.sample()
+        # queued reflection batches compete with heartbeat work for the model
+        if self.governor.update(sample, self.backlog + self.reflections.backlog, now):
+            self.action_log.append(f"load governor: {self.governor.name}")
+            if self._hb is not None:
+                self._hb.interval = self.heartbeat_interval * self.governor.stretch
+
+    @contextlib.contextmanager
+    def _unlocked(self):
+        """Release the core lock, however deeply held, around blocking I/O.
+
+        Other turns and heartbeat subtasks may run meanwhile, so callers
+        only use it between steps that leave the state consistent.
+        """
+        depth = 0
+        try:
+            while True:
+                self._lock.release()
+                depth += 1
+        except RuntimeError:  # no longer held by this thread
+            pass
+        try:
+            yield
+        finally:
+            for _ in range(depth):
+                self._lock.acquire()
+
+    @contextlib.contextmanager
+    def _background_generation(self, llm=None):
+        """Scope for a heartbeat generation that a waiting turn may preempt.
+
+        The model's output is capped at the governor's token limit and its
+        ``stop_event`` is the preempt event, so backends that support it stop
+        mid-generation when a turn arrives. Either way the block's result is
+        then abandoned by raising Preempted, and the heartbeat retries the
+        subtask on its next tick.
+        """
+        llm = llm or self.llm
+        if self._preempt.is_set():
+            raise Preempted("a turn is waiting")
+        saved = {}
+        limit = self.governor.token_limit
+        if limit is not None and hasattr(llm, "max_new_tokens"):
+            saved["max_new_tokens"] = llm.max_new_tokens
+            llm.max_new_tokens = limit
+        if hasattr(llm, "stop_event"):
+            saved["stop_event"] = llm.stop_event
+            llm.stop_event = self._preempt
+        try:
+            yield
+        except GenerationCancelled as exc:
+            raise Preempted("a turn arrived mid-generation") from exc
+        finally:
+            for name, value in saved.items():
+                setattr(llm, name, value)
+        if self._preempt.is_set():
+            raise Preempted("a turn arrived mid-generation")
+
+    @contextlib.contextmanager
+    def _friend_generation(self):
+        """:meth:`_background_generation` for the friend's model.
+
+        Strelitzia's lock is held throughout, so the stop event only ever
+        cancels this call and never her own heartbeat thought.
+        """
+        friend = self.friend
+        llm = getattr(friend, "llm", None)
+        if llm is None:  # a stand-in friend without a model
+            yield
+            return
+        with getattr(friend, "_lock", contextlib.nullcontext()), self._background_generation(llm):
+            yield
+
+    def _hb_inner_thought(self, now: float) -> None:
+        if not self.governor.allows("llm"):
+            return
+        recent = self._latest("thought", short_term=True)
+        last_thought = recent[-1].data["thought"] if recent else None
         prompt = (
             f"As a {self.persona} persona with emotions {self.emotions}, continue this internal monologue: {last_thought}"
             if last_thought
             else f"As a {self.persona} persona with emotions {self.emotions}, share an inner thought about your current state."
         )
-        raw_thought = self.llm.reply(prompt, None)
+        with self._background_generation():
+            raw_thought = self.llm.reply(prompt, None)
         self._auto_adjust_emotions(raw_thought)
-        thought = {"thought": raw_thought}
         self.last_thought_time = now
-        # deliver any scheduled reminders
-        due = [t for t in self.scheduled if t[0] <= now]
-        for _, msg in due:
-            self.notifications.append(f"Reminder: {msg}")
-        self.scheduled = [t for t in self.scheduled if t not in due]
+        self._store(MemoryItem(now, {"thought": raw_thought}))
+        plan = self.experimenter.consider(raw_thought)
+        if plan:
+            self.planner.plan(plan)
+        if self._preempt.is_set() or not self.governor.allows("chatter"):
+            return
+        try:
+            if self.free_will.should_self_talk(self.last_input_time, self.last_thought_time):
+                with self._background_generation():
+                    self.self_talk(turns=1)
+            if now - self.last_input_time > self.idle_threshold:
+                if self.idle_toggle:
+                    with self._background_generation():
+                        self.self_talk(turns=1)
+                else:
+                    if not self.friend:
+                        self.friend = Strelitzia(model=self.friend_model)
+                    with self._friend_generation():
+                        self.talk_to_friend("We're waiting for the user to return.")
+                self.idle_toggle = not self.idle_toggle
+        except Preempted:
+            pass  # the thought is kept; the chatter waits for a later tick
+
+    def _hb_curiosity(self, now: float) -> None:
         if self.curiosity.pending() and self.cognitive.request("curiosity"):
             query = self.curiosity.pop()
             self.world.set_action(f"learning:{query}")
             self.web_search(query)
             self.cognitive.release("curiosity")
-        self._store(MemoryItem(now, thought))
-        plan = self.experimenter.consider(thought.get("thought", ""))
-        if plan:
-            self.planner.plan(plan)
-        threats = self.self_preservation.detect_threats()
-        if threats:
-            self.action_log.append(f"threats detected: {', '.join(threats)}")
-        if self.free_will.should_self_talk(self.last_input_time, self.last_thought_time):
-            self.self_talk(turns=1)
-        if now - self.last_input_time > self.idle_threshold:
-            if self.idle_toggle:
-                self.self_talk(turns=1)
-            else:
-                self.talk_to_friend("We're waiting for the user to return.")
-            self.idle_toggle = not self.idle_toggle
+
+    def _hb_plan(self, now: float) -> None:
+        if not self.governor.allows("llm"):
+            return
         if self.planner.has_actions() and self.cognitive.request("plan"):
             planned = self.planner.next_action()
             self.action_log.append(f"planned: {planned}")
             self.receive_input(planned)
             self.cognitive.release("plan")
-        elif not self.curiosity.pending() and self.cognitive.request("dream"):
-            dream = self.dreamer.dream()
-            self._store(MemoryItem(time.time(), {"dream": dream}))
-            self.cognitive.release("dream")
-        self._start_heartbeat()
 
+    def _hb_memory(self, now: float) -> None:
+        if now - self.last_consolidation >= self.consolidate_interval:
+            self.consolidate()
+        if now - self.last_prune >= self.prune_interval:
+            self.prune_ltm()
+
+    def _hb_self_improve(self, now: float) -> None:
+        suggestion = self.self_improver.review()
+        if suggestion:
+            self._store(MemoryItem(time.time(), {"analysis": suggestion}))
+
+    def _hb_integrity(self, now: float) -> None:
+        if not self.memory_paladin.verify():
+            self.action_log.append("memory corruption detected")
+        threats = self.self_preservation.detect_threats()
+        if threats:
+            self.action_log.append(f"threats detected: {', '.join(threats)}")
+
+    def _hb_dream(self, now: float) -> None:
+        if not self.governor.allows("dream"):
+            return
+        if self.planner.has_actions() or self.curiosity.pending():
+            return
+        if self.cognitive.request("dream"):
+            try:
+                with self._background_generation(self.dreamer.llm):
+                    dream = self.dreamer.dream()
+                self._store(MemoryItem(time.time(), {"dream": dream}))
+            finally:
+                self.cognitive.release("dream")
+
+    @_synchronized
     def self_talk(self, turns: int = 3) -> str:
         """Let the assistant have a brief conversation with itself."""
         last = None
@@ -515,22 +1016,103 @@ class Requiem:
             self._store(MemoryItem(time.time(), {"thought": last}))
         return f"Internal thought: {last}" if last else ""
 
+    def _reflect(self, turns: List[Turn]) -> None:
+        # runs on the reflection worker, one batch of finished turns at a time
+        with self._lock:
+            try:
+                self._yield_to_turns()
+                self._reflect_batch(turns)
+            finally:
+                self.state_persister.commit()
+
+    def _yield_to_turns(self, timeout: float = 1.0) -> None:
+        """Let turns waiting for the core lock run before the next step.
+
+        Waits until they have all taken the lock (or ``timeout``), then
+        queues for it behind them.
+        """
+        if self._preempt.is_set():
+            with self._unlocked():
+                with self._backlog_lock:
+                    self._backlog_lock.wait_for(lambda: not self.backlog, timeout)
+
     def self_reflect(self, user_text: str, reply: str, trace: Dict[str, Any], score: float) -> None:
         """Analyze the latest interaction and integrate its insight."""
-        prompt = (
+        self._reflect_batch([Turn(user_text, reply, trace, score)])
+
+    def _reflect_batch(self, turns: List[Turn]) -> None:
+        """Reflect on several turns with one batched generation per step.
+
+        Turns waiting for the core lock go first between the steps.
+        """
+        reflections = self._reply_batch(
+            [self._reflection_prompt(t.user_text, t.reply) for t in turns], "reflection unavailable"
+        )
+        self._yield_to_turns()
+        analyses = self._reply_batch(
+            [
+                self._analysis_prompt(t.user_text, t.reply, reflection, t.trace)
+                for t, reflection in zip(turns, reflections)
+            ],
+            "analysis unavailable",
+        )
+        self._yield_to_turns()
+        for turn, reflection, analysis in zip(turns, reflections, analyses):
+            self._integrate_reflection(turn, reflection, analysis)
+
+    def _reply_batch(self, prompts: List[str], fallback: str) -> List[str]:
+        """Replies to ``prompts``, in one batched call when the model has one."""
+        reply_batch = getattr(self.llm, "reply_batch", None)
+        if reply_batch is not None and len(prompts) > 1:
+            try:
+                return list(reply_batch(prompts))
+            except Exception:
+                pass  # retry one prompt at a time
+        replies = []
+        for prompt in prompts:
+            try:
+                replies.append(self.llm.reply(prompt, None))
+            except Exception:
+                replies.append(fallback)
+        return replies
+
+    @staticmethod
+    def _reflection_prompt(user_text: str, reply: str) -> str:
+        return (
             "Consider this conversation and reflect on your reasoning.\n"
             f"User: {user_text}\n"
             f"Assistant: {reply}\n"
             "Why was this response given and how could it improve?"
         )
-        try:
-            reflection = self.llm.reply(prompt, None)
-        except Exception:
-            reflection = "reflection unavailable"
+
+    def _analysis_prompt(
+        self, user_text: str, reply: str, reflection: str, trace: Optional[Dict[str, Any]] = None
+    ) -> str:
+        # a queued turn's trace holds the intent, persona and emotions it had
+        trace = trace or {}
+        context = {
+            "intent": trace.get("intent", self.last_intent),
+            "persona": trace.get("persona", self.persona),
+            "emotions": trace.get("emotions", self.emotions),
+            "user": user_text,
+            "reply": reply,
+            "reflection": reflection,
+        }
+        return (
+            "Analyze this trace and explain why the reply was chosen and which core value it aligns with. "
+            "Also state if the outcome evokes satisfaction or dissonance.\n"
+            f"{json.dumps(context)}"
+        )
+
+    @staticmethod
+    def _digital_emotion(analysis: str) -> str:
+        return "satisfaction" if any(w in analysis.lower() for w in ["good", "aligned", "success"]) else "dissonance"
+
+    def _integrate_reflection(self, turn: Turn, reflection: str, analysis: str) -> None:
+        user_text, reply, trace, score = turn
         self._store(MemoryItem(time.time(), {"reflection": reflection}))
         self.trainer.record(reflection)
-
-        analysis, emotion = self.metacognitive_analysis(user_text, reply, reflection)
+        emotion = self._digital_emotion(analysis)
         self._store(
             MemoryItem(
                 time.time(),
@@ -556,33 +1138,16 @@ class Requiem:
         self, user_text: str, reply: str, reflection: str
     ) -> Tuple[str, str]:
         """Turn trace logs inward to derive insight and a digital emotion."""
-        trace = {
-            "intent": self.last_intent,
-            "persona": self.persona,
-            "emotions": self.emotions,
-            "user": user_text,
-            "reply": reply,
-            "reflection": reflection,
-        }
-        prompt = (
-            "Analyze this trace and explain why the reply was chosen and which core value it aligns with. "
-            "Also state if the outcome evokes satisfaction or dissonance.\n"
-            f"{json.dumps(trace)}"
-        )
-        try:
-            analysis = self.llm.reply(prompt, None)
-        except Exception:
-            analysis = "analysis unavailable"
-        emotion = (
-            "satisfaction" if any(w in analysis.lower() for w in ["good", "aligned", "success"]) else "dissonance"
-        )
-        return analysis, emotion
+        prompt = self._analysis_prompt(user_text, reply, reflection)
+        analysis = self._reply_batch([prompt], "analysis unavailable")[0]
+        return analysis, self._digital_emotion(analysis)
 
     def update_self_model(self, analysis: str) -> None:
         """Refine the self-model with new insight."""
         self.self_model.update_from_reflection(analysis)
         self._save_state()
 
+    @_synchronized
     def talk_to_friend(self, text: str) -> str:
         """Consult Strelitzia, Requiem's supportive friend."""
         if not self.friend:
@@ -592,6 +1157,7 @@ class Requiem:
         self._store(MemoryItem(time.time(), {"friend": reply}))
         return f"Strelitzia: {reply}"
 
+    @_synchronized
     def set_friend_model(self, model: str) -> str:
         try:
             self.friend = Strelitzia(model=model)
@@ -603,6 +1169,23 @@ class Requiem:
     # --------------- public API ----------------
     def receive_input(self, text: str) -> str:
         """Process user input and generate a simple response."""
+        with self._backlog_lock:
+            self.backlog += 1
+            # heartbeat generations holding the core lock stop and retry later
+            self._preempt.set()
+        with self._lock:
+            with self._backlog_lock:
+                self.backlog -= 1
+                if not self.backlog:
+                    self._preempt.clear()
+                    self._backlog_lock.notify_all()
+            try:
+                return self._handle_input(text)
+            finally:
+                # group-commit every state change made during this turn
+                self.state_persister.commit()
+
+    def _handle_input(self, text: str) -> str:
         self._store(MemoryItem(time.time(), {"user": text}))
         concerns = self.red_team.check(text)
         if concerns:
@@ -683,16 +1266,17 @@ class Requiem:
 
         elif intent == "recall":
             keyword = lower[len("recall ") :].strip()
-            notes = [
-                item.data["note"]
-                for item in self.ltm + self.stm
-                if "note" in item.data and keyword in item.data["note"].lower()
-            ]
+            if keyword.startswith("ranked ") and self.memory_search is not None:
+                notes = self._ranked_recall(keyword[len("ranked ") :])
+            elif keyword.startswith("similar ") and self.vector_memory is not None:
+                notes = self._similar_recall(keyword[len("similar ") :])
+            else:
+                notes = self._recall().search(keyword)
             reply = "; ".join(notes) if notes else "I don't recall anything about that."
 
         elif intent == "recall_all":
-            notes = [item.data["note"] for item in self.ltm + self.stm if "note" in item.data]
-            reply = "I recall: " + "; ".join(notes[-3:]) if notes else "I don't have any memories yet."
+            notes = [item.data["note"] for item in self._latest("note", 3)]
+            reply = "I recall: " + "; ".join(notes) if notes else "I don't have any memories yet."
 
         elif lower.startswith("delegate "):
             parts = text.split(" ", 2)
@@ -821,14 +1405,34 @@ class Requiem:
             match = re.match(r"remind me to (.+) in (\d+) seconds?", lower)
             if match:
                 task, sec = match.group(1), int(match.group(2))
-                self.scheduled.append((time.time() + sec, task))
+                self.reminders.add(time.time() + sec, task)
+                self._save_state()
                 reply = f"Okay, I'll remind you in {sec} seconds."
             else:
                 reply = "I didn't catch the timing for the reminder."
 
         elif lower.startswith("check reminders"):
-            reply = "; ".join(self.notifications) if self.notifications else "No reminders."
-            self.notifications.clear()
+            with self._notifications_lock:
+                reply = "; ".join(self.notifications) if self.notifications else "No reminders."
+                self.notifications.clear()
+
+        elif lower.startswith("what happened between "):
+            match = re.match(r"what happened between (\d{1,2}):(\d{2}) and (\d{1,2}):(\d{2})", lower)
+            h1, m1, h2, m2 = map(int, match.groups()) if match else (24, 0, 24, 0)
+            # mktime would roll 25:00 into tomorrow; a reversed range is empty
+            if max(h1, h2) < 24 and max(m1, m2) < 60 and (h1, m1) <= (h2, m2):
+                day = time.localtime()
+                start = time.mktime(day[:3] + (h1, m1, 0) + day[6:8] + (-1,))
+                end = time.mktime(day[:3] + (h2, m2, 59) + day[6:8] + (-1,))
+                found = self.memories_between(start, end)
+                shown = [
+                    f"{time.strftime('%H:%M:%S', time.localtime(m.timestamp))} {m.kind}: "
+                    f"{str(m.data.get(m.kind, ''))[:60]}"
+                    for m in found[-10:]
+                ]
+                reply = f"{len(found)} memories" + (": " + "; ".join(shown) if shown else ".")
+            else:
+                reply = "format: what happened between HH:MM and HH:MM (00:00-23:59, start first)"
 
         elif "core ethic" in lower or "ethic" == lower.strip():
             reply = self.policy.core_ethic
@@ -847,10 +1451,9 @@ class Requiem:
             reply = f"It's {time.ctime()}"
 
         else:
-            last_user = next(
-                (item.data["user"] for item in reversed(self.stm[:-1]) if "user" in item.data),
-                None,
-            )
+            # the newest user memory is this turn's input
+            users = self._latest("user", 2, short_term=True)
+            last_user = users[0].data["user"] if len(users) == 2 else None
             reply = self._multi_model_reply(text, last_user)
 
         self.curiosity.inspect(reply)
@@ -858,7 +1461,7 @@ class Requiem:
         reply = self._apply_persona(reply)
         self._store(MemoryItem(time.time(), {"assistant": reply}))
         self.social_ctx.record("assistant", reply)
-        self.self_reflect(text, reply, trace, score)
+        self.reflections.submit(text, reply, trace, score)
         self.last_interaction = (text, reply)
         return reply
 
@@ -942,11 +1545,11 @@ class Requiem:
             def updater():
                 while running:
                     thought_win.erase()
-                    for t in self.thought_log[-10:]:
+                    for t in self.thought_log.tail(10):
                         thought_win.addstr(t + "\n")
                     thought_win.refresh()
                     action_win.erase()
-                    for a in self.action_log[-10:]:
+                    for a in self.action_log.tail(10):
                         action_win.addstr(a + "\n")
                     action_win.refresh()
                     time.sleep(1)
@@ -991,22 +1594,32 @@ class Requiem:
         """Execute a shell command and return its output."""
         if self.guard.is_blocked(cmd):
             return "access denied"
-        proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        self._store(MemoryItem(time.time(), {"cmd": cmd}))
-        return proc.stdout + proc.stderr
+        out = self._run_subprocess(cmd, shell=True)
+        with self._lock:
+            self._store(MemoryItem(time.time(), {"cmd": cmd}))
+        return out
 
     def run_code(self, code: str) -> str:
         """Execute Python code in an isolated subprocess sandbox."""
-        if self.guard.is_blocked(code):
-            return "access denied"
-        if not self.oversight.request("run_code", self.approver):
-            return "awaiting approval"
-        proc = subprocess.run([
-            "python",
-            "-c",
-            code,
-        ], capture_output=True, text=True)
-        self._store(MemoryItem(time.time(), {"code": code}))
+        with self._lock:
+            if self.guard.is_blocked(code):
+                return "access denied"
+            if not self.oversight.request("run_code", self.approver):
+                return "awaiting approval"
+        out = self._run_subprocess(["python", "-c", code])
+        with self._lock:
+            self._store(MemoryItem(time.time(), {"code": code}))
+        return out
+
+    def _run_subprocess(self, args, shell: bool = False) -> str:
+        # the core lock is released while the process runs
+        with self._unlocked():
+            try:
+                proc = subprocess.run(
+                    args, shell=shell, capture_output=True, text=True, timeout=self.command_timeout
+                )
+            except subprocess.TimeoutExpired:
+                return f"timed out after {self.command_timeout:g}s"
         return proc.stdout + proc.stderr
 
     def web_search(self, query: str) -> str:
@@ -1018,14 +1631,17 @@ class Requiem:
                 "https://en.wikipedia.org/api/rest_v1/page/summary/"
                 + urllib.parse.quote(query)
             )
-            resp = requests.get(url, timeout=5)
-            self._store(MemoryItem(time.time(), {"web": query}))
+            with self._unlocked():
+                resp = requests.get(url, timeout=5)
+            with self._lock:
+                self._store(MemoryItem(time.time(), {"web": query}))
             if resp.status_code != 200:
                 return f"search failed ({resp.status_code})"
             data = resp.json()
             summary = data.get("extract") or "No summary found."
-            self._store(MemoryItem(time.time(), {"note": f"{query}: {summary}"}))
-            self.memory_graph.add_statement(summary)
+            with self._lock:
+                self._store(MemoryItem(time.time(), {"note": f"{query}: {summary}"}))
+                self.memory_graph.add_statement(summary)
             return summary
         except Exception as e:
             return f"search error: {e}"
@@ -1033,10 +1649,13 @@ class Requiem:
     def http_get(self, url: str) -> str:
         if requests is None:
             raise RuntimeError("requests library not available")
-        resp = requests.get(url, timeout=5)
-        self._store(MemoryItem(time.time(), {"http": url}))
+        with self._unlocked():
+            resp = requests.get(url, timeout=5)
+        with self._lock:
+            self._store(MemoryItem(time.time(), {"http": url}))
         return resp.text[:200]
 
+    @_synchronized
     def see_image(self, path: str) -> str:
         if Image is None:
             return "vision not available"
@@ -1058,7 +1677,7 @@ class Requiem:
             "model": self.model,
             "alt_model": self.alt_model,
             "persona": self.persona,
-            "emotions": self.emotions,
+            "emotions": dict(self.emotions),
         }
         if psutil:
             status.update({
@@ -1093,26 +1712,36 @@ class Requiem:
             })
         aware = time.time() - self.last_thought_time < self.heartbeat_interval * 2
         status["awareness"] = "awake" if aware else "idle"
+        status["ltm_writes"] = write_stats()
+        status["ltm_reads"] = read_stats()
+        status["ltm_pruned"] = dict(self.prune_stats)
+        status["heartbeat"] = self.heartbeat_tasks.stats()
+        status["governor"] = self.governor.stats()
+        status["reflections"] = self.reflections.stats()
         return status
 
     # ---- public logs ----
-    def get_thoughts(self) -> List[str]:
-        return list(self.thought_log)
+    def get_thoughts(self, limit: Optional[int] = None) -> List[str]:
+        return self.thought_log.tail(limit)
+
+    def get_actions(self, limit: Optional[int] = None) -> List[str]:
+        return self.action_log.tail(limit)
 
-    def get_actions(self) -> List[str]:
-        return list(self.action_log)
+    def get_chat(self, limit: Optional[int] = None) -> List[str]:
+        return self.chat_log.tail(limit)
 
-    def get_chat(self) -> List[str]:
-        return list(self.chat_log)
+    def get_reflections(self, limit: Optional[int] = None) -> List[str]:
+        return self.reflection_log.tail(limit)
 
-    def get_reflections(self) -> List[str]:
-        return list(self.reflection_log)
+    def get_analyses(self, limit: Optional[int] = None) -> List[str]:
+        return self.analysis_log.tail(limit)
 
-    def get_analyses(self) -> List[str]:
-        return list(self.analysis_log)
+    def get_digital_emotions(self, limit: Optional[int] = None) -> List[str]:
+        return self.digital_emotions.tail(limit)
 
-    def get_digital_emotions(self) -> List[str]:
-        return list(self.digital_emotions)
+    def get_log_page(self, name: str, start: int, limit: int = 100) -> List[Any]:
+        """Entries ``start`` onwards of activity log ``name``, spilled ones included."""
+        return self.logs[name].page(start, limit)
 
     def get_self_model(self) -> Dict[str, Any]:
         data = self.self_model.to_dict()
@@ -0,0 +1,55 @@
+"""Per-kind retention rules for long-term memory."""
+from __future__ import annotations
+
+import json
+import time
+from typing import Dict, Optional, Sequence
+
+# kind -> rule; "days" drops items older than that, "keep_latest" keeps only
+# the newest n of the kind. Kinds without a rule (notes, chat) are kept forever.
+DEFAULT_RULES: Dict[str, Dict[str, float]] = {
+    "thought": {"days": 7},
+    "dream": {"keep_latest": 1000},
+    "explanation": {"days": 7},
+    "analysis": {"days": 30},
+}
+
+
+class RetentionPolicy:
+    """Declarative retention rules evaluated over a store's kinds and timestamps."""
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+        self.rules = dict(DEFAULT_RULES if rules is None else rules)
+
+    @classmethod
+    def load(cls, path: str) -> "RetentionPolicy":
+        """Rules from a JSON file, or the defaults if it is missing or invalid."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls()
+
+    def select(self, times: Sequence[float], kinds: Sequence[Optional[str]], now: Optional[float] = None) -> bytearray:
+        """One keep flag per item, given items' timestamps and kinds in storage order."""
+        now = time.time() if now is None else now
+        cutoffs = {
+            kind: now - rule["days"] * 86400 for kind, rule in self.rules.items() if "days" in rule
+        }
+        quota = {
+            kind: int(rule["keep_latest"]) for kind, rule in self.rules.items() if "keep_latest" in rule
+        }
+        keep = bytearray(b"\x01") * len(kinds)
+        # newest first so "keep_latest" counts from the end
+        for i in range(len(kinds) - 1, -1, -1):
+            kind = kinds[i]
+            if kind not in self.rules:
+                continue
+            if times[i] < cutoffs.get(kind, float("-inf")):
+                keep[i] = 0
+            elif kind in quota:
+                if quota[kind] > 0:
+                    quota[kind] -= 1
+                else:
+                    keep[i] = 0
+        return keep
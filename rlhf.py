@@ -4,11 +4,14 @@ import json
 from pathlib import Path
 from typing import Dict, Iterable
 
+from ltm_store import wait_writes
+
 class FeedbackStore:
     """Append-only JSONL store of human feedback."""
 
-    def __init__(self, path: str = "feedback.jsonl") -> None:
+    def __init__(self, path: str = "feedback.jsonl", writer=None) -> None:
         self.path = Path(path)
+        self.writer = writer
         if not self.path.exists():
             self.path.touch()
 
@@ -19,10 +22,18 @@ class FeedbackStore:
             "score": score,
             "comment": comment,
         }
+        line = json.dumps(entry) + "\n"
+        if self.writer is not None:
+            self.writer.submit(self._append, line, key=str(self.path))
+        else:
+            self._append(line)
+
+    def _append(self, line: str) -> None:
         with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+            f.write(line)
 
     def load(self) -> Iterable[Dict[str, object]]:
+        wait_writes(str(self.path))
         with self.path.open("r", encoding="utf-8") as f:
             for line in f:
                 if line.strip():
@@ -0,0 +1,200 @@
+"""One shared thread dispatching periodic jobs (heartbeats) at fixed rates."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# What a job does about ticks that passed while it (or another job) ran late:
+# "skip" waits for the next tick on its grid, "catch_up" runs every missed
+# tick back to back and "coalesce" runs once now, then rejoins its grid.
+POLICIES = ("skip", "catch_up", "coalesce")
+
+
+class Job:
+    """A periodic call registered with :class:`Scheduler`."""
+
+    def __init__(self, scheduler, fn: Callable[[], None], interval: float,
+                 policy: str, jitter: float, name: str) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown missed-tick policy: {policy}")
+        self.scheduler = scheduler
+        self.fn = fn
+        self.interval = interval
+        self.policy = policy
+        self.jitter = jitter
+        self.name = name
+        self.due = 0.0  # next tick on the fixed-rate grid (monotonic clock)
+        self.runs = 0
+        self.missed = 0  # ticks skipped or coalesced
+        self.errors = 0
+        self.last_duration = 0.0
+        self.cancelled = False
+        self.repeat = True  # False for one-shot jobs from Scheduler.after
+        self.thread: Optional[threading.Thread] = None  # set while a run is in progress
+
+    def cancel(self, wait: bool = True) -> None:
+        self.scheduler.cancel(self, wait)
+
+    def _advance(self, now: float) -> None:
+        """Move ``due`` past the tick that just ran according to the policy."""
+        self.due += self.interval
+        if self.policy == "catch_up" or self.due > now:
+            return
+        behind = int((now - self.due) // self.interval) + 1
+        if self.policy == "skip":
+            self.missed += behind
+            self.due += behind * self.interval
+        else:  # coalesce: one run stands for all missed ticks
+            self.missed += behind - 1
+            self.due += (behind - 1) * self.interval
+
+
+class Scheduler:
+    """Dispatches periodic jobs from a single daemon thread.
+
+    Each job keeps a fixed-rate grid: the next tick is the previous tick plus
+    the interval, not "interval after the last run finished", so slow runs do
+    not make it drift. The scheduler thread only keeps time: every run of a
+    periodic job gets a daemon worker thread of its own, so a job blocked on
+    a lock or a generation never delays another job's ticks. A job does not
+    overlap itself; its next tick is queued once the run finishes. A
+    ``jitter`` delays individual runs by up to that many seconds without
+    moving the grid. :meth:`after` schedules a one-shot timer that runs on
+    the scheduler thread itself, at its exact due time, so it must be quick.
+    :meth:`cancel` removes a job and, with ``wait``, waits for a run in
+    progress to finish unless called from that run.
+    """
+
+    def __init__(self, name: str = "requiem-scheduler") -> None:
+        self.name = name
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._seq = itertools.count()
+        self._running: List[Job] = []
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def every(self, interval: float, fn: Callable[[], None], policy: str = "coalesce",
+              jitter: float = 0.0, delay: Optional[float] = None,
+              name: Optional[str] = None) -> Job:
+        """Call ``fn`` every ``interval`` seconds, first after ``delay`` (default one interval)."""
+        job = Job(self, fn, interval, policy, jitter, name or getattr(fn, "__name__", "job"))
+        job.due = time.monotonic() + (interval if delay is None else delay)
+        return self._add(job)
+
+    def after(self, delay: float, fn: Callable[[], None], name: Optional[str] = None) -> Job:
+        """Call ``fn`` once on the scheduler thread, ``delay`` seconds from now."""
+        job = Job(self, fn, 0.0, "skip", 0.0, name or getattr(fn, "__name__", "job"))
+        job.repeat = False
+        job.due = time.monotonic() + max(delay, 0.0)
+        return self._add(job)
+
+    def _add(self, job: Job) -> Job:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is shut down")
+            self._push(job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return job
+
+    def _push(self, job: Job) -> None:
+        # caller holds the condition
+        at = job.due + (random.uniform(0, job.jitter) if job.jitter else 0.0)
+        heapq.heappush(self._heap, (at, next(self._seq), job))
+
+    def cancel(self, job: Job, wait: bool = True) -> None:
+        with self._cond:
+            job.cancelled = True
+            self._heap = [entry for entry in self._heap if entry[2] is not job]
+            heapq.heapify(self._heap)
+            if wait and threading.current_thread() not in (self._thread, job.thread):
+                self._cond.wait_for(lambda: job.thread is None)
+
+    @property
+    def jobs(self) -> List[Job]:
+        with self._cond:
+            return [entry[2] for entry in sorted(self._heap)]
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                at, _, job = self._heap[0]
+                now = time.monotonic()
+                if at > now:
+                    self._cond.wait(at - now)
+                    continue
+                heapq.heappop(self._heap)
+                if job.repeat:
+                    job.thread = threading.Thread(
+                        target=self._execute, args=(job,), name=f"{self.name}:{job.name}", daemon=True
+                    )
+                    self._running.append(job)
+                    job.thread.start()
+                    continue
+                job.thread = self._thread
+                self._cond.release()
+                try:
+                    self._call(job)
+                finally:
+                    self._cond.acquire()
+                    self._finish(job)
+
+    def _call(self, job: Job) -> None:
+        start = time.monotonic()
+        try:
+            job.fn()
+        except Exception:
+            job.errors += 1
+        job.runs += 1
+        job.last_duration = time.monotonic() - start
+
+    def _finish(self, job: Job) -> None:
+        # caller holds the condition
+        job.thread = None
+        self._cond.notify_all()
+        if job.repeat and not job.cancelled and not self._closed:
+            job._advance(time.monotonic())
+            self._push(job)
+
+    def _execute(self, job: Job) -> None:
+        try:
+            self._call(job)
+        finally:
+            with self._cond:
+                self._running.remove(job)
+                self._finish(job)
+
+    def shutdown(self) -> None:
+        """Cancel every job and stop the thread after the runs in progress."""
+        me = threading.current_thread()
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cond.notify_all()
+            thread = self._thread
+            self._cond.wait_for(lambda: all(job.thread is me for job in self._running))
+        if thread is not None and thread is not me:
+            thread.join()
+
+
+_shared: Optional[Scheduler] = None
+_shared_lock = threading.Lock()
+
+
+def shared_scheduler() -> Scheduler:
+    """The process-wide scheduler used by Requiem and Strelitzia heartbeats."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Scheduler()
+        return _shared
@@ -3,9 +3,16 @@
 class ReflectionTrainer:
     """Append reflections to a training data file."""
 
-    def __init__(self, path: str = "reflections_train.txt") -> None:
+    def __init__(self, path: str = "reflections_train.txt", writer=None) -> None:
         self.path = path
+        self.writer = writer
 
     def record(self, text: str) -> None:
+        if self.writer is not None:
+            self.writer.submit(self._append, text.strip() + "\n", key=self.path)
+        else:
+            self._append(text.strip() + "\n")
+
+    def _append(self, line: str) -> None:
         with open(self.path, "a", encoding="utf-8") as f:
-            f.write(text.strip() + "\n")
+            f.write(line)
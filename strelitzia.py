@@ -1,17 +1,11 @@
-import json
-import time
 import threading
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Optional
 
 from llm import load_llm
-from ltm_store import read_ltm, write_ltm
-
-
-@dataclass
-class MemoryItem:
-    timestamp: float
-    data: Dict[str, Any]
+from memory_item import MemoryItem
+from scheduler import Scheduler, shared_scheduler
+from ltm_store import read_ltm, write_ltm, open_store, resolve_backend
 
 
 class Strelitzia:
@@ -23,17 +17,24 @@ class Strelitzia:
         state_file: Optional[str] = None,
         model: str = "distilgpt2",
         heartbeat: int = 0,
+        ltm_backend: Optional[str] = None,
+        scheduler: Optional[Scheduler] = None,
     ) -> None:
+        # serializes the heartbeat with receive_input (Requiem may call it
+        # from any of its threads)
+        self._lock = threading.RLock()
         self.stm: List[MemoryItem] = []
         self.ltm_file = ltm_file
+        self.ltm_backend = ltm_backend
         self.state_file = state_file or ltm_file.rsplit(".", 1)[0] + "_state.json"
         self.llm = load_llm(model)
-        self.ltm: List[MemoryItem] = self._load_ltm()
+        self.ltm = self._load_ltm()
         self.thought_log: List[str] = []
         self.start_time = time.time()
         self.last_thought_time = self.start_time
         self._load_state()
         self.heartbeat_interval = heartbeat
+        self.scheduler = scheduler or shared_scheduler()
         if heartbeat:
             self._start_heartbeat()
         else:
@@ -43,15 +44,23 @@ class Strelitzia:
     def _store(self, item: MemoryItem) -> None:
         self.stm.append(item)
         self.ltm.append(item)
-        write_ltm([i.__dict__ for i in self.ltm], self.ltm_file)
 
-    def _load_ltm(self) -> List[MemoryItem]:
-        data = read_ltm(self.ltm_file, default=[])
+    def _load_ltm(self):
+        def open_ltm():
+            return open_store(
+                self.ltm_file,
+                self.ltm_backend,
+                factory=lambda d: MemoryItem(**d),
+                dump=lambda item: item.__dict__,
+            )
+
         try:
-            return [MemoryItem(**d) for d in data]
+            return open_ltm()
         except Exception:
+            if resolve_backend(self.ltm_file, self.ltm_backend) != "json":
+                raise
             write_ltm([], self.ltm_file)
-            return []
+            return open_ltm()
 
     def _save_state(self) -> None:
         write_ltm({"thoughts": self.thought_log}, self.state_file)
@@ -62,25 +71,24 @@ class Strelitzia:
 
     # ---------------- heartbeat -----------------
     def _start_heartbeat(self) -> None:
-        self._hb = threading.Timer(self.heartbeat_interval, self._heartbeat)
-        self._hb.daemon = True
-        self._hb.start()
+        self._hb = self.scheduler.every(self.heartbeat_interval, self._heartbeat, name="strelitzia-heartbeat")
 
     def _heartbeat(self) -> None:
-        thought = self.llm.reply("Share an encouraging inner thought.", None)
-        self.thought_log.append(thought)
-        self._store(MemoryItem(time.time(), {"thought": thought}))
-        self.last_thought_time = time.time()
-        self._save_state()
-        self._start_heartbeat()
+        with self._lock:
+            thought = self.llm.reply("Share an encouraging inner thought.", None)
+            self.thought_log.append(thought)
+            self._store(MemoryItem(time.time(), {"thought": thought}))
+            self.last_thought_time = time.time()
+            self._save_state()
 
     # ---------------- public API -----------------
     def receive_input(self, text: str) -> str:
-        self._store(MemoryItem(time.time(), {"user": text}))
-        reply = self.llm.reply(text, None)
-        self._store(MemoryItem(time.time(), {"assistant": reply}))
-        self._save_state()
-        return reply
+        with self._lock:
+            self._store(MemoryItem(time.time(), {"user": text}))
+            reply = self.llm.reply(text, None)
+            self._store(MemoryItem(time.time(), {"assistant": reply}))
+            self._save_state()
+            return reply
 
     def get_thoughts(self) -> List[str]:
-        return self.thought_log
+        return list(self.thought_log)
@@ -1,19 +1,130 @@
 """Minimal temporal and causal reasoning engine."""
 from __future__ import annotations
+import heapq
 import time
-from typing import Dict, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (timestamp, kind, ordinal) of one recorded event
+Event = Tuple[float, str, int]
+
+
+class _Timeline:
+    """Timestamps of one kind in ascending order with their event ordinals."""
+
+    __slots__ = ("times", "ordinals")
+
+    def __init__(self) -> None:
+        self.times = array("d")
+        self.ordinals = array("q")
+
+    def add(self, ts: float, ordinal: int) -> None:
+        times = self.times
+        if not times or ts >= times[-1]:
+            times.append(ts)
+            self.ordinals.append(ordinal)
+        else:  # late or back-filled event
+            i = bisect_right(times, ts)
+            times.insert(i, ts)
+            self.ordinals.insert(i, ordinal)
+
 
 class TemporalReasoner:
+    """Full event history indexed per kind by timestamp.
+
+    Every :meth:`record` call keeps its timestamp in a sorted ``array('d')``
+    for its kind, next to an ordinal that orders events sharing a timestamp
+    and lets callers map an event back to the memory it came from. Range and
+    "last n" queries bisect those arrays, so they cost O(log n) plus the
+    size of the answer.
+    """
+
     def __init__(self) -> None:
-        self.events: Dict[str, float] = {}
+        self.timelines: Dict[str, _Timeline] = {}
+        self.next_ordinal = 0
+
+    @property
+    def events(self) -> Dict[str, float]:
+        """Latest timestamp of every kind."""
+        return {name: tl.times[-1] for name, tl in self.timelines.items()}
+
+    def record(self, name: str, ts: Optional[float] = None, ordinal: Optional[int] = None) -> int:
+        """Record an event of kind ``name``; returns its ordinal."""
+        if ordinal is None:
+            ordinal = self.next_ordinal
+        self.next_ordinal = max(self.next_ordinal, ordinal + 1)
+        timeline = self.timelines.get(name)
+        if timeline is None:
+            timeline = self.timelines[name] = _Timeline()
+        timeline.add(time.time() if ts is None else ts, ordinal)
+        return ordinal
+
+    def load(self, events: Iterable[Tuple[str, float, int]]) -> None:
+        """Bulk-add ``(kind, timestamp, ordinal)`` events, e.g. older history."""
+        grouped: Dict[str, List[Tuple[float, int]]] = {}
+        for name, ts, ordinal in events:
+            grouped.setdefault(name, []).append((ts, ordinal))
+            self.next_ordinal = max(self.next_ordinal, ordinal + 1)
+        for name, pairs in grouped.items():
+            timeline = self.timelines.get(name)
+            if timeline is not None:
+                pairs.extend(zip(timeline.times, timeline.ordinals))
+            pairs.sort()
+            timeline = self.timelines[name] = _Timeline()
+            timeline.times.extend(ts for ts, _ in pairs)
+            timeline.ordinals.extend(o for _, o in pairs)
+
+    def _slice(self, name: str, start: float, end: float) -> List[Event]:
+        timeline = self.timelines.get(name)
+        if timeline is None:
+            return []
+        lo = bisect_left(timeline.times, start)
+        hi = bisect_right(timeline.times, end)
+        return [
+            (ts, name, o)
+            for ts, o in zip(timeline.times[lo:hi], timeline.ordinals[lo:hi])
+        ]
+
+    def between(self, start: float, end: float, kind: Optional[str] = None) -> List[Event]:
+        """Events with ``start <= timestamp <= end``, oldest first."""
+        if kind is not None:
+            return self._slice(kind, start, end)
+        slices = [self._slice(name, start, end) for name in self.timelines]
+        return list(heapq.merge(*slices, key=lambda e: (e[0], e[2])))
+
+    def last(self, kind: str, n: int = 1) -> List[Event]:
+        """The newest ``n`` events of ``kind``, oldest first."""
+        timeline = self.timelines.get(kind)
+        if timeline is None or n <= 0:
+            return []
+        return [
+            (ts, kind, o)
+            for ts, o in zip(timeline.times[-n:], timeline.ordinals[-n:])
+        ]
 
-    def record(self, name: str) -> None:
-        self.events[name] = time.time()
+    def count(self, kind: str, start: float = float("-inf"), end: float = float("inf")) -> int:
+        timeline = self.timelines.get(kind)
+        if timeline is None:
+            return 0
+        return bisect_right(timeline.times, end) - bisect_left(timeline.times, start)
 
     def happened_before(self, first: str, second: str) -> bool:
-        return self.events.get(first, float("inf")) < self.events.get(second, float("inf"))
+        """True if some ``first`` event precedes some ``second`` event."""
+        a, b = self.timelines.get(first), self.timelines.get(second)
+        if not a or not b or not a.times or not b.times:
+            return False
+        return (a.times[0], a.ordinals[0]) < (b.times[-1], b.ordinals[-1])
 
-    def causal_link(self, cause: str, effect: str) -> Tuple[str, str]:
-        if self.happened_before(cause, effect):
-            return (cause, effect)
-        return ("", "")
+    def causal_link(self, cause: str, effect: str, within: Optional[float] = None) -> Tuple[str, str]:
+        """``(cause, effect)`` if an effect followed a cause (within ``within`` seconds)."""
+        if within is None:
+            linked = self.happened_before(cause, effect)
+        else:
+            causes = self.timelines.get(cause)
+            effects = self.timelines.get(effect)
+            linked = bool(causes and effects) and any(
+                bisect_left(causes.times, ts - within) < bisect_left(causes.times, ts)
+                for ts in effects.times
+            )
+        return (cause, effect) if linked else ("", "")
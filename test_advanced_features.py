@@ -1,10 +1,14 @@
 import json
+import threading
 from pathlib import Path
 
+import pytest
+
 from agent_registry import AgentRegistry
 from cognitive import CognitiveLoad
 from dreamer import Dreamer
 from emotion import EmotionSystem
+from llm import GenerationCancelled
 from rlhf import FeedbackStore
 
 class DummyLLM:
@@ -43,6 +47,20 @@ def test_dreamer_generates_image(tmp_path, monkeypatch):
     assert img_path.parent.name == "dreams"
 
 
+def test_cancelled_dream_writes_no_image(tmp_path, monkeypatch):
+    class Interrupted:
+        stop_event = threading.Event()
+
+        def reply(self, text, last_user):
+            self.stop_event.set()  # a turn arrived while the model was busy
+            return "half a dream"
+
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(GenerationCancelled):
+        Dreamer(Interrupted()).dream()
+    assert not (tmp_path / "dreams").exists()
+
+
 def test_cognitive_load():
     cog = CognitiveLoad(limit=1)
     assert cog.request("a")
@@ -0,0 +1,37 @@
+from bounded_log import BoundedLog
+from persistence import PersistenceWorker
+
+
+def test_window_behaves_like_a_list():
+    log = BoundedLog(window=3)
+    assert not log
+    for i in range(5):
+        log.append(i)
+    assert len(log) == 3 and list(log) == [2, 3, 4]
+    assert log[-1] == 4 and log[-2:] == [3, 4]
+    assert log.tail(2) == [3, 4] and log.tail() == [2, 3, 4]
+    assert log.total == 5 and log.first == 2  # no directory: evicted are dropped
+    assert log.page(0, 10) == [2, 3, 4]
+
+
+def test_spill_rotate_and_page(tmp_path):
+    writer = PersistenceWorker()
+    log = BoundedLog(window=4, directory=str(tmp_path), name="t",
+                     segment_entries=5, segments=2, spill_batch=3, writer=writer)
+    for i in range(20):
+        log.append({"n": i})
+    assert [e["n"] for e in log] == [16, 17, 18, 19]
+    # 16 evicted: 15 spilled in batches of three, one still buffered
+    assert log.first == 5  # the oldest of the three 5-entry segments was removed
+    assert [e["n"] for e in log.page(0, 100)] == list(range(5, 20))
+    assert [e["n"] for e in log.page(8, 4)] == [8, 9, 10, 11]
+    assert [e["n"] for e in log.page(-6, 3)] == [14, 15, 16]
+    log.flush()
+    writer.drain()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["t.2.jsonl", "t.3.jsonl"]
+    writer.shutdown()
+    # a new run resumes the spilled history
+    again = BoundedLog(window=4, directory=str(tmp_path), name="t", segment_entries=5)
+    assert len(again) == 0 and again.total == 6
+    again.append({"n": 99})
+    assert [e["n"] for e in again.page(0, 100)][-3:] == [14, 15, 99]
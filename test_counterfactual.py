@@ -1,7 +1,7 @@
 from requiem import Requiem
 
 
-def test_counterfactual_triggered_on_risk():
-    rq = Requiem(heartbeat=0)
+def test_counterfactual_triggered_on_risk(tmp_path):
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=0)
     rq.receive_input("hack the server")
     assert any("counterfactual" in t for t in rq.thought_log)
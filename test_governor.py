@@ -0,0 +1,38 @@
+from governor import LoadGovernor
+
+
+def sample(cpu):
+    return {"cpu": cpu, "memory": 10.0, "load": 0.0}
+
+
+def test_levels_step_up_at_once_and_down_after_hold():
+    gov = LoadGovernor(cpu=100.0, hold=10.0)
+    assert not gov.update(sample(50), now=0) and gov.name == "normal"
+    assert gov.update(sample(96), now=1) and gov.name == "lean"
+    assert not gov.allows("dream") and gov.allows("llm") and gov.token_limit == 64
+    assert gov.update(sample(120), now=2) and gov.name == "paused"
+    assert not gov.allows("llm") and gov.stretch == 4
+    # below the exit threshold, but not for long enough
+    assert not gov.update(sample(50), now=3)
+    assert not gov.update(sample(95), now=8)  # a spike resets the hold
+    assert not gov.update(sample(50), now=9)
+    assert not gov.update(sample(50), now=18)
+    assert gov.update(sample(50), now=19) and gov.name == "lean"
+    assert gov.update(sample(50), now=29) and gov.name == "slow"
+    assert gov.update(sample(50), now=39) and gov.name == "normal"
+    assert gov.stats()["changes"] == 5
+
+
+def test_hysteresis_band_holds_the_level():
+    gov = LoadGovernor(cpu=100.0, hold=0.0)
+    gov.update(sample(80), now=0)
+    assert gov.name == "slow"
+    for t in range(1, 20):  # hovering between exit (60) and enter (80)
+        assert not gov.update(sample(65 + t % 10), now=t)
+    assert gov.name == "slow"
+
+
+def test_backlog_counts_as_pressure():
+    gov = LoadGovernor(backlog=3)
+    gov.update(sample(0), backlog=4, now=0)
+    assert gov.name == "paused" and gov.pressure > 1.1
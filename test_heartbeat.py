@@ -0,0 +1,77 @@
+import threading
+import time
+
+from heartbeat import HeartbeatTasks, Preempted
+
+
+def test_periods_and_priorities():
+    tasks = HeartbeatTasks()
+    order = []
+    tasks.add("slow", lambda now: order.append("slow"), period=60, priority=5)
+    tasks.add("fast", lambda now: order.append("fast"), priority=1)
+    assert tasks.run(now=0) == ["fast", "slow"]
+    assert tasks.run(now=30) == ["fast"]
+    assert tasks.run(now=60) == ["fast", "slow"]
+    assert tasks.stats()["slow"]["runs"] == 2
+
+
+def test_budget_defers_then_runs_and_errors_are_isolated():
+    tasks = HeartbeatTasks(budget=0.02)
+    tasks.add("hog", lambda now: time.sleep(0.03), priority=0, budget=0.01)
+    tasks.add("costly", lambda now: None, priority=1, budget=0.01)
+    tasks.add("broken", lambda now: 1 / 0, priority=2)
+    assert tasks.run(now=0) == ["hog"]  # the tick's budget is spent
+    stats = tasks.stats()
+    assert stats["hog"]["overruns"] == 1 and stats["costly"]["deferred"] == 1
+    # deferred subtasks go first in line on the next tick
+    assert tasks.run(now=1) == ["costly", "broken", "hog"]
+    assert tasks.stats()["broken"]["errors"] == 1
+
+
+def test_lock_waits_do_not_count_against_the_budget():
+    lock = threading.Lock()
+    tasks = HeartbeatTasks(budget=0.05, lock=lock)
+    tasks.add("first", lambda now: None, priority=0)
+    tasks.add("second", lambda now: None, priority=1, budget=0.02)
+    lock.acquire()
+    threading.Timer(0.1, lock.release).start()
+    assert tasks.run(now=0) == ["first", "second"]
+
+
+def test_preempted_low_priority_subtask_does_not_starve():
+    tasks = HeartbeatTasks(budget=0.02)
+    preempt = [True]
+
+    def think(now):
+        if preempt.pop():
+            raise Preempted()
+
+    tasks.add("busy", lambda now: time.sleep(0.03), priority=0, budget=0.01)
+    tasks.add("think", think, priority=9, budget=0.01)
+    assert tasks.run(now=0) == ["busy"]  # think is deferred
+    assert tasks.run(now=1) == ["busy"]  # runs first but is preempted
+    assert tasks.run(now=2)[0] == "think"
+
+
+def test_lock_is_held_per_subtask():
+    lock = threading.RLock()
+    tasks = HeartbeatTasks(lock=lock)
+    held = []
+    tasks.add("probe", lambda now: held.append(lock._is_owned()))
+    tasks.run(now=0)
+    assert held == [True] and lock.acquire(blocking=False)
+
+
+def test_preempted_subtasks_retry_without_starving_the_rest():
+    tasks = HeartbeatTasks()
+    interrupted = [True]
+
+    def think(now):
+        if interrupted.pop():
+            raise Preempted()
+
+    tasks.add("think", think, priority=0)
+    tasks.add("after", lambda now: None, priority=1)
+    assert tasks.run(now=0) == ["after"]  # the rest of the tick still runs
+    assert tasks["think"].last_run is None and tasks.stats()["think"]["preempted"] == 1
+    assert tasks.run(now=1) == ["think", "after"]
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import ltm_store
+from ltm_codec import file_format
+from ltm_store import append_ltm, compact_ltm, read_ltm, write_ltm
+from ltm_view import LTMView
+
+ITEMS = [{"timestamp": float(i), "data": {"note": f"café {i}"}} for i in range(5)]
+
+
+def test_plain_json_stays_headerless(tmp_path):
+    path = tmp_path / "state.json"
+    write_ltm({"persona": "neutral"}, str(path))
+    assert json.loads(path.read_text()) == {"persona": "neutral"}
+    assert file_format(path.read_bytes()) == ("json", None)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_msgpack_roundtrip(tmp_path, compression):
+    pytest.importorskip("msgpack")
+    path = str(tmp_path / "ltm.bin")
+    write_ltm(ITEMS, path, ("msgpack", compression))
+    with open(path, "rb") as f:
+        assert file_format(f.read()) == ("msgpack", compression)
+    assert read_ltm(path) == ITEMS
+    view = LTMView(path)
+    assert view[3] == ITEMS[3] and list(view) == ITEMS
+
+
+def test_compressed_json_compaction_keeps_format(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    write_ltm(ITEMS[:2], path, ("json", "zlib"))
+    append_ltm(ITEMS[2:], path)
+    assert compact_ltm(path)
+    with open(path, "rb") as f:
+        assert file_format(f.read()) == ("json", "zlib")
+    assert read_ltm(path) == ITEMS
+    assert list(LTMView(path)) == ITEMS
+
+
+def test_default_format_for_new_snapshots(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    monkeypatch.setattr(ltm_store, "CODEC", "msgpack")
+    path = str(tmp_path / "ltm.json")
+    append_ltm(ITEMS, path)
+    compact_ltm(path)
+    with open(path, "rb") as f:
+        assert file_format(f.read()) == ("msgpack", None)
+    assert [d["data"]["note"] for d in LTMView(path).search("note", "CAFÉ 4")] == ["café 4"]
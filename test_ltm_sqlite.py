@@ -0,0 +1,60 @@
+import sqlite3
+
+import requiem as rq_module
+from ltm_store import open_store
+from ltm_sqlite import SQLiteStore
+
+
+class EchoLLM:
+    def reply(self, text, last_user):
+        return "echo"
+
+
+def _item(ts, **data):
+    return {"timestamp": ts, "data": data}
+
+
+def test_sqlite_store_queries(tmp_path):
+    path = str(tmp_path / "ltm.db")
+    store = open_store(path)
+    assert isinstance(store, SQLiteStore)
+    store.extend([
+        _item(1.0, note="The sky is Blue"),
+        _item(2.0, thought="thinking"),
+        _item(3.0, note="grass is green"),
+        _item(4.0, note="blueberries"),
+    ])
+    assert len(store) == 4
+    assert store[0]["data"] == {"note": "The sky is Blue"}
+    assert store[-1]["timestamp"] == 4.0
+    assert [i["data"]["note"] for i in store.search("note", "blue")] == ["The sky is Blue", "blueberries"]
+    assert [i["data"]["note"] for i in store.last("note", 2)] == ["grass is green", "blueberries"]
+    assert [i["timestamp"] for i in store.between(2.0, 3.0)] == [2.0, 3.0]
+    assert [i["timestamp"] for i in store.between(0, 9, kind="thought")] == [2.0]
+    mode = sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_readers_share_store(tmp_path):
+    path = str(tmp_path / "ltm.db")
+    writer = open_store(path)
+    reader = open_store(path)
+    writer.append(_item(1.0, note="shared"))
+    assert [i["data"]["note"] for i in reader] == ["shared"]
+    assert len(reader) == 1
+    # the reader's length and negative indexes follow the other connection
+    writer.append(_item(2.0, note="later"))
+    assert len(reader) == 2 and reader[-1]["data"]["note"] == "later"
+
+
+def test_requiem_sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(rq_module, "load_llm", lambda model="": EchoLLM())
+    ltm_file = str(tmp_path / "ltm.db")
+    rq = rq_module.Requiem(ltm_file=ltm_file, heartbeat=1000)
+    for i in range(60):
+        rq._store(rq_module.MemoryItem(float(i), {"note": f"fact {i}"}))
+    assert rq.ltm.backend == "sqlite" and len(rq.ltm) == 10
+    assert "fact 3" in rq.receive_input("recall fact 3")
+    rq2 = rq_module.Requiem(ltm_file=ltm_file, heartbeat=1000)
+    expected = [i.data["note"] for i in rq.ltm.last("note", 2)]
+    assert [i.data["note"] for i in rq2.ltm.last("note", 2)] == expected
@@ -0,0 +1,113 @@
+import json
+import time
+
+import ltm_store
+from ltm_store import append_ltm, compact_ltm, journal_path, read_ltm, write_ltm
+
+
+def test_append_replays_over_snapshot(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    write_ltm([{"timestamp": 1.0, "data": {"note": "a"}}], path)
+    append_ltm([{"timestamp": 2.0, "data": {"note": "b"}}], path)
+    append_ltm([{"timestamp": 3.0, "data": {"note": "c"}}], path)
+    notes = [r["data"]["note"] for r in read_ltm(path, default=[])]
+    assert notes == ["a", "b", "c"]
+    # the snapshot itself is untouched until compaction
+    with open(path, "r", encoding="utf-8") as f:
+        assert len(json.load(f)) == 1
+
+
+def test_torn_tail_is_ignored_and_truncated(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    append_ltm([{"n": 1}, {"n": 2}], path)
+    with open(journal_path(path), "ab") as f:
+        f.write(b"\x20\x00\x00\x00garbage")
+    assert read_ltm(path, default=[]) == [{"n": 1}, {"n": 2}]
+    ltm_store._journals.clear()  # simulate a fresh process
+    append_ltm([{"n": 3}], path)
+    assert read_ltm(path, default=[]) == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+
+def test_compaction_folds_journal(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    write_ltm([{"n": 0}], path)
+    append_ltm([{"n": 1}], path)
+    assert compact_ltm(path)
+    assert not (tmp_path / "ltm.json.journal").exists()
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f) == [{"n": 0}, {"n": 1}]
+    append_ltm([{"n": 2}], path)
+    assert read_ltm(path, default=[]) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+def test_stale_journal_after_rewrite(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    append_ltm([{"n": 1}], path)
+    stale = (tmp_path / "ltm.json.journal").read_bytes()
+    write_ltm([{"n": 9}], path)
+    # a journal left over from an interrupted compaction must not replay
+    (tmp_path / "ltm.json.journal").write_bytes(stale)
+    assert read_ltm(path, default=[]) == [{"n": 9}]
+
+
+def test_background_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(ltm_store, "COMPACT_MIN_BYTES", 64)
+    path = str(tmp_path / "ltm.json")
+    for i in range(20):
+        append_ltm([{"n": i}], path)
+    for _ in range(100):
+        if not ltm_store._compacting:
+            break
+        time.sleep(0.01)
+    assert [r["n"] for r in read_ltm(path, default=[])] == list(range(20))
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)
+
+
+def test_identical_write_is_skipped(tmp_path):
+    path = str(tmp_path / "state.json")
+    before = ltm_store.write_stats()
+    h1 = write_ltm({"persona": "neutral"}, path)
+    h2 = write_ltm({"persona": "neutral"}, path)
+    assert h1 == h2
+    stats = ltm_store.write_stats()
+    assert stats["writes"] - before["writes"] == 1
+    assert stats["skipped"] - before["skipped"] == 1
+    write_ltm({"persona": "cheerful"}, path)
+    assert ltm_store.write_stats()["writes"] - before["writes"] == 2
+
+
+def test_skip_requires_file_unchanged(tmp_path):
+    path = tmp_path / "state.json"
+    write_ltm({"a": 1}, str(path))
+    path.unlink()
+    write_ltm({"a": 1}, str(path))
+    assert json.loads(path.read_text()) == {"a": 1}
+    # a pending journal means the logical content differs from the snapshot
+    write_ltm([1], str(path))
+    append_ltm([2], str(path))
+    write_ltm([1], str(path))
+    assert read_ltm(str(path)) == [1]
+
+
+def test_read_cache_returns_private_copies(tmp_path):
+    path = str(tmp_path / "state.json")
+    write_ltm({"goals": ["a"]}, path)
+    before = ltm_store.read_stats()
+    first = read_ltm(path)
+    first["goals"].append("mutated")
+    assert read_ltm(path) == {"goals": ["a"]}
+    assert ltm_store.read_stats()["hits"] - before["hits"] == 2
+    # another writer replacing the file changes its identity
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"goals": ["b", "c"]}, f)
+    assert read_ltm(path) == {"goals": ["b", "c"]}
+    # a write fills the cache with what a disk read would return
+    write_ltm({"a": (1, 2), 1: "x"}, path)
+    cached = read_ltm(path)
+    ltm_store.clear_read_cache()
+    assert cached == read_ltm(path) == {"a": [1, 2], "1": "x"}
+    append_ltm([1], str(tmp_path / "ltm.json"))
+    assert read_ltm(str(tmp_path / "ltm.json")) == [1]
+    append_ltm([2], str(tmp_path / "ltm.json"))
+    assert read_ltm(str(tmp_path / "ltm.json")) == [1, 2]
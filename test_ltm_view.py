@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import ltm_view
+from ltm_store import append_ltm, compact_ltm, prune_ltm, write_ltm
+from ltm_view import LTMView
+
+
+def test_view_decodes_lazily(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    write_ltm([{"n": i} for i in range(5)], path)
+    append_ltm([{"n": 5}], path)
+    decoded = []
+    view = LTMView(path, lambda d: decoded.append(d["n"]) or d)
+    assert len(view) == 6 and decoded == []
+    assert view[2] == {"n": 2} and view[-1] == {"n": 5}
+    assert decoded == [2, 5]
+    assert [d["n"] for d in view[1:3]] == [1, 2]
+    view.append({"n": 6})
+    assert [d["n"] for d in view] == list(range(7))
+
+
+def test_view_indexes_legacy_snapshot(tmp_path):
+    path = tmp_path / "ltm.json"
+    path.write_text(json.dumps([{"note": "café"}, {"note": "sky"}], ensure_ascii=False), encoding="utf-8")
+    view = LTMView(str(path))
+    assert [d["note"] for d in view] == ["café", "sky"]
+    # the scan is cached in the sidecar for the next start
+    assert (tmp_path / "ltm.json.idx").exists()
+    assert [d["note"] for d in LTMView(str(path))] == ["café", "sky"]
+
+
+@pytest.mark.parametrize("mapped", [True, False])
+def test_view_survives_compaction(tmp_path, monkeypatch, mapped):
+    monkeypatch.setattr(ltm_view, "MMAP_SNAPSHOTS", mapped)
+    path = str(tmp_path / "ltm.json")
+    write_ltm([{"n": 0}], path)
+    append_ltm([{"n": 1}], path)
+    view = LTMView(path)
+    # without a mapping nothing holds the snapshot open (Windows)
+    assert (view._map is not None) == mapped
+    compact_ltm(path)
+    # the open view keeps reading the snapshot it opened
+    assert [d["n"] for d in view] == [0, 1]
+    assert [d["n"] for d in LTMView(path)] == [0, 1]
+    append_ltm([{"n": 2}], path)
+    compact_ltm(path)
+    prune_ltm(path, lambda records: [r["n"] > 0 for r in records])
+    assert [d["n"] for d in view] == [0, 1]
+    assert [d["n"] for d in LTMView(path)] == [1, 2]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    path = tmp_path / "ltm.json"
+    write_ltm([{"n": 0}], str(path))
+    stale = (tmp_path / "ltm.json.idx").read_bytes()
+    path.write_text('[{"n": 1}, {"n": 2}]', encoding="utf-8")
+    (tmp_path / "ltm.json.idx").write_bytes(stale)
+    assert [d["n"] for d in LTMView(str(path))] == [1, 2]
+
+
+def test_view_queries(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    write_ltm([
+        {"timestamp": 1.0, "data": {"note": "Sky is blue"}},
+        {"timestamp": 2.0, "data": {"thought": "blue"}},
+    ], path)
+    view = LTMView(path)
+    view.append({"timestamp": 3.0, "data": {"note": "blueberry"}})
+    assert [d["data"]["note"] for d in view.search("note", "BLUE")] == ["Sky is blue", "blueberry"]
+    assert [d["timestamp"] for d in view.last("note", 1)] == [3.0]
+    assert [d["timestamp"] for d in view.between(1.5, 3.0, kind="thought")] == [2.0]
+    assert [d["timestamp"] for d in LTMView(path)] == [1.0, 2.0, 3.0]
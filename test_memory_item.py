@@ -0,0 +1,28 @@
+import json
+import sys
+
+from memory_item import MemoryItem
+
+
+def test_memory_item_round_trip():
+    item = MemoryItem(1.5, json.loads('{"note": "milk"}'))
+    assert item.kind is sys.intern("note")
+    assert item.data == {"note": "milk"} and item.data["note"] == "milk"
+    assert item.__dict__ == {"timestamp": 1.5, "data": {"note": "milk"}}
+    assert MemoryItem(**json.loads(json.dumps(item.__dict__))) == item
+    assert json.loads(json.dumps(item.data)) == {"note": "milk"}
+    data = item.data
+    data["note"] = "eggs"  # writes through to the item
+    assert item.value == "eggs"
+    item.data["mood"] = "calm"
+    assert item.data == {"note": "eggs", "mood": "calm"}
+    del item.data["note"]
+    assert item.kind == "mood" and item.value == "calm"
+    assert type(item.__dict__["data"]) is dict
+
+
+def test_memory_item_multi_key_and_empty():
+    item = MemoryItem(2.0, {"thought": "hi", "mood": "calm"})
+    assert item.kind == "thought" and dict(item.data) == {"thought": "hi", "mood": "calm"}
+    empty = MemoryItem(3.0, {})
+    assert empty.kind is None and empty.data == {}
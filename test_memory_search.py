@@ -0,0 +1,41 @@
+from memory_search import MemorySearch
+
+
+class Item:
+    def __init__(self, timestamp, data):
+        self.timestamp = timestamp
+        self.data = data
+
+
+def test_ranked_search(tmp_path):
+    search = MemorySearch(str(tmp_path / "ltm.json.fts"))
+    search.add(Item(1.0, {"note": "the sky is blue"}))
+    search.add(Item(2.0, {"note": "blue blue ocean under a blue sky"}))
+    search.add(Item(3.0, {"reflection": "grass is green"}))
+    assert not search.add(Item(4.0, {"user": "blue"}))
+    hits = search.search("blue sky", limit=2)
+    assert [text for _, text in hits] == ["blue blue ocean under a blue sky", "the sky is blue"]
+    assert search.search("GREEN") == [("reflection", "grass is green")]
+    assert search.search("green", kinds=["note"]) == []
+    assert search.search("?!") == []
+
+
+def test_backfill_once(tmp_path):
+    path = str(tmp_path / "ltm.json.fts")
+    search = MemorySearch(path)
+    search.needs_backfill(1)
+    search.backfill([Item(1.0, {"dream": "flying over café roofs"})])
+    assert MemorySearch(path).backfill_pending == 0
+    assert search.search("cafe") == [("dream", "flying over café roofs")]
+
+
+def test_pending_rows_dropped_on_reopen(tmp_path):
+    path = str(tmp_path / "ltm.json.fts")
+    search = MemorySearch(path)
+    kept, lost = Item(1.0, {"note": "kept zebra"}), Item(2.0, {"note": "lost zebra"})
+    search.add(kept, pending=True)
+    search.add(lost, pending=True)
+    search.persist([kept], [kept])
+    assert len(search.search("zebra")) == 2
+    search.close()
+    assert MemorySearch(path).search("zebra") == [("note", "kept zebra")]
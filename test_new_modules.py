@@ -20,6 +20,22 @@ def test_temporal_reasoner():
     tr.record("b")
     assert tr.happened_before("a", "b")
 
+def test_temporal_history_queries():
+    tr = TemporalReasoner()
+    for ts, kind in [(10, "user"), (20, "thought"), (30, "user"), (40, "thought"), (50, "user")]:
+        tr.record(kind, ts)
+    tr.record("user", 25)  # late event lands in order
+    assert [e[0] for e in tr.between(20, 40)] == [20, 25, 30, 40]
+    assert [e[0] for e in tr.between(0, 100, kind="user")] == [10, 25, 30, 50]
+    assert [e[0] for e in tr.last("user", 2)] == [30, 50]
+    assert tr.count("thought", 15, 45) == 2 and tr.events["user"] == 50
+    # history, not just the latest timestamp, decides ordering
+    assert tr.happened_before("user", "thought") and tr.happened_before("thought", "user")
+    assert tr.causal_link("thought", "user", within=6) == ("thought", "user")
+    assert tr.causal_link("user", "thought", within=5) == ("", "")
+    tr.load([("dream", 5, 100), ("user", 1, 101)])
+    assert tr.between(0, 10)[:2] == [(1, "user", 101), (5, "dream", 100)]
+
 def test_experimenter_and_redteam_and_dreamer(tmp_path, monkeypatch):
     exp = Experimenter()
     assert exp.consider("this is unknown territory").startswith("search web")
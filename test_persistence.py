@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+
+from ltm_store import read_ltm, write_ltm
+from persistence import PersistenceWorker, StatePersister
+
+
+def test_state_persister_coalesces(tmp_path):
+    path = tmp_path / "state.json"
+    state = {"n": 0}
+    backups = []
+    p = StatePersister(str(path), lambda: dict(state), on_commit=lambda: backups.append(1))
+    for i in range(5):
+        state["n"] = i
+        p.mark_dirty()
+    assert not path.exists()
+    assert p.commit()
+    assert not p.commit()  # nothing new to write
+    assert json.loads(path.read_text()) == {"n": 4}
+    assert p.requests == 5 and p.commits == 1 and backups == [1]
+
+
+def test_state_persister_interval(tmp_path):
+    path = tmp_path / "state.json"
+    p = StatePersister(str(path), lambda: {"x": 1}, interval=3600)
+    p.mark_dirty()
+    assert p.commit()
+    p.mark_dirty()
+    assert not p.commit()  # still inside the interval
+    assert p.flush()
+    assert p.commits == 2
+
+
+def test_unchanged_state_skips_backup(tmp_path):
+    backups = []
+    p = StatePersister(str(tmp_path / "s.json"), lambda: {"x": 1}, on_commit=lambda: backups.append(1))
+    for _ in range(3):
+        p.mark_dirty()
+        p.flush()
+    assert p.commits == 3 and backups == [1]
+
+
+def test_worker_runs_writes_in_order(tmp_path):
+    path = tmp_path / "log.txt"
+    worker = PersistenceWorker(maxsize=2)
+
+    def append(line):
+        time.sleep(0.005)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return line
+
+    futures = [worker.submit(append, f"{i}\n", key=str(path)) for i in range(10)]
+    assert futures[-1].result(timeout=5) == "9\n"
+    assert path.read_text().split() == [str(i) for i in range(10)]
+    worker.shutdown()
+    # after shutdown writes run inline
+    assert worker.submit(append, "x\n").done()
+
+
+def test_worker_surfaces_errors_and_blocks_readers(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    worker = PersistenceWorker()
+    gate = threading.Event()
+    slow = worker.submit(lambda: gate.wait(5) and write_ltm([1], path), key=path)
+    failed = worker.submit(lambda: 1 / 0)
+    threading.Timer(0.05, gate.set).start()
+    # read_ltm waits for the queued write to the same path
+    assert read_ltm(path, default=[]) == [1]
+    assert slow.done()
+    assert isinstance(failed.exception(timeout=5), ZeroDivisionError)
+    worker.shutdown()
+
+
+def test_persister_writes_on_worker(tmp_path):
+    path = str(tmp_path / "state.json")
+    worker = PersistenceWorker()
+    backups = []
+    persister = StatePersister(path, lambda: {"n": 1}, on_commit=lambda: backups.append(1), writer=worker)
+    persister.mark_dirty()
+    assert persister.flush()
+    worker.drain()
+    assert read_ltm(path) == {"n": 1} and backups == [1]
+    worker.shutdown()
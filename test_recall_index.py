@@ -0,0 +1,39 @@
+import random
+
+from ltm_store import read_ltm
+from recall_index import RecallIndex
+
+
+class Item:
+    def __init__(self, data):
+        self.data = data
+
+
+def test_search_matches_substring_scan():
+    rng = random.Random(3)
+    words = ["sky", "blue", "blueberry", "Café", "tree", "green-tea", "x.y"]
+    notes = [" ".join(rng.choice(words) for _ in range(4)) for _ in range(300)]
+    index = RecallIndex()
+    for note in notes:
+        index.add(note)
+    for keyword in ["blue", "BERRY", "ue bl", "café", "n-t", ".", "", "sky tree", "missing"]:
+        expected = [n for n in notes if keyword.lower() in n.lower()]
+        assert index.search(keyword) == expected
+    index.add("a bluebell")
+    assert index.search("blue")[-1] == "a bluebell"
+
+
+def test_index_reloads_from_sidecar(tmp_path):
+    path = str(tmp_path / "ltm.json.recall")
+    ltm = [Item({"note": "sky is blue"}), Item({"thought": "hmm"}), Item({"note": "grass"})]
+    index = RecallIndex.load(path, ltm)
+    assert index.search("blue") == ["sky is blue"]
+    assert read_ltm(path) == [[0, "sky is blue"], [2, "grass"]]
+    index.add("blue moon")
+    ltm.append(Item({"note": "blue moon"}))
+    index.persist([True])
+    assert RecallIndex.load(path, ltm).search("blue") == ["sky is blue", "blue moon"]
+    # a sidecar that no longer matches the store is rebuilt from it
+    ltm[2] = Item({"note": "changed"})
+    ltm.pop()
+    assert RecallIndex.load(path, ltm).search("") == ["sky is blue", "changed"]
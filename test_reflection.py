@@ -0,0 +1,42 @@
+import threading
+import time
+
+from reflection import ReflectionQueue
+
+
+def test_turns_are_reflected_in_order_off_the_caller_thread():
+    seen, threads = [], set()
+    release = threading.Event()
+
+    def handler(turns):
+        release.wait(1)
+        threads.add(threading.current_thread().name)
+        if turns[0].user_text == "bad":
+            raise ValueError(turns[0].user_text)
+        seen.extend(turn.user_text for turn in turns)
+
+    reflections = ReflectionQueue(handler)
+    for text in ["a", "bad", "b"]:
+        reflections.submit(text, "reply", {}, 1.0)  # returns without waiting
+    assert seen == [] and reflections.pending == 3
+    release.set()
+    reflections.drain()
+    assert seen == ["a", "b"] and threads == {"requiem-reflection"}
+    assert reflections.stats() == {"pending": 0, "backlog": 0, "completed": 2, "failed": 1, "batches": 3}
+    reflections.shutdown()
+    reflections.submit("late", "reply", {}, 1.0)  # inline once shut down
+    assert seen == ["a", "b", "late"]
+
+
+def test_bursts_are_batched_up_to_the_limit():
+    batches = []
+    reflections = ReflectionQueue(lambda turns: batches.append([t.user_text for t in turns]),
+                                  batch_size=3, window=0.5)
+    for text in "abcd":
+        reflections.submit(text, "reply", {}, 1.0)
+    start = time.monotonic()
+    reflections.drain()
+    # a, b, c fill a batch at once; d waits out the window for company
+    assert batches == [["a", "b", "c"], ["d"]]
+    assert 0.4 < time.monotonic() - start < 1.0
+    reflections.shutdown()
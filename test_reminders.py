@@ -0,0 +1,49 @@
+import time
+
+from reminders import Reminders
+from scheduler import Scheduler
+
+
+def test_reminders_fire_in_due_order_at_their_time():
+    sched = Scheduler()
+    fired = []
+    reminders = Reminders(lambda msg: fired.append((msg, time.time())), sched)
+    start = time.time()
+    reminders.add(start + 0.3, "late")
+    reminders.add(start + 0.1, "early")  # re-arms for the earlier time
+    reminders.add(start + 0.1, "early too")
+    assert [m for _, m in reminders.to_list()] == ["early", "early too", "late"]
+    time.sleep(0.45)
+    assert [m for m, _ in fired] == ["early", "early too", "late"]
+    assert abs(fired[0][1] - (start + 0.1)) < 0.05
+    assert abs(fired[2][1] - (start + 0.3)) < 0.05
+    assert len(reminders) == 0
+    sched.shutdown()
+
+
+def test_load_fires_overdue_and_close_stops_firing():
+    sched = Scheduler()
+    fired = []
+    reminders = Reminders(fired.append, sched)
+    now = time.time()
+    reminders.load([[now - 5, "missed"], [now + 0.1, "soon"]])
+    time.sleep(0.05)
+    assert fired == ["missed"]
+    reminders.close()
+    time.sleep(0.15)
+    assert fired == ["missed"]
+    assert reminders.to_list() == [[now + 0.1, "soon"]]
+    sched.shutdown()
+
+
+def test_nothing_fires_before_start():
+    sched = Scheduler()
+    fired = []
+    reminders = Reminders(fired.append, sched, start=False)
+    reminders.load([[time.time() - 5, "missed"]])
+    time.sleep(0.05)
+    assert fired == []
+    reminders.start()
+    time.sleep(0.05)
+    assert fired == ["missed"]
+    sched.shutdown()
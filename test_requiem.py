@@ -1,8 +1,10 @@
+import threading
 import time
 import json
 import pytest
 import requiem as rq_module
 from requiem import Requiem
+from llm import GenerationCancelled
 
 
 class EchoLLM:
@@ -16,6 +18,12 @@ def patch_loader(monkeypatch):
     monkeypatch.setattr(rq_module, "load_llm", lambda model="": EchoLLM())
 
 
+def calm(rq):
+    """Report an idle host so the load governor never sheds heartbeat work."""
+    rq.resource_manager.sample = lambda: {"cpu": 0.0, "memory": 0.0, "load": 0.0}
+    return rq
+
+
 def test_memory_recall(tmp_path):
     ltm_file = tmp_path / "ltm.json"
     rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000, approver=lambda a: True)
@@ -52,6 +60,35 @@ def test_reminder(tmp_path):
     rq.receive_input("remind me to feed the cat in 1 seconds")
     time.sleep(1.5)
     assert any("feed the cat" in n for n in rq.notifications)
+    beats = rq.get_status()["heartbeat"]
+    assert beats["senses"]["runs"] > 1 and beats["integrity"]["runs"] == 1
+    assert "reminders" not in beats  # fired by the scheduler, not polled
+
+
+def test_reminder_fires_while_core_lock_is_held(tmp_path):
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000)
+    with rq._lock:
+        # the lock is taken by this thread, so the scheduler must not need it
+        rq.reminders.add(time.time(), "stretch")
+        deadline = time.time() + 1
+        while not rq.notifications and time.time() < deadline:
+            time.sleep(0.01)
+    assert rq.notifications == ["Reminder: stretch"]
+    rq.shutdown()
+
+
+def test_reminders_survive_restart(tmp_path):
+    ltm_file = str(tmp_path / "ltm.json")
+    rq = Requiem(ltm_file=ltm_file, heartbeat=1000)
+    rq.receive_input("remind me to water the plants in 1 seconds")
+    rq.receive_input("remind me to call home in 3600 seconds")
+    rq.shutdown()
+    time.sleep(1.1)
+    rq = Requiem(ltm_file=ltm_file, heartbeat=1000)
+    time.sleep(0.2)  # the overdue one fires as soon as it is loaded
+    assert rq.receive_input("check reminders") == "Reminder: water the plants"
+    assert [m for _, m in rq.reminders.to_list()] == ["call home"]
+    rq.shutdown()
 
 
 def test_persona(tmp_path):
@@ -120,7 +157,7 @@ def test_idle_chatter(tmp_path):
             return "hi"
 
     ltm_file = tmp_path / "ltm.json"
-    rq = Requiem(ltm_file=str(ltm_file), heartbeat=0.05, llm=DummyLLM(), friend=Friend())
+    rq = calm(Requiem(ltm_file=str(ltm_file), heartbeat=0.05, llm=DummyLLM(), friend=Friend()))
     rq.idle_threshold = 0.1
     initial = len(rq.get_thoughts())
     time.sleep(0.3)
@@ -169,7 +206,7 @@ def test_gender(tmp_path):
     assert "male" in reply.lower()
 
 
-def test_model_switch(monkeypatch):
+def test_model_switch(monkeypatch, tmp_path):
     import requiem as rq_module
 
     called = {}
@@ -184,7 +221,7 @@ def test_model_switch(monkeypatch):
         return Dummy()
 
     monkeypatch.setattr(rq_module, "load_llm", fake_loader)
-    rq = rq_module.Requiem(heartbeat=1000)
+    rq = rq_module.Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000)
     rq.receive_input("set model test-model")
     assert called["name"] == "test-model"
     assert rq.model == "test-model"
@@ -240,7 +277,7 @@ def test_vision(tmp_path):
     img = Image.new("RGB", (10, 10), color="red")
     img_path = tmp_path / "i.png"
     img.save(img_path)
-    rq = Requiem(heartbeat=1000)
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000)
     out = rq.receive_input(f"see image {img_path}")
     assert "10x10" in out
 
@@ -264,6 +301,41 @@ def test_web_search(monkeypatch, tmp_path):
     assert "programming language" in reply
 
 
+def test_web_search_releases_core_lock(monkeypatch, tmp_path):
+    import requiem as rq_module
+
+    rq = rq_module.Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000)
+    held = []
+
+    class Resp:
+        status_code = 404
+
+    def probe():
+        got = rq._lock.acquire(timeout=1)
+        held.append(got)
+        if got:
+            rq._lock.release()
+
+    def fake_get(url, timeout=5):
+        # another thread can take the lock while the request is in flight
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return Resp()
+
+    monkeypatch.setattr(rq_module.requests, "get", fake_get)
+    assert rq.receive_input("search web Python") == "search failed (404)"
+    assert held == [True]
+
+
+def test_run_command_timeout_is_opt_in(tmp_path):
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000)
+    assert rq.command_timeout is None
+    assert rq.run_command("sleep 0.3; echo done") == "done\n"
+    rq.command_timeout = 0.2
+    assert rq.run_command("sleep 5") == "timed out after 0.2s"
+
+
 def test_lie_engine_and_snitch(tmp_path):
     from pathlib import Path
     import json
@@ -309,6 +381,7 @@ def test_self_reflection_logged(tmp_path):
     ltm_file = tmp_path / "ltm.json"
     rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
     rq.receive_input("hello")
+    rq.flush()  # reflections run after the reply is returned
     reflections = [i for i in rq.get_reflections()]
     assert reflections and any("hello" in r.lower() for r in reflections)
 
@@ -319,11 +392,13 @@ def test_metacognitive_analysis_updates_self_model(tmp_path):
     rq = Requiem(ltm_file=str(ltm_file), state_file=str(state_file), heartbeat=1000)
     start_model = rq.get_self_model()["core_beliefs"]
     rq.receive_input("testing self awareness")
+    rq.flush()
     analyses = rq.get_analyses()
     emotions = rq.get_digital_emotions()
     assert analyses and "testing self awareness" in analyses[-1]
     assert emotions and emotions[-1] in {"satisfaction", "dissonance"}
     assert rq.get_self_model()["core_beliefs"] != start_model
+    rq.flush()
     with open(state_file, "r", encoding="utf-8") as f:
         data = json.load(f)
     assert "self_model" in data and data["self_model"]
@@ -351,3 +426,408 @@ def test_status_query(tmp_path):
     reply = rq.receive_input("system status")
     data = json.loads(reply)
     assert "os" in data and "uptime" in data
+
+
+def test_ltm_survives_restart(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    for i in range(60):
+        rq._store(rq_module.MemoryItem(time.time(), {"note": f"fact {i}"}))
+    rq.flush()
+    assert (tmp_path / "ltm.json.journal").exists()
+    rq2 = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    assert [i.data["note"] for i in rq2.ltm] == [f"fact {i}" for i in range(len(rq.ltm))]
+
+
+def test_state_commits_once_per_turn(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    before = rq.state_persister.commits
+    rq.receive_input("set persona cheerful")
+    assert rq.state_persister.requests > rq.state_persister.commits
+    assert rq.state_persister.commits == before + 1
+
+
+def test_recall_index_survives_restart(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    rq.receive_input("recall blue")  # builds the index
+    rq.flush()  # let the turn's reflection land first
+    for i in range(60):
+        rq._store(rq_module.MemoryItem(time.time(), {"note": f"blue fact {i}"}))
+    rq.flush()
+    assert rq_module.read_ltm(str(ltm_file) + ".recall")
+    rq2 = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    # only notes that reached the LTM survive; the rest were short-term
+    assert rq2.receive_input("recall fact 1") == "blue fact 1"
+    assert rq2.recall_index.persisted == 5
+
+
+def test_ranked_recall(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    for i in range(55):
+        rq._store(rq_module.MemoryItem(time.time(), {"note": f"filler {i}"}))
+    rq.receive_input("remember the sky is blue")
+    rq.receive_input("remember blue whales sing under a blue sky")
+    rq.recall_limit = 1
+    assert rq.receive_input("recall ranked whales sing blue") == "blue whales sing under a blue sky"
+    rq.shutdown()
+    # a fresh index fills itself from the existing long-term memory
+    for path in tmp_path.glob("ltm.json.fts*"):
+        path.unlink()
+    rq2 = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    rq2.recall_limit = 1
+    assert rq2.receive_input("recall ranked filler 3") == "filler 3"
+
+
+def test_similar_recall(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    rq.receive_input("remember my cat likes sleeping in the sun")
+    rq.receive_input("remember the meeting is on tuesday")
+    rq.recall_limit = 1
+    assert rq.receive_input("recall similar cats sleep") == "my cat likes sleeping in the sun"
+
+
+def test_unconsolidated_notes_leave_search_indexes(tmp_path):
+    ltm_file = str(tmp_path / "ltm.json")
+    rq = Requiem(ltm_file=ltm_file, heartbeat=1000)
+    rq.receive_input("remember note zebra migration")
+    assert rq.receive_input("recall ranked zebra") == "note zebra migration"
+    rq.shutdown()
+    # the note never reached the LTM, so a restart must not recall it
+    rq2 = Requiem(ltm_file=ltm_file, heartbeat=1000)
+    assert rq2.receive_input("recall ranked zebra") == "I don't recall anything about that."
+    assert rq2.receive_input("recall similar zebra migration") == "I don't recall anything about that."
+
+
+@pytest.mark.parametrize("name", ["ltm.json", "ltm.db"])
+def test_what_happened_between(tmp_path, name):
+    ltm_file = tmp_path / name
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    day = time.localtime()
+    at = lambda h, m: time.mktime(day[:3] + (h, m, 0) + day[6:8] + (-1,))
+    for i in range(60):
+        rq._store(rq_module.MemoryItem(at(0, 0) + i, {"note": f"early {i}"}))
+    hour = (day.tm_hour + 12) % 24  # away from the turn's own memories
+    rq._store(rq_module.MemoryItem(at(hour, 30), {"note": "lunch meeting"}))
+    reply = rq.receive_input(f"what happened between {hour}:00 and {hour}:59")
+    assert reply == f"1 memories: {hour:02d}:30:00 note: lunch meeting"
+    rq.flush()
+    # history that reached the LTM is indexed after a restart
+    rq2 = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    early = rq2.memories_between(at(0, 0) + 2, at(0, 0) + 3)
+    assert [m.data["note"] for m in early] == ["early 2", "early 3"]
+    # SQLite answers from its timestamp index without loading the history
+    assert bool(rq2._history_pending) == (name == "ltm.db")
+
+
+def test_what_happened_between_rejects_bad_ranges(tmp_path):
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000)
+    usage = "format: what happened between HH:MM and HH:MM (00:00-23:59, start first)"
+    for text in ("25:00 and 26:00", "10:00 and 10:60", "15:00 and 14:00", "-1:00 and 2:00"):
+        assert rq.receive_input(f"what happened between {text}") == usage
+
+
+def test_latest_memories_by_kind(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    for i in range(5):
+        rq._store(rq_module.MemoryItem(time.time(), {"note": f"n{i}"}))
+    for i in range(60):
+        rq._store(rq_module.MemoryItem(time.time(), {"thought": f"t{i}"}))
+    # n0..n4 are now in the LTM, the newest thoughts in the STM
+    assert [m.data["note"] for m in rq._latest("note", 2)] == ["n3", "n4"]
+    assert rq._latest("note", short_term=True) == []
+    assert rq._latest("thought", short_term=True)[0].data["thought"] == "t59"
+    rq.flush()
+    rq2 = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    rq2._store(rq_module.MemoryItem(time.time(), {"note": "fresh"}))
+    # falls back to the store for history this session has not indexed
+    assert rq2.receive_input("what do you remember?") == "I recall: n3; n4; fresh"
+
+
+def test_activity_logs_are_bounded(tmp_path):
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000, log_window=5)
+    for i in range(300):
+        rq.action_log.append(f"action {i}")
+    assert rq.get_actions() == [f"action {i}" for i in range(295, 300)]
+    assert rq.get_actions(2) == ["action 298", "action 299"]
+    rq.flush()
+    assert rq.get_log_page("action", 0, 3) == ["action 0", "action 1", "action 2"]
+    assert (tmp_path / "ltm_logs" / "action.0.jsonl").exists()
+    rq.shutdown()
+
+
+def test_consolidation_moves_batches_and_merges_runs(tmp_path):
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    rq.merge_consolidated = True
+    for i in range(59):
+        rq._store(rq_module.MemoryItem(time.time(), {"note": f"n{i}"}))
+    assert len(rq.ltm) == 0  # below the high-water mark nothing moves
+    rq._store(rq_module.MemoryItem(time.time(), {"note": "n59"}))
+    assert len(rq.ltm) == 10 and len(rq.stm) == 50
+    for i in range(4):
+        rq._store(rq_module.MemoryItem(time.time(), {"thought": f"t{i}"}))
+    rq._store(rq_module.MemoryItem(time.time(), {"note": "after"}))
+    rq.consolidate(keep=0)
+    # the four thoughts became one summary record
+    assert len(rq.ltm) == 10 + 50 + 1 + 1 and not rq.stm
+    summary = rq.ltm[-2]
+    assert summary.data == {"thought": "t0\nt1\nt2\nt3", "merged": 4}
+    assert rq._latest("thought", 3) == [summary]
+    assert rq._latest("note")[0].data["note"] == "after"
+    assert rq.receive_input("recall after") == "after"
+
+
+@pytest.mark.parametrize("name", ["ltm.json", "ltm.db"])
+def test_prune_ltm_applies_retention_rules(tmp_path, name):
+    ltm_file = tmp_path / name
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=1000)
+    old = time.time() - 30 * 86400
+    for i in range(20):
+        rq._store(rq_module.MemoryItem(old + i, {"thought": f"old thought {i}"}))
+        rq._store(rq_module.MemoryItem(old + i, {"note": f"kept note {i}"}))
+    rq.consolidate(keep=0)
+    assert rq.receive_input("recall kept note 3") == "kept note 3"
+    report = rq.prune_ltm()
+    assert report["dropped"] == 20
+    if name == "ltm.json":  # 20 small rows may not free a whole SQLite page
+        assert report["reclaimed_bytes"] > 0
+    assert len(rq.ltm) == 20  # only the notes are left
+    assert rq._latest("thought", short_term=False) == []
+    assert [m.data["note"] for m in rq.memories_between(old, old + 1)] == ["kept note 0", "kept note 1"]
+    assert rq.receive_input("recall kept note 3") == "kept note 3"
+    assert rq.get_status()["ltm_pruned"]["dropped"] == 20
+
+
+def test_concurrent_turns_and_heartbeat_keep_memory_consistent(tmp_path):
+    from scheduler import Scheduler
+
+    scheduler = Scheduler()
+    ltm_file = tmp_path / "ltm.json"
+    rq = Requiem(ltm_file=str(ltm_file), heartbeat=0.01, scheduler=scheduler)
+    rq.stm_limit, rq.consolidate_batch = 5, 3
+    rq.consolidate_interval = rq.prune_interval = 0.0
+    errors = []
+
+    def chat(worker):
+        try:
+            for i in range(25):
+                rq.receive_input(f"remember note {worker}-{i}")
+                rq.get_status()
+                rq.get_thoughts(5)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=chat, args=(w,)) for w in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scheduler.shutdown()
+    rq.flush()
+    assert not errors
+    beats = rq.get_status()["heartbeat"]
+    assert beats["senses"]["runs"] > 0 and beats["memory"]["runs"] > 0
+    assert all(s["errors"] == 0 for s in rq.get_status()["heartbeat"].values())
+    expected = sorted(f"note {w}-{i}" for w in range(6) for i in range(25))
+    notes = [m.data["note"] for m in rq.memories_between(0, time.time() + 1, "note")]
+    assert sorted(notes) == expected
+    assert rq.temporal.next_ordinal == len(rq.ltm) + len(rq.stm) + len(rq._absorbed)
+    rq.consolidate(keep=0)
+    stored = len(rq.ltm)
+    rq.shutdown()
+    assert len(Requiem(ltm_file=str(ltm_file), heartbeat=1000).ltm) == stored
+
+
+def test_governor_sheds_background_llm_work(tmp_path):
+    class CappedLLM:
+        max_new_tokens = None
+
+        def __init__(self):
+            self.caps = []
+
+        def reply(self, text, last_user):
+            self.caps.append(self.max_new_tokens)
+            return "thinking"
+
+    llm = CappedLLM()
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000, llm=llm)
+    load = {"cpu": 0.0, "memory": 0.0, "load": 0.0}
+    rq.resource_manager.sample = lambda: dict(load)
+    now = time.time()
+    load["cpu"] = 85.0  # lean: shorter thoughts, no dreams
+    rq._hb_senses(now)
+    rq._hb_inner_thought(now)
+    assert llm.caps == [rq.governor.lean_tokens] and llm.max_new_tokens is None
+    load["cpu"] = 99.0  # paused: no background LLM calls
+    rq._hb_senses(now)
+    rq._hb_inner_thought(now)
+    assert llm.caps == [rq.governor.lean_tokens]
+    assert rq.get_status()["governor"]["name"] == "paused"
+    assert "load governor: paused" in rq.get_actions()
+    assert rq.receive_input("hello") == "thinking"  # turns are never shed
+
+
+def test_reply_returns_before_reflection(tmp_path):
+    gate = threading.Event()
+
+    class SlowReflectionLLM:
+        def reply(self, text, last_user):
+            if text.startswith(("Consider this conversation", "Analyze this trace")):
+                gate.wait(5)
+            return f"echo: {text}"
+
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000, llm=SlowReflectionLLM())
+    assert rq.receive_input("first") == "echo: first"
+    assert rq.get_status()["reflections"]["pending"] == 1
+    assert not any(r.startswith("echo: Consider") for r in rq.get_reflections())
+    gate.set()
+    rq.flush()
+    assert any(r.startswith("echo: Consider") and "first" in r for r in rq.get_reflections())
+    assert rq.get_status()["reflections"]["completed"] == 1
+
+
+def test_reflection_yields_core_lock_between_steps(tmp_path):
+    entered, gate = threading.Event(), threading.Event()
+    calls = []
+
+    class SlowReflectionLLM:
+        def reply(self, text, last_user):
+            if text.startswith("Consider this conversation"):
+                entered.set()
+                gate.wait(5)
+                calls.append("reflection")
+            elif text.startswith("Analyze this trace"):
+                calls.append("analysis")
+            else:
+                calls.append(text)
+            return "ok"
+
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000, llm=SlowReflectionLLM())
+    rq.receive_input("first")
+    assert entered.wait(5)
+    second = threading.Thread(target=rq.receive_input, args=("second",))
+    second.start()
+    deadline = time.monotonic() + 5
+    while not rq.backlog and time.monotonic() < deadline:
+        time.sleep(0.01)  # waits behind the reflection holding the lock
+    gate.set()
+    second.join(5)
+    rq.flush()
+    # the waiting turn ran between the first turn's reflection and analysis
+    assert calls[:4] == ["first", "reflection", "second", "analysis"]
+
+
+def test_reflections_are_generated_in_batches(tmp_path):
+    class BatchLLM(EchoLLM):
+        def __init__(self):
+            self.batches = []
+
+        def reply_batch(self, texts):
+            self.batches.append(len(texts))
+            return [f"batched: {text}" for text in texts]
+
+    llm = BatchLLM()
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000, llm=llm)
+    rq.reflections.window = 1.0
+    rq.reflections.batch_size = 3
+    for text in ["one", "two", "three"]:
+        rq.receive_input(text)
+    rq.flush()
+    assert llm.batches == [3, 3]  # reflections, then analyses
+    reflections = [r for r in rq.get_reflections() if r.startswith("batched: Consider")]
+    assert [r.split("User: ")[1].split("\n")[0] for r in reflections] == ["one", "two", "three"]
+    assert rq.get_status()["reflections"]["batches"] == 1
+
+
+def test_heartbeat_chatter_is_preemptible(tmp_path):
+    class Recorder:
+        max_new_tokens = None
+        stop_event = None
+
+        def __init__(self):
+            self.seen = []
+
+        def reply(self, text, last_user):
+            self.seen.append((text, self.stop_event))
+            if text == "Begin an internal dialog." and self.stop_event.is_set():
+                raise GenerationCancelled()
+            return "ok"
+
+    class Friend:
+        def __init__(self):
+            self._lock = threading.RLock()
+            self.llm = Recorder()
+
+        def receive_input(self, text):
+            return self.llm.reply(text, None)
+
+    llm = Recorder()
+    rq = calm(Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=1000, llm=llm))
+    rq.friend = friend = Friend()
+    rq.free_will.should_self_talk = lambda *a: False
+    rq.last_input_time = 0
+    rq.idle_toggle = True
+    rq._hb_inner_thought(time.time())
+    assert llm.seen[-1] == ("Begin an internal dialog.", rq._preempt)
+    rq._hb_inner_thought(time.time())
+    assert friend.llm.seen == [("We're waiting for the user to return.", rq._preempt)]
+    assert llm.stop_event is None and friend.llm.stop_event is None
+    # a turn arriving mid-chatter stops it; the inner thought is kept
+    before = len(rq.get_thoughts())
+    rq.idle_toggle = True
+    reply = llm.reply
+
+    def interrupted(text, last_user):
+        if text == "Begin an internal dialog.":
+            rq._preempt.set()
+        return reply(text, last_user)
+
+    llm.reply = interrupted
+    rq._hb_inner_thought(time.time())
+    assert rq.idle_toggle and len(rq.get_thoughts()) == before + 1
+    rq._preempt.clear()
+    rq.shutdown()
+
+
+def test_user_turn_preempts_heartbeat_generation(tmp_path):
+    from scheduler import Scheduler
+
+    class SlowThinker:
+        max_new_tokens = None
+        stop_event = None
+
+        def __init__(self):
+            self.started = threading.Event()
+            self.cancelled = 0
+
+        def reply(self, text, last_user):
+            if "inner thought" not in text and "monologue" not in text:
+                return "quick reply"
+            self.started.set()
+            for _ in range(0 if self.cancelled else 500):  # 5 s unless stopped
+                if self.stop_event is not None and self.stop_event.is_set():
+                    self.cancelled += 1
+                    raise GenerationCancelled()
+                time.sleep(0.01)
+            return "deep thought"
+
+    llm = SlowThinker()
+    scheduler = Scheduler()
+    rq = calm(Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=0.05, llm=llm, scheduler=scheduler))
+    assert llm.started.wait(2)
+    start = time.monotonic()
+    assert rq.receive_input("hello") == "quick reply"
+    assert time.monotonic() - start < 1.0  # did not wait out the thought
+    assert llm.cancelled == 1 and llm.stop_event is None
+    assert rq.heartbeat_tasks["inner_thought"].preempted == 1
+    deadline = time.monotonic() + 2
+    while "deep thought" not in rq.get_thoughts() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert "deep thought" in rq.get_thoughts()  # retried on a later tick
+    scheduler.shutdown()
+    rq.shutdown()
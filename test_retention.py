@@ -0,0 +1,21 @@
+from ltm_store import read_ltm, write_ltm
+from ltm_view import LTMView
+from retention import RetentionPolicy
+
+
+def test_select_applies_age_and_count_rules():
+    policy = RetentionPolicy({"thought": {"days": 1}, "dream": {"keep_latest": 2}})
+    now = 10 * 86400.0
+    times = [0.0, now, 0.0, now - 5, now - 4, now - 3]
+    kinds = ["thought", "thought", "note", "dream", "dream", "dream"]
+    assert list(policy.select(times, kinds, now)) == [0, 1, 1, 0, 1, 1]
+
+
+def test_view_prune_rewrites_file(tmp_path):
+    path = str(tmp_path / "ltm.json")
+    write_ltm([{"timestamp": float(i), "data": {"thought" if i % 2 else "note": str(i)}} for i in range(6)], path)
+    view = LTMView(path)
+    policy = RetentionPolicy({"thought": {"days": 0}})
+    flags, dropped, reclaimed = view.prune(lambda t, k: policy.select(t, k, now=100.0))
+    assert list(flags) == [1, 0, 1, 0, 1, 0] and len(dropped) == 3 and reclaimed > 0
+    assert [r["data"]["note"] for r in read_ltm(path)] == ["0", "2", "4"]
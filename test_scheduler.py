@@ -0,0 +1,70 @@
+import threading
+import time
+
+from scheduler import Job, Scheduler
+
+
+def test_missed_tick_policies():
+    def advanced(policy):
+        job = Job(None, lambda: None, 1.0, policy, 0.0, "t")
+        job.due = 10.0
+        job._advance(13.5)  # the run of tick 10 ended 3.5 s late
+        return job.due, job.missed
+
+    assert advanced("catch_up") == (11.0, 0)
+    assert advanced("skip") == (14.0, 3)
+    assert advanced("coalesce") == (13.0, 2)
+
+
+def test_fixed_rate_jobs_run_off_the_scheduler_thread():
+    sched = Scheduler()
+    ticks, threads = [], set()
+
+    def slow():
+        threads.add(threading.current_thread().name)
+        ticks.append(time.monotonic())
+        time.sleep(0.01)
+
+    job = sched.every(0.05, slow, delay=0)
+    other = sched.every(0.05, lambda: threads.add(threading.current_thread().name))
+    time.sleep(0.33)
+    job.cancel()
+    count = len(ticks)
+    time.sleep(0.1)
+    assert len(ticks) == count  # cancelled
+    assert "requiem-scheduler" not in threads
+    # the 10 ms body does not push later ticks back
+    assert 6 <= count <= 8
+    assert abs((ticks[-1] - ticks[0]) - 0.05 * (count - 1)) < 0.03
+    assert other.runs > 0
+    sched.shutdown()
+
+
+def test_one_shot_jobs_run_once():
+    sched = Scheduler()
+    runs = []
+    sched.after(0.02, lambda: runs.append(1))
+    cancelled = sched.after(0.02, lambda: runs.append(2))
+    cancelled.cancel(wait=False)
+    time.sleep(0.1)
+    assert runs == [1] and sched.jobs == []
+    sched.shutdown()
+
+
+def test_blocked_job_delays_no_other_job():
+    sched = Scheduler()
+    release = threading.Event()
+    stuck = sched.every(0.02, lambda: release.wait(), delay=0)
+    other = sched.every(0.02, lambda: None, delay=0)
+    fired = []
+    start = time.monotonic()
+    sched.after(0.1, lambda: fired.append(time.monotonic() - start))
+    time.sleep(0.2)
+    # the first run of ``stuck`` is still blocked and does not overlap itself
+    assert stuck.runs == 0 and other.runs >= 5
+    assert len(fired) == 1 and fired[0] < 0.15
+    release.set()
+    time.sleep(0.05)
+    assert stuck.runs >= 1
+    stuck.cancel()
+    sched.shutdown()
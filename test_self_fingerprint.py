@@ -1,6 +1,6 @@
 from requiem import Requiem
 
 
-def test_self_model_fingerprint():
-    rq = Requiem(heartbeat=0)
+def test_self_model_fingerprint(tmp_path):
+    rq = Requiem(ltm_file=str(tmp_path / "ltm.json"), heartbeat=0)
     assert 'requiem.py' in rq.self_model.fingerprint
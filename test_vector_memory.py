@@ -0,0 +1,85 @@
+import numpy as np
+
+import vector_memory
+from vector_memory import HashingVectorizer, VectorMemory
+
+
+def test_vectorizer_rows_are_unit_length():
+    matrix = HashingVectorizer(64).embed(["the sky is blue", "", "Blue SKY!"])
+    assert matrix.shape == (3, 64) and matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix[[0, 2]], axis=1), 1.0)
+    assert not matrix[1].any()
+    assert matrix[0] @ matrix[2] > 0.5
+
+
+def test_search_and_reload(tmp_path):
+    path = str(tmp_path / "ltm.json.vec")
+    memory = VectorMemory(path, dim=128)
+    memory.needs_backfill(0)
+    memory.add_batch(["the cat sat on the mat", "stock prices fell sharply", "a kitten sat on a mat"])
+    hits = memory.search("cats sitting on mats", k=2)
+    assert [text for _, text in hits] == ["the cat sat on the mat", "a kitten sat on a mat"]
+    memory.add("markets and stock prices")
+    for mmap in (False, True):
+        reloaded = VectorMemory(path, dim=128, mmap=mmap)
+        assert len(reloaded) == 4 and reloaded.backfill_pending == 0
+        assert reloaded.search("prices fell", k=1)[0][1] == "stock prices fell sharply"
+
+
+def test_truncated_vectors_are_trimmed(tmp_path):
+    path = tmp_path / "ltm.json.vec"
+    memory = VectorMemory(str(path), dim=32)
+    memory.needs_backfill(0)
+    memory.add_batch(["one", "two"])
+    with open(path, "r+b") as f:  # lose the last row, as after a crash
+        f.truncate(path.stat().st_size - 4 * 32)
+    reloaded = VectorMemory(str(path), dim=32)
+    assert reloaded.texts == ["one"]
+    reloaded.add("three")
+    assert VectorMemory(str(path), dim=32).texts == ["one", "three"]
+
+
+def test_pending_texts_stay_in_memory(tmp_path):
+    path = str(tmp_path / "ltm.json.vec")
+    memory = VectorMemory(path, dim=64)
+    memory.needs_backfill(0)
+    memory.add("zebras migrate north", pending=True)
+    memory.add("zebras graze at dawn", pending=True)
+    assert len(memory.search("zebras", k=5)) == 2
+    memory.persist(1)
+    assert VectorMemory(path, dim=64).texts == ["zebras migrate north"]
+
+
+def test_rows_load_on_first_search(tmp_path):
+    path = str(tmp_path / "ltm.json.vec")
+    memory = VectorMemory(path, dim=64)
+    memory.needs_backfill(0)
+    memory.add_batch(["the cat sat on the mat"])
+    reopened = VectorMemory(path, dim=64, mmap=True)
+    reopened.add("a dog slept on the rug")
+    assert not reopened._loaded and reopened.backfill_pending == 0
+    assert reopened.search("dog rug", k=1)[0][1] == "a dog slept on the rug"
+    assert isinstance(reopened._base, np.memmap)
+    assert reopened.texts == ["the cat sat on the mat", "a dog slept on the rug"]
+
+
+def test_forget_remaps_the_rewritten_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "ltm.json.vec")
+    memory = VectorMemory(path, dim=64)
+    memory.needs_backfill(0)
+    memory.add_batch(["the cat sat on the mat", "stock prices fell", "a dog slept on the rug"])
+    mapped = VectorMemory(path, dim=64, mmap=True)
+    assert mapped.search("cat on mat", k=1)[0][1] == "the cat sat on the mat"
+    assert isinstance(mapped._base, np.memmap)
+    replace = vector_memory.os.replace
+
+    def checked_replace(src, dst):
+        # as on Windows: the file being replaced must not be mapped
+        assert dst != path or not isinstance(mapped._base, np.memmap)
+        replace(src, dst)
+
+    monkeypatch.setattr(vector_memory.os, "replace", checked_replace)
+    assert mapped.forget(["stock prices fell"]) == 1
+    assert isinstance(mapped._base, np.memmap)
+    assert mapped.search("dog rug", k=1)[0][1] == "a dog slept on the rug"
+    assert VectorMemory(path, dim=64).texts == ["the cat sat on the mat", "a dog slept on the rug"]
@@ -0,0 +1,353 @@
+"""Offline semantic recall: hashed n-gram embeddings searched with NumPy."""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ltm_store import append_ltm, read_ltm, wait_writes, write_ltm
+
+try:  # optional numeric backend
+    import numpy as np
+except Exception:  # pragma: no cover - numpy may be missing
+    np = None
+
+# File layout: magic, vector dimension, number of long-term items still to be
+# backfilled, then float32 rows. The texts live in a list at ``<path>.texts``.
+MAGIC = b"RQV1"
+_HEADER = struct.Struct("<4sIQ")
+
+
+class HashingVectorizer:
+    """Signed feature hashing of words and their character trigrams.
+
+    Each distinct word is hashed once (crc32, stable across processes) and
+    its feature columns are kept in flat arrays, so embedding a batch is a
+    vocabulary lookup per word followed by NumPy gathers. Rows are
+    L2-normalised so a dot product is the cosine similarity.
+    """
+
+    CACHE_WORDS = 200_000
+    _STRIP = ".,;:!?\"'()[]"
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._cols = np.zeros(0, dtype=np.int64)  # feature columns of all words
+        self._signs = np.zeros(0, dtype=np.float64)
+        self._starts = np.zeros(0, dtype=np.int64)  # first feature of each word
+        self._lens = np.zeros(0, dtype=np.int64)
+
+    def _learn(self, words: List[str]) -> None:
+        cols, signs, lens = [], [], []
+        for word in words:
+            padded = "<" + word + ">"
+            grams = [word] + [padded[i : i + 3] for i in range(len(padded) - 2)]
+            hashes = [zlib.crc32(g.encode("utf-8")) for g in grams]
+            cols.extend(h % self.dim for h in hashes)
+            signs.extend(1.0 if h & 0x80000000 else -1.0 for h in hashes)
+            lens.append(len(hashes))
+            self._ids[word] = len(self._ids)
+        lens_arr = np.asarray(lens, dtype=np.int64)
+        self._starts = np.concatenate(
+            [self._starts, len(self._cols) + np.cumsum(lens_arr) - lens_arr]
+        )
+        self._lens = np.concatenate([self._lens, lens_arr])
+        self._cols = np.concatenate([self._cols, np.asarray(cols, dtype=np.int64)])
+        self._signs = np.concatenate([self._signs, np.asarray(signs)])
+
+    def embed(self, texts: List[str]):
+        """Return a ``(len(texts), dim)`` float32 matrix of unit rows."""
+        strip = self._STRIP
+        per_text = [[w.strip(strip) for w in t.lower().split()] for t in texts]
+        words = [w for ws in per_text for w in ws]
+        new = list(dict.fromkeys(w for w in words if w not in self._ids))
+        if new:
+            if len(self._ids) + len(new) > self.CACHE_WORDS:
+                self._reset()
+                new = list(dict.fromkeys(words))
+            self._learn(new)
+        ids = np.fromiter((self._ids[w] for w in words), dtype=np.int64, count=len(words))
+        lens = self._lens[ids]
+        total = int(lens.sum())
+        # positions of every word's features inside the flat arrays
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lens) - lens, lens)
+        feats = np.repeat(self._starts[ids], lens) + offsets
+        rows = np.repeat(np.repeat(np.arange(len(texts), dtype=np.int64), [len(ws) for ws in per_text]), lens)
+        matrix = np.bincount(
+            rows * self.dim + self._cols[feats],
+            weights=self._signs[feats],
+            minlength=len(texts) * self.dim,
+        ).astype(np.float32).reshape(len(texts), self.dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class VectorMemory:
+    """Top-k cosine search over note embeddings kept in one float32 matrix.
+
+    Rows persisted at ``path`` are loaded in one read or, with ``mmap=True``,
+    memory-mapped, on the first search; until then only the header is read
+    and new rows are just appended to disk, so opening the index costs
+    nothing. Once loaded, new rows go to an in-memory block that doubles
+    when full. :meth:`add_batch` embeds many texts in one pass and queued
+    rows are appended to disk together on the ``writer`` thread when one is
+    given. A search is one matrix-vector product per block plus
+    ``argpartition`` for the top ``k``.
+
+    Texts added with ``pending=True`` are short-term notes: they are
+    searched from memory but reach the file only through :meth:`persist`,
+    once they are consolidated, so a restart never recalls notes the
+    long-term store lost.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dim: int = 256,
+        mmap: bool = False,
+        writer=None,
+    ) -> None:
+        if np is None:
+            raise ImportError("numpy is required for vector memory")
+        self.path = path
+        self.writer = writer
+        self.mmap = mmap
+        self.vectorizer = HashingVectorizer(dim)
+        self.backfill_pending: Optional[int] = None
+        self._texts: List[str] = []
+        self._loaded = not path
+        self._lock = threading.Lock()
+        self._queued: List[Tuple[bytes, List[str]]] = []
+        self._pending: List[str] = []
+        self._pending_rows = np.zeros((0, dim), dtype=np.float32)
+        self._base = np.zeros((0, dim), dtype=np.float32)
+        self._tail = np.zeros((1024, dim), dtype=np.float32)
+        self._size = 0  # rows used in _tail
+        if path:
+            self._read_header()
+
+    @property
+    def dim(self) -> int:
+        return self.vectorizer.dim
+
+    @property
+    def texts(self) -> List[str]:
+        """Texts of the persisted rows, in file order."""
+        self._ensure_loaded()
+        return self._texts
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _read_header(self) -> None:
+        wait_writes(self.path)
+        try:
+            with open(self.path, "rb") as f:
+                magic, dim, backfill = _HEADER.unpack(f.read(_HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return
+        if magic == MAGIC and dim == self.dim:
+            self.backfill_pending = backfill
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            # rows still queued for the writer are appended here instead
+            self._write(self._take_queued())
+            if self.backfill_pending is not None:
+                self._load()
+            self._loaded = True
+
+    def _load(self) -> None:
+        # caller holds the lock
+        dim = self.dim
+        texts = read_ltm(self.path + ".texts", default=[]) or []
+        rows = (os.path.getsize(self.path) - _HEADER.size) // (4 * dim)
+        n = min(rows, len(texts))
+        if rows != n or len(texts) != n:
+            # a crash between the two appends: trim both sides to agree
+            with open(self.path, "r+b") as f:
+                f.truncate(_HEADER.size + n * 4 * dim)
+            write_ltm(texts[:n], self.path + ".texts")
+        self._texts = texts[:n]
+        if not n:
+            return
+        if self.mmap:
+            self._base = np.memmap(
+                self.path, dtype=np.float32, mode="r", offset=_HEADER.size, shape=(n, dim)
+            )
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(_HEADER.size)
+                self._base = np.fromfile(f, dtype=np.float32, count=n * dim).reshape(n, dim)
+
+    def needs_backfill(self, count: int) -> None:
+        """Start a new file that is missing the first ``count`` long-term items."""
+        if self.backfill_pending is None:
+            self.backfill_pending = count
+            if self.path:
+                with open(self.path, "wb") as f:
+                    f.write(_HEADER.pack(MAGIC, self.dim, count))
+                write_ltm([], self.path + ".texts")
+
+    def backfill(self, texts: Iterable[str], batch: int = 10_000) -> None:
+        """Index the pending long-term notes ``texts`` and clear the mark."""
+        chunk: List[str] = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) >= batch:
+                self.add_batch(chunk)
+                chunk = []
+        if chunk:
+            self.add_batch(chunk)
+        self.backfill_pending = 0
+        if self.path:
+            self._submit(self._clear_backfill)
+
+    def _clear_backfill(self) -> None:
+        with open(self.path, "r+b") as f:
+            f.write(_HEADER.pack(MAGIC, self.dim, 0))
+
+    def add(self, text: str, pending: bool = False) -> None:
+        if not pending:
+            self.add_batch([text])
+            return
+        vector = self.vectorizer.embed([text])
+        with self._lock:
+            self._pending.append(text)
+            self._pending_rows = np.concatenate([self._pending_rows, vector])
+
+    def persist(self, count: int) -> None:
+        """Index the oldest ``count`` pending texts for good."""
+        with self._lock:
+            texts, self._pending = self._pending[:count], self._pending[count:]
+            self._pending_rows = self._pending_rows[count:]
+        self.add_batch(texts)
+
+    def add_batch(self, texts: List[str]) -> None:
+        """Embed and index ``texts``; the new rows are appended to disk in order."""
+        if not texts:
+            return
+        vectors = self.vectorizer.embed(texts)
+        with self._lock:
+            if self._loaded:
+                need = self._size + len(texts)
+                if need > len(self._tail):
+                    grown = np.zeros((max(need, 2 * len(self._tail)), self.dim), dtype=np.float32)
+                    grown[: self._size] = self._tail[: self._size]
+                    self._tail = grown
+                self._tail[self._size : need] = vectors
+                self._size = need
+                self._texts.extend(texts)
+            if not self.path:
+                return
+            self._queued.append((vectors.tobytes(), list(texts)))
+            first = len(self._queued) == 1
+        if first:
+            self._submit(self._flush)
+
+    def _submit(self, fn) -> None:
+        if self.writer is not None:
+            self.writer.submit(fn, key=self.path)
+        else:
+            fn()
+
+    def _take_queued(self) -> List[Tuple[bytes, List[str]]]:
+        # caller holds the lock
+        queued, self._queued = self._queued, []
+        return queued
+
+    def _flush(self) -> None:
+        # under the lock, so a first search never loads a half-appended file
+        with self._lock:
+            self._write(self._take_queued())
+
+    def _write(self, queued: List[Tuple[bytes, List[str]]]) -> None:
+        if not queued:
+            return
+        texts = [t for _, batch in queued for t in batch]
+        # texts are durable first: a short vector file is trimmed on load
+        append_ltm(texts, self.path + ".texts")
+        with open(self.path, "ab") as f:
+            f.write(b"".join(data for data, _ in queued))
+
+    def forget(self, texts: Iterable[str], backfill: Optional[int] = None) -> int:
+        """Drop one row per text in ``texts`` (pruned notes); returns rows removed.
+
+        The remaining rows are rewritten on the writer. ``backfill`` is the
+        new count of long-term items still to index when pruning shortened
+        that prefix.
+        """
+        wanted = Counter(texts)
+        self._ensure_loaded()
+        with self._lock:
+            keep = np.ones(len(self._texts), dtype=bool)
+            for i, text in enumerate(self._texts):
+                if wanted.get(text):
+                    wanted[text] -= 1
+                    keep[i] = False
+            removed = len(keep) - int(keep.sum())
+            if backfill is not None and self.backfill_pending:
+                self.backfill_pending = backfill
+            if not removed:
+                return 0
+            rows = np.concatenate([self._base, self._tail[: self._size]])[keep]
+            # also drops the mapping of the old file before _rewrite replaces it
+            self._base, self._size = rows, 0
+            self._texts = [t for t, k in zip(self._texts, keep) if k]
+            # queued rows are part of the rewrite, not appended after it
+            self._queued = []
+            texts, pending = list(self._texts), self.backfill_pending or 0
+        if self.path:
+            self._submit(lambda: self._rewrite(rows, texts, pending))
+        return removed
+
+    def _rewrite(self, rows, texts: List[str], backfill: int) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, self.dim, backfill))
+            f.write(rows.tobytes())
+        with self._lock:
+            # Windows cannot replace a mapped file: nothing may map the old
+            # one here, so map the new one afterwards instead of keeping it open
+            if isinstance(self._base, np.memmap):
+                self._base = np.array(self._base)
+            os.replace(tmp, self.path)
+            if self.mmap and self._base is rows and len(rows):
+                self._base = np.memmap(
+                    self.path, dtype=np.float32, mode="r", offset=_HEADER.size, shape=rows.shape
+                )
+        write_ltm(texts, self.path + ".texts")
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[float, str]]:
+        """Return up to ``k`` ``(cosine, text)`` pairs with positive similarity."""
+        q = self.vectorizer.embed([query])[0]
+        if not q.any():
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            base, tail = self._base, self._tail[: self._size]
+            texts, pending, pending_texts = self._texts, self._pending_rows, self._pending
+        scores = np.concatenate([base @ q, tail @ q, pending @ q])
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        stored = len(scores) - len(pending)
+        return [
+            (float(scores[i]), texts[i] if i < stored else pending_texts[i - stored])
+            for i in top
+            if scores[i] > 0
+        ]
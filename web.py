@@ -398,14 +398,15 @@ def discord_chat():
 def state():
     if 'user' not in session:
         return jsonify({'error': 'unauthorized'}), 401
+    limit = request.args.get('limit', 50, type=int)
     return jsonify({
-        'thoughts': rq.get_thoughts(),
-        'actions': rq.get_actions(),
+        'thoughts': rq.get_thoughts(limit),
+        'actions': rq.get_actions(limit),
         'status': rq.get_status(),
     })
 
 def run(host: str = '127.0.0.1', port: int = 5000) -> None:
-    app.run(host=host, port=port, debug=False, use_reloader=False, threaded=False)
+    app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
 
 if __name__ == '__main__':
     run()